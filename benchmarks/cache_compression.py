@@ -0,0 +1,87 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm._redis_base import _ModelRedisBaseMeta
+import argparse
+import time
+import ujson
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - cache compression")
+parser.add_argument('--objects', '-o', type=int, default=1000)
+parser.add_argument('--children', '-c', type=int, default=20)
+parser.add_argument('--thresholds', '-t', type=int, nargs='+', default=[256, 1024, 4096])
+parser.add_argument('--levels', '-l', type=int, nargs='+', default=[1, 6, 9])
+
+
+def build_objects(objects, children):
+    return [ujson.dumps({
+        'id': i,
+        'name': 'object{}'.format(i),
+        'description': 'description of the object number {}'.format(i) * 4,
+        'children': [{
+            'id': j,
+            'name': 'child{}'.format(j),
+            'tags': ['tag{}'.format(k) for k in range(j % 5)],
+            'price': j * 1.5
+        } for j in range(i % children + children)]
+    }) for i in range(objects)]
+
+
+class Model(object):
+    pass
+
+
+def run(objs, threshold, level):
+    Model.__cache_compression_threshold__ = threshold
+    Model.__cache_compression_level__ = level
+
+    start = time.perf_counter()
+    encoded = [_ModelRedisBaseMeta._encode_cache_value(Model, obj) for obj in objs]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for obj in encoded:
+        _ModelRedisBaseMeta._decode_cache_value(Model, obj)
+    decode_time = time.perf_counter() - start
+
+    size = sum([len(obj) for obj in encoded])
+    return size, encode_time / len(objs), decode_time / len(objs)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    objs = build_objects(args.objects, args.children)
+    raw_size = sum([len(obj.encode()) for obj in objs])
+    print('objects: {}, raw size: {:.1f}KB, mean size: {}B'.format(
+        args.objects, raw_size / 1024, raw_size // args.objects))
+
+    size, encode_time, decode_time = run(objs, None, 0)
+    print('no compression:          ratio 1.00, encode {:.2f}us, decode {:.2f}us'.format(
+        encode_time * 1000000, decode_time * 1000000))
+
+    for threshold in args.thresholds:
+        for level in args.levels:
+            size, encode_time, decode_time = run(objs, threshold, level)
+            print('threshold {:>5}, level {}: ratio {:.2f}, encode {:.2f}us, decode {:.2f}us'.format(
+                threshold, level, size / raw_size, encode_time * 1000000, decode_time * 1000000))
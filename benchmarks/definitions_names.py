@@ -0,0 +1,115 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models._swaggerit_meta import _format_definitions_names
+from copy import deepcopy
+import argparse
+import re
+import time
+import ujson
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - definitions names")
+parser.add_argument('--definitions', '-d', type=int, default=500)
+parser.add_argument('--paths', '-p', type=int, default=500)
+parser.add_argument('--repeat', '-r', type=int, default=10)
+
+
+def build_schema(definitions, paths):
+    return {
+        'paths': {
+            '/items{}'.format(i): {
+                'post': {
+                    'operationId': 'operation',
+                    'parameters': [{
+                        'name': 'body',
+                        'in': 'body',
+                        'schema': {'$ref': '#/definitions/item{}'.format(i % definitions)}
+                    }],
+                    'responses': {'200': {'description': 'test'}}
+                }
+            } for i in range(paths)
+        },
+        'definitions': {
+            'item{}'.format(i): {
+                'type': 'object',
+                'properties': dict(
+                    [('field{}'.format(j), {'type': 'string'}) for j in range(10)] +
+                    [('child', {'$ref': '#/definitions/item{}'.format((i + 1) % definitions)})]
+                )
+            } for i in range(definitions)
+        }
+    }
+
+
+def dump_regex_load(obj, model_name):
+    definitions = obj.__swagger_json__.get('definitions', {})
+    for def_name in list(definitions.keys()):
+        definitions['{}.{}'.format(model_name, def_name)] = definitions.pop(def_name)
+
+    schema = ujson.dumps(obj.__swagger_json__, escape_forward_slashes=False)
+    schema = re.sub(r'("\$ref":"#/definitions/)([^/"]+)', r'\1{}.\2'.format(model_name), schema)
+    obj.__swagger_json__ = ujson.loads(schema)
+
+
+class Model(object):
+    pass
+
+
+def run_classes(format_, args):
+    elapsed = 0
+
+    for _ in range(args.repeat):
+        Model.__swagger_json__ = build_schema(args.definitions, args.paths)
+        start = time.perf_counter()
+        format_(Model, 'Model')
+        elapsed += time.perf_counter() - start
+
+    return elapsed / args.repeat
+
+
+def run_instances(format_, args, copy_schema):
+    schema = build_schema(args.definitions, args.paths)
+    start = time.perf_counter()
+
+    for _ in range(args.repeat):
+        obj = Model()
+        obj.__swagger_json__ = deepcopy(schema) if copy_schema else schema
+        format_(obj, 'Model')
+
+    return (time.perf_counter() - start) / args.repeat
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    print('definitions: {}, paths: {}'.format(args.definitions, args.paths))
+
+    old = run_classes(dump_regex_load, args)
+    new = run_classes(_format_definitions_names, args)
+    print('model class, dump/regex/load: {:.2f}ms'.format(old * 1000))
+    print('model class, structural:      {:.2f}ms'.format(new * 1000))
+
+    old = run_instances(dump_regex_load, args, True)
+    new = run_instances(_format_definitions_names, args, False)
+    print('model instance, deepcopy/dump/regex/load: {:.2f}ms'.format(old * 1000))
+    print('model instance, structural:               {:.2f}ms'.format(new * 1000))
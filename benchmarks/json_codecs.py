@@ -0,0 +1,87 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.codecs import UJsonCodec, OrJsonCodec, MsgPackCodec
+import argparse
+import time
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - json codecs")
+parser.add_argument('--objects', '-o', type=int, default=1000)
+parser.add_argument('--children', '-c', type=int, default=10)
+parser.add_argument('--repeat', '-r', type=int, default=10)
+
+
+def build_objects(objects, children):
+    return [{
+        'id': i,
+        'name': 'object{}'.format(i),
+        'url': 'http://example.com/objects/{}'.format(i),
+        'children': [{
+            'id': j,
+            'name': 'child{}'.format(j),
+            'price': j * 1.5,
+            'active': bool(j % 2)
+        } for j in range(children)]
+    } for i in range(objects)]
+
+
+def build_codecs():
+    codecs = []
+
+    for name, codec_class in (
+            ('ujson', UJsonCodec), ('orjson', OrJsonCodec), ('msgpack', MsgPackCodec)):
+        try:
+            codecs.append((name, codec_class()))
+        except ImportError:
+            print('{}: not installed'.format(name))
+
+    return codecs
+
+
+def run(codec, objs, repeat):
+    encode_time = decode_time = 0
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoded = [codec.encode(obj) for obj in objs]
+        encode_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for obj in encoded:
+            codec.decode(obj)
+        decode_time += time.perf_counter() - start
+
+    size = sum([len(obj) for obj in encoded])
+    return size, encode_time / repeat, decode_time / repeat
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    objs = build_objects(args.objects, args.children)
+    print('objects: {}, children: {}'.format(args.objects, args.children))
+
+    for name, codec in build_codecs():
+        size, encode_time, decode_time = run(codec, objs, args.repeat)
+        print('{:<8} size {:.1f}KB, encode {:.2f}ms, decode {:.2f}ms'.format(
+            name, size / 1024, encode_time * 1000, decode_time * 1000))
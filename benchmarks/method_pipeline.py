@@ -0,0 +1,60 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.method import SwaggerMethod
+from swaggerit.request import SwaggerRequest
+from swaggerit.response import SwaggerResponse
+import argparse
+import asyncio
+import time
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - request pipeline")
+parser.add_argument('--requests', '-n', type=int, default=100000)
+
+
+async def operation(req, session=None):
+    return SwaggerResponse(200, headers={'content-type': 'application/json'})
+
+
+async def run(handler, requests):
+    req = SwaggerRequest('/', 'get', headers={'host': 'localhost'})
+    start = time.perf_counter()
+
+    for _ in range(requests):
+        await handler(req, None)
+
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+    method = SwaggerMethod(operation, {'operationId': 'test'}, None, '.')
+
+    generic = loop.run_until_complete(run(method, args.requests))
+    compiled = loop.run_until_complete(run(method.compile(), args.requests))
+
+    print('generic:  {:.3f} us/request'.format(generic / args.requests * 1e6))
+    print('compiled: {:.3f} us/request'.format(compiled / args.requests * 1e6))
+    print('overhead reduction: {:.1f}%'.format((1 - compiled / generic) * 100))
@@ -0,0 +1,68 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm.factory import FactoryOrmModels
+import sqlalchemy as sa
+import argparse
+import time
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - models import")
+parser.add_argument('--models', '-m', type=int, default=300)
+
+
+def build_model(base, i):
+    attributes = {
+        '__tablename__': 'model{}'.format(i),
+        'id': sa.Column(sa.Integer, primary_key=True)
+    }
+
+    if i:
+        attributes['parent_id'] = sa.Column(sa.ForeignKey('model{}.id'.format(i - 1)))
+        attributes['parent'] = sa.orm.relationship('Model{}'.format(i - 1))
+
+    if i > 1:
+        attributes['grandparent_id'] = sa.Column(sa.ForeignKey('model{}.id'.format(i - 2)))
+        attributes['grandparent'] = sa.orm.relationship(
+            'Model{}'.format(i - 2), foreign_keys=[attributes['grandparent_id']])
+        attributes['parent'] = sa.orm.relationship(
+            'Model{}'.format(i - 1), foreign_keys=[attributes['parent_id']])
+
+    return type(base)('Model{}'.format(i), (base,), attributes)
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+    base = FactoryOrmModels.make_sqlalchemy_redis_base()
+
+    start = time.perf_counter()
+    models = [build_model(base, i) for i in range(args.models)]
+    import_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backrefs = sum(len(model.get_backrefs()) for model in models)
+    graph_time = time.perf_counter() - start
+
+    print('models: {}, backrefs: {}'.format(args.models, backrefs))
+    print('import: {:.3f}s'.format(import_time))
+    print('relationships graph: {:.3f}s'.format(graph_time))
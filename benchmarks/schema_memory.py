@@ -0,0 +1,110 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.api import SwaggerAPI
+from swaggerit.models.swaggerit import SwaggerItModel
+import argparse
+import tracemalloc
+
+
+parser = argparse.ArgumentParser(description="swaggerit benchmark - schema memory")
+parser.add_argument('--operations', '-o', type=int, default=1000)
+parser.add_argument('--instances', '-i', type=int, default=1000)
+
+
+def build_schema(operations):
+    definition = {
+        'type': 'object',
+        'properties': {'field{}'.format(i): {'type': 'string'} for i in range(20)}
+    }
+    return {
+        'paths': {
+            '/items{}/{{id}}'.format(i): {
+                'parameters': [{
+                    'name': 'id',
+                    'in': 'path',
+                    'required': True,
+                    'type': 'integer'
+                }],
+                'post': {
+                    'operationId': 'operation',
+                    'parameters': [{
+                        'name': 'body',
+                        'in': 'body',
+                        'schema': {'$ref': '#/definitions/item'}
+                    }],
+                    'responses': {'200': {'description': 'test'}}
+                }
+            } for i in range(operations)
+        },
+        'definitions': {'item': definition}
+    }
+
+
+class BenchmarkAPI(SwaggerAPI):
+
+    def _set_handler_decorator(self, handler):
+        return handler
+
+    def _set_static_handler_decorator(self, response):
+        return response
+
+    def _set_route(self, path, method, handler):
+        self.routes.append(handler)
+
+    def _set_swagger_doc(self, swagger_doc_url):
+        pass
+
+
+def measure(func):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return size, result
+
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    class RoutesModel(SwaggerItModel):
+        __swagger_json__ = build_schema(args.operations)
+
+        async def operation(self, req, session):
+            pass
+
+    class InstancesModel(SwaggerItModel):
+        __swagger_json__ = build_schema(10)
+
+        async def operation(self, req, session):
+            pass
+
+    model = RoutesModel()
+    BenchmarkAPI.routes = []
+    size, api = measure(lambda: BenchmarkAPI([model], title='Benchmark'))
+    print('routes: {}, {:.0f} bytes/route'.format(len(api.routes), size / len(api.routes)))
+
+    size, _ = measure(lambda: [InstancesModel(key_sufix=i) for i in range(args.instances)])
+    print('instances: {}, {:.0f} bytes/instance'.format(args.instances, size / args.instances))
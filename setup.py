@@ -43,7 +43,7 @@ https://github.com/dutradda/swaggerit
 '''
 
 install_requires = [
-    'SQLAlchemy==1.*',
+    'SQLAlchemy>=1.3,<2',
     'jsonschema==2.*',
     'ujson==1.*',
     'hiredis==0.2.*',
@@ -20,10 +20,33 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from swaggerit.api import SwaggerAPI
-from swaggerit.aiohttp_api import AioHttpAPI
-from swaggerit.response import SwaggerResponse
-from swaggerit.models.swaggerit import SwaggerItModel
-from swaggerit.models.orm.factory import FactoryOrmModels
-from swaggerit.models.orm.jobs import JobsModel
-from swaggerit.models.orm.session import Session
+from swaggerit._lazy import set_lazy_attributes, import_attribute
+
+
+__all__ = [
+    'SwaggerAPI', 'AioHttpAPI', 'SwaggerResponse', 'static_response', 'AuthorizerCache',
+    'LocalCache', 'SwaggerItModel', 'FactoryOrmModels', 'JobsModel', 'Session', 'SQLExecutor',
+    'CacheWriteBehind', 'CachePolicy', 'CacheSweeper', 'UJsonCodec', 'OrJsonCodec',
+    'MsgPackCodec'
+]
+
+
+set_lazy_attributes(__name__, {
+    'SwaggerAPI': import_attribute('swaggerit.api', 'SwaggerAPI'),
+    'AioHttpAPI': import_attribute('swaggerit.aiohttp_api', 'AioHttpAPI'),
+    'SwaggerResponse': import_attribute('swaggerit.response', 'SwaggerResponse'),
+    'static_response': import_attribute('swaggerit.response', 'static_response'),
+    'AuthorizerCache': import_attribute('swaggerit.cache', 'AuthorizerCache'),
+    'LocalCache': import_attribute('swaggerit.cache', 'LocalCache'),
+    'SwaggerItModel': import_attribute('swaggerit.models.swaggerit', 'SwaggerItModel'),
+    'FactoryOrmModels': import_attribute('swaggerit.models.orm.factory', 'FactoryOrmModels'),
+    'JobsModel': import_attribute('swaggerit.models.orm.jobs', 'JobsModel'),
+    'Session': import_attribute('swaggerit.models.orm.session', 'Session'),
+    'SQLExecutor': import_attribute('swaggerit.models.orm.executor', 'SQLExecutor'),
+    'CacheWriteBehind': import_attribute('swaggerit.models.orm.write_behind', 'CacheWriteBehind'),
+    'CachePolicy': import_attribute('swaggerit.models.orm.cache_policy', 'CachePolicy'),
+    'CacheSweeper': import_attribute('swaggerit.models.orm.cache_policy', 'CacheSweeper'),
+    'UJsonCodec': import_attribute('swaggerit.codecs', 'UJsonCodec'),
+    'OrJsonCodec': import_attribute('swaggerit.codecs', 'OrJsonCodec'),
+    'MsgPackCodec': import_attribute('swaggerit.codecs', 'MsgPackCodec')
+})
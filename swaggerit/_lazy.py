@@ -0,0 +1,54 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from types import ModuleType
+import sys
+
+
+class _LazyModule(ModuleType):
+
+    def __getattr__(self, name):
+        loader = self.__lazy_attributes__.get(name)
+        if loader is None:
+            raise AttributeError("module '{}' has no attribute '{}'".format(self.__name__, name))
+
+        value = loader()
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(ModuleType.__dir__(self)).union(self.__lazy_attributes__))
+
+
+def set_lazy_attributes(module_name, loaders):
+    module = sys.modules[module_name]
+    module.__lazy_attributes__ = loaders
+    module.__class__ = _LazyModule
+
+
+def import_attribute(module_name, name):
+    def loader():
+        module = __import__(module_name, fromlist=[name])
+        return getattr(module, name)
+
+    return loader
@@ -23,6 +23,7 @@
 
 from swaggerit.api import SwaggerAPI
 from swaggerit.request import SwaggerRequest
+from swaggerit.codecs import DEFAULT_CODEC
 from aiohttp.web import Application, Response as AioHttpResponse
 from aiohttp_swagger import setup_swagger
 from urllib.parse import parse_qs
@@ -36,7 +37,9 @@ class AioHttpAPI(SwaggerAPI, Application):
                  elsearch_bind=None, swagger_json_template=None, title=None,
                  version='1.0.0', authorizer=None, get_swagger_req_auth=True,
                  loop=None, debug=False, swagger_doc_url='doc', redis_bind_sync=None,
-                 redis_bind_cy=None):
+                 redis_bind_cy=None, authorizer_cache=None, compile_handlers=True,
+                 sql_executor=None, local_cache=None, cache_write_behind=None,
+                 codec=DEFAULT_CODEC, cache_sweeper=None):
         Application.__init__(self, loop=loop, debug=debug)
         SwaggerAPI.__init__(
             self, models, sqlalchemy_bind,
@@ -44,18 +47,70 @@ class AioHttpAPI(SwaggerAPI, Application):
             swagger_json_template, title,
             version, authorizer,
             get_swagger_req_auth, swagger_doc_url,
-            redis_bind_sync, redis_bind_cy
+            redis_bind_sync, redis_bind_cy,
+            authorizer_cache, compile_handlers,
+            sql_executor, local_cache,
+            cache_write_behind, codec,
+            cache_sweeper
         )
 
+        if local_cache is not None and redis_bind is not None:
+            self.on_startup.append(self._subscribe_local_cache)
+            self.on_cleanup.append(self._unsubscribe_local_cache)
+
+        if cache_write_behind is not None and redis_bind is not None:
+            self.on_startup.append(self._start_cache_write_behind)
+            self.on_shutdown.append(self._stop_cache_write_behind)
+
+        if cache_sweeper is not None and redis_bind is not None:
+            self.on_startup.append(self._start_cache_sweeper)
+            self.on_shutdown.append(self._stop_cache_sweeper)
+
+    async def _start_cache_write_behind(self, app):
+        self.cache_write_behind.start(self._build_session, self.loop)
+
+    async def _stop_cache_write_behind(self, app):
+        await self.cache_write_behind.stop()
+
+    async def _start_cache_sweeper(self, app):
+        self.cache_sweeper.start(self._models, self._redis_bind, self.local_cache, self.loop)
+
+    async def _stop_cache_sweeper(self, app):
+        await self.cache_sweeper.stop()
+
+    async def _subscribe_local_cache(self, app):
+        await self.local_cache.subscribe(self._redis_bind, self.loop)
+
+    async def _unsubscribe_local_cache(self, app):
+        await self.local_cache.unsubscribe()
+
     def _set_handler_decorator(self, method):
         method = self._method_decorator(method)
 
         async def _method_wrapper(req):
-            req = self._cast_request(req)
-            resp = await method(req)
-            return self._cast_response(resp)
+            swaggerit_req = self._cast_request(req)
+            resp = await method(swaggerit_req)
+            return self._cast_response(resp, head=req.method == 'HEAD')
         return _method_wrapper
 
+    def _set_static_handler_decorator(self, response, authorized_handler=None):
+        headers = dict(response.headers)
+        if headers.get('content-type') is None:
+            headers['content-type'] = self.codec.content_type
+
+        status = response.status_code
+        body = None if response.body is None else self._encode_body(response.body)
+
+        async def _static_wrapper(req):
+            if authorized_handler is not None and 'authorization' in req.headers:
+                return await authorized_handler(req)
+
+            if req.method == 'HEAD':
+                return AioHttpResponse(status=status, headers=headers)
+
+            return AioHttpResponse(body=body, status=status, headers=headers)
+        return _static_wrapper
+
     def _set_route(self, path, method, handler):
         self.router.add_route(method.upper(), path, handler)
         self.router.add_route(method.upper(), path + '/', handler)
@@ -71,14 +126,17 @@ class AioHttpAPI(SwaggerAPI, Application):
             query=query, headers=headers,
             body=body)
 
-    def _cast_response(self, resp):
+    def _cast_response(self, resp, head=False):
         if isinstance(resp, AioHttpResponse):
             return resp
 
-        body = None if resp.body is None else resp.body.encode()
+        body = None if head or resp.body is None else self._encode_body(resp.body)
         return AioHttpResponse(body=body, status=resp.status_code,
                         headers=resp.headers)
 
+    def _encode_body(self, body):
+        return body if isinstance(body, bytes) else body.encode()
+
     def _set_swagger_doc(self, swagger_doc_url):
         setup_swagger(self,
             swagger_url=swagger_doc_url,
@@ -100,6 +158,7 @@ class AioHttpAPI(SwaggerAPI, Application):
 
     def __getitem__(self, k):
         if k == 'SWAGGER_DEF_CONTENT':
+            # the swagger ui reads this as json text, whatever codec the api uses
             return ujson.dumps(self.swagger_json, escape_forward_slashes=True)
         else:
             return super().__getitem__(k)
@@ -23,10 +23,11 @@
 
 from swaggerit.method import SwaggerMethod
 from swaggerit.response import SwaggerResponse
-from swaggerit.models.orm.session import Session
 from swaggerit.exceptions import SwaggerItAPIError
-from swaggerit.constants import SWAGGER_JSON_TEMPLATE, SWAGGER_SCHEMA, HTTP_METHODS
+from swaggerit.constants import HTTP_METHODS
+from swaggerit import constants
 from swaggerit.utils import set_logger
+from swaggerit.codecs import DEFAULT_CODEC
 from collections import namedtuple, defaultdict
 from jsonschema import Draft4Validator, ValidationError, SchemaError
 from abc import ABCMeta, abstractmethod
@@ -41,11 +42,21 @@ class SwaggerAPI(metaclass=ABCMeta):
     def __init__(self, models, sqlalchemy_bind=None, redis_bind=None,
                    elsearch_bind=None, swagger_json_template=None, title=None,
                    version='1.0.0', authorizer=None, get_swagger_req_auth=True,
-                   swagger_doc_url='doc', redis_bind_sync=None, redis_bind_cy=None):
+                   swagger_doc_url='doc', redis_bind_sync=None, redis_bind_cy=None,
+                   authorizer_cache=None, compile_handlers=True, sql_executor=None,
+                   local_cache=None, cache_write_behind=None, codec=DEFAULT_CODEC,
+                   cache_sweeper=None):
         self._validate_metadata(swagger_json_template, title, version)
 
         set_logger(self)
         self.authorizer = authorizer
+        self.authorizer_cache = authorizer_cache
+        self._compile_handlers = compile_handlers
+        self.sql_executor = sql_executor
+        self.local_cache = local_cache
+        self.cache_write_behind = cache_write_behind
+        self.codec = codec
+        self.cache_sweeper = cache_sweeper
         self._sqlalchemy_bind = sqlalchemy_bind
         self._redis_bind = redis_bind
         self._elsearch_bind = elsearch_bind
@@ -75,7 +86,7 @@ class SwaggerAPI(metaclass=ABCMeta):
         if final_definitions:
             swagger_json['definitions'] = final_definitions
 
-        Draft4Validator(SWAGGER_SCHEMA).validate(swagger_json)
+        Draft4Validator(constants.SWAGGER_SCHEMA).validate(swagger_json)
 
     def _validate_metadata(self, swagger_json_template, title, version):
         if bool(title is None) == bool(swagger_json_template is None):
@@ -88,7 +99,7 @@ class SwaggerAPI(metaclass=ABCMeta):
 
     def _set_swagger_json_template(self, swagger_json_template, title, version):
         if swagger_json_template is None:
-            swagger_json_template = deepcopy(SWAGGER_JSON_TEMPLATE)
+            swagger_json_template = deepcopy(constants.SWAGGER_JSON_TEMPLATE)
             swagger_json_template['info']['title'] = title
             swagger_json_template['info']['version'] = version
 
@@ -118,17 +129,46 @@ class SwaggerAPI(metaclass=ABCMeta):
                     model.__name__, model.__api__.__class__.__name__
                 ))
 
+        build_relationships_graph = getattr(model, 'build_relationships_graph', None)
+        if build_relationships_graph is not None:
+            build_relationships_graph()
+
+        if model.__codec__ is DEFAULT_CODEC:
+            model.__codec__ = self.codec
+
         self._models.add(model)
         self._set_model_routes(model)
         model.__api__ = self
 
     def _set_model_routes(self, model):
+        head_paths = self._get_head_paths(model)
+
         for path, method, handler in self.get_model_methods(model):
-            handler = self._set_handler_decorator(handler)
-            self._set_route(path, method, handler)
+            if handler.static_response is not None and not handler.auth_required:
+                authorized_handler = None if handler.authorizer is None \
+                    else self._build_handler(handler)
+                handler = self._set_static_handler_decorator(
+                    handler.static_response, authorized_handler)
+                self._set_route(path, method, handler)
+
+                if method == 'get' and path not in head_paths:
+                    self._set_route(path, 'head', handler)
+
+            else:
+                self._set_route(path, method, self._build_handler(handler))
+
+    def _build_handler(self, handler):
+        if self._compile_handlers:
+            handler = handler.compile()
+        return self._set_handler_decorator(handler)
+
+    def _get_head_paths(self, model):
+        return set([self._format_path(path) for path, schema
+                    in model.__swagger_json__['paths'].items() if 'head' in schema])
 
     def get_model_methods(self, model):
         model_swagger_schema = model.__swagger_json__
+        resolvers = dict()
         paths_items_without_brackets = []
         paths_items_with_brackets = []
 
@@ -148,22 +188,28 @@ class SwaggerAPI(metaclass=ABCMeta):
                 method_schema = path_schema.get(method)
 
                 if method_schema is not None:
-                    method_schema = deepcopy(method_schema)
+                    method_schema = dict(method_schema)
                     definitions = model_swagger_schema.get('definitions')
-                    parameters = method_schema.get('parameters', [])
-                    parameters.extend(all_methods_parameters)
+                    parameters = method_schema.get('parameters', []) + all_methods_parameters
 
                     method_schema['parameters'] = parameters
                     operation = getattr(model, method_schema['operationId'].split('.')[-1])
                     handler = SwaggerMethod(operation, method_schema,
                                            definitions, model.__schema_dir__,
-                                           authorizer=self.authorizer)
+                                           authorizer=self.authorizer,
+                                           authorizer_cache=self.authorizer_cache,
+                                           codec=self.codec,
+                                           resolvers=resolvers)
                     yield path, method, handler
 
     @abstractmethod
     def _set_handler_decorator(self, handler):
         pass
 
+    @abstractmethod
+    def _set_static_handler_decorator(self, response, authorized_handler=None):
+        pass
+
     def _method_decorator(self, method):
         async def _method_wrapper(req):
             response_headers = {'content-type': 'application/json'}
@@ -171,7 +217,7 @@ class SwaggerAPI(metaclass=ABCMeta):
 
             response = await method(req, session)
 
-            self._destroy_session(session)
+            await self._destroy_session(session)
             return response
         _method_wrapper.func = method
         return _method_wrapper
@@ -190,15 +236,21 @@ class SwaggerAPI(metaclass=ABCMeta):
         return self._base_path
 
     def _build_session(self):
+        from swaggerit.models.orm.session import Session
         return Session(bind=self._sqlalchemy_bind,
                        redis_bind=self._redis_bind,
                        elsearch_bind=self._elsearch_bind,
                        redis_bind_sync=self._redis_bind_sync,
                        redis_bind_cy=self._redis_bind_cy,
-                       loop=self.loop)
-
-    def _destroy_session(self, session):
-        if hasattr(session, 'close'):
+                       loop=self.loop,
+                       sql_executor=self.sql_executor,
+                       local_cache=self.local_cache,
+                       cache_write_behind=self.cache_write_behind)
+
+    async def _destroy_session(self, session):
+        if hasattr(session, 'aclose'):
+            await session.aclose()
+        elif hasattr(session, 'close'):
             session.close()
 
     @abstractmethod
@@ -207,7 +259,12 @@ class SwaggerAPI(metaclass=ABCMeta):
 
     async def _authorize(self, req, session):
         if self.authorizer and self._get_swagger_req_auth:
-            response = await self.authorizer(req, session)
+            if self.authorizer_cache is None:
+                response = await self.authorizer(req, session)
+            else:
+                response = await self.authorizer_cache.authorize(
+                    self.authorizer, req, session, 'swagger_doc')
+
             if response is not None:
                 return response
 
@@ -0,0 +1,290 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from collections import OrderedDict
+from copy import deepcopy
+import ujson
+import asyncio
+import time
+
+
+_MISSING = object()
+
+
+class TTLCache(object):
+
+    def __init__(self, ttl=None, max_size=1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._items.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expire_at = item
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return default
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+
+        expire_at = None if ttl is None else time.monotonic() + ttl
+        self._items[key] = (value, expire_at)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def pop(self, key, default=None):
+        item = self._items.pop(key, _MISSING)
+        return default if item is _MISSING else item[0]
+
+    def pop_many(self, filter_):
+        keys = [key for key in self._items if filter_(key)]
+        for key in keys:
+            del self._items[key]
+
+        return keys
+
+    def clear(self):
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'size': len(self._items),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio
+        }
+
+
+def _dump_user(user):
+    return user.todict() if hasattr(user, 'todict') else user
+
+
+class AuthorizerCache(object):
+
+    def __init__(self, ttl=60, max_size=10000, negative_ttl=None, dump_user=_dump_user):
+        # Decisions are keyed by the authorization header, the operation id
+        # and the path params. Authorizers that also depend on the query
+        # string, the body or any other request data must not be cached.
+        # Only the decision and dump_user(session.user) are kept; requests
+        # served from the cache get a copy of the dumped user, never the
+        # object the authorizer set on its own session.
+        self.negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self.dump_user = dump_user
+        self._cache = TTLCache(ttl, max_size)
+        self._pending = dict()
+
+    async def authorize(self, authorizer, req, session, operation_id=None):
+        authorization = req.headers.get('authorization')
+        if authorization is None:
+            return await authorizer(req, session)
+
+        key = (authorization, operation_id, frozenset(req.path_params.items()))
+        cached = self._cache.get(key, _MISSING)
+
+        if cached is _MISSING:
+            pending = self._pending.get(key)
+            if pending is None:
+                return await self._authorize(authorizer, req, session, key)
+
+            try:
+                cached = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                return await self.authorize(authorizer, req, session, operation_id)
+
+        response, user = cached
+        if session is not None:
+            session.user = deepcopy(user)
+
+        return self._copy_response(response)
+
+    async def _authorize(self, authorizer, req, session, key):
+        pending = asyncio.Future()
+        self._pending[key] = pending
+
+        try:
+            response = await authorizer(req, session)
+            cached = (response, self.dump_user(getattr(session, 'user', None)))
+
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+
+        except Exception as error:
+            pending.set_exception(error)
+            pending.exception()
+            raise
+
+        finally:
+            del self._pending[key]
+
+        pending.set_result(cached)
+        ttl = self._cache.ttl if response is None else self.negative_ttl
+
+        if ttl:
+            self._cache.set(key, cached, ttl)
+
+        return self._copy_response(response)
+
+    def _copy_response(self, response):
+        return response if response is None else response._replace(headers=dict(response.headers))
+
+    def invalidate(self, authorization=None, operation_id=None):
+        if authorization is None and operation_id is None:
+            self._cache.clear()
+            return
+
+        def filter_(key):
+            return (authorization is None or key[0] == authorization) and \
+                (operation_id is None or key[1] == operation_id)
+
+        self._cache.pop_many(filter_)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+class LocalCache(object):
+
+    def __init__(self, max_size=10000, ttl=60, channel='swaggerit:cache_invalidation',
+                 subscriber_bind=None):
+        self.channel = channel
+        self.subscriber_bind = subscriber_bind
+        self.invalidations = 0
+        self._cache = TTLCache(ttl, max_size)
+        self._generations = dict()
+        self._redis = None
+        self._subscriber = None
+
+    def get_many(self, model_key, insts_keys):
+        return [self._cache.get((model_key, inst_key)) for inst_key in insts_keys]
+
+    def get_generation(self, model_key):
+        return self._generations.get(model_key, 0)
+
+    def set_many(self, model_key, insts_keys_objs_map, generation=None):
+        if generation is not None and generation != self.get_generation(model_key):
+            return
+
+        for inst_key, obj in insts_keys_objs_map.items():
+            if obj is not None:
+                self._cache.set((model_key, inst_key), obj)
+
+    def invalidate(self, models_keys_insts_keys_map):
+        for model_key, insts_keys in models_keys_insts_keys_map.items():
+            self._generations[model_key] = self.get_generation(model_key) + 1
+
+            if insts_keys is None:
+                self._cache.pop_many(lambda key: key[0] == model_key)
+            else:
+                for inst_key in insts_keys:
+                    self._cache.pop((model_key, inst_key))
+
+        self.invalidations += 1
+
+    # invalidation messages are an internal protocol between the api processes,
+    # so they don't follow the models codecs
+    def build_message(self, models_keys_insts_keys_map):
+        return ujson.dumps({
+            model_key: None if insts_keys is None else [key.decode() for key in insts_keys]
+            for model_key, insts_keys in models_keys_insts_keys_map.items()
+        })
+
+    def invalidate_from_message(self, message):
+        message = ujson.loads(message)
+        self.invalidate({
+            model_key: None if insts_keys is None else [key.encode() for key in insts_keys]
+            for model_key, insts_keys in message.items()
+        })
+
+    async def subscribe(self, redis=None, loop=None):
+        # a connection in pub/sub mode can't run any other command, so the
+        # data connection is never used to subscribe
+        subscriber = self.subscriber_bind
+        if subscriber is None:
+            subscriber = await self._create_subscriber(redis, loop)
+
+        channel, = await subscriber.subscribe(self.channel)
+        self._redis = subscriber
+        self._subscriber = asyncio.ensure_future(self._read_invalidations(channel), loop=loop)
+
+    async def _create_subscriber(self, redis, loop):
+        from aioredis import create_redis
+        return await create_redis(redis.address, db=redis.db, loop=loop)
+
+    async def _read_invalidations(self, channel):
+        while (await channel.wait_message()):
+            self.invalidate_from_message(await channel.get())
+
+    async def unsubscribe(self):
+        if self._subscriber is None:
+            return
+
+        await self._redis.unsubscribe(self.channel)
+        self._subscriber.cancel()
+
+        if self._redis is not self.subscriber_bind:
+            self._redis.close()
+            await self._redis.wait_closed()
+
+        self._redis = None
+        self._subscriber = None
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats['invalidations'] = self.invalidations
+        return stats
@@ -0,0 +1,89 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import ujson
+import struct
+
+
+class UJsonCodec(object):
+    content_type = 'application/json'
+
+    def __init__(self, escape_forward_slashes=False):
+        self.escape_forward_slashes = escape_forward_slashes
+
+    def encode(self, obj):
+        return ujson.dumps(obj, escape_forward_slashes=self.escape_forward_slashes).encode()
+
+    def decode(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+
+        return ujson.loads(data)
+
+    def join(self, encoded_objs):
+        return b'[' + b','.join(encoded_objs) + b']'
+
+
+class OrJsonCodec(object):
+    content_type = 'application/json'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def encode(self, obj):
+        return self._orjson.dumps(obj)
+
+    def decode(self, data):
+        return self._orjson.loads(data)
+
+    def join(self, encoded_objs):
+        return b'[' + b','.join(encoded_objs) + b']'
+
+
+class MsgPackCodec(object):
+    content_type = 'application/msgpack'
+
+    def __init__(self):
+        import msgpack
+        self._msgpack = msgpack
+
+    def encode(self, obj):
+        return self._msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data):
+        return self._msgpack.unpackb(data, raw=False)
+
+    def join(self, encoded_objs):
+        size = len(encoded_objs)
+        if size < 16:
+            header = struct.pack('>B', 0x90 | size)
+        elif size < 2**16:
+            header = struct.pack('>BH', 0xdc, size)
+        else:
+            header = struct.pack('>BI', 0xdd, size)
+
+        return header + b''.join(encoded_objs)
+
+
+DEFAULT_CODEC = UJsonCodec()
@@ -21,20 +21,32 @@
 # SOFTWARE.
 
 
-from swaggerit.utils import build_validator, get_swagger_json, get_dir_path
-import os.path
+from swaggerit._lazy import set_lazy_attributes
 
 
 HTTP_METHODS = ('delete', 'get', 'head', 'options', 'patch', 'post', 'put')
 
 
-SWAGGER_JSON_TEMPLATE = get_swagger_json(__file__, 'swagger_template.json')
+def _load_swagger_json_template():
+    from swaggerit.utils import get_swagger_json
+    return get_swagger_json(__file__, 'swagger_template.json')
 
 
-SWAGGER_SCHEMA = get_swagger_json(__file__, 'swagger_schema_extended.json')
+def _load_swagger_schema():
+    from swaggerit.utils import get_swagger_json
+    return get_swagger_json(__file__, 'swagger_schema_extended.json')
 
 
-SWAGGER_VALIDATOR = build_validator(
-    {'$ref': 'swagger_schema_extended.json#/definitions/paths'},
-    get_dir_path(__file__)
-)
+def _build_swagger_validator():
+    from swaggerit.utils import build_validator, get_dir_path
+    return build_validator(
+        {'$ref': 'swagger_schema_extended.json#/definitions/paths'},
+        get_dir_path(__file__)
+    )
+
+
+set_lazy_attributes(__name__, {
+    'SWAGGER_JSON_TEMPLATE': _load_swagger_json_template,
+    'SWAGGER_SCHEMA': _load_swagger_schema,
+    'SWAGGER_VALIDATOR': _build_swagger_validator
+})
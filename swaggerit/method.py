@@ -25,16 +25,18 @@ from swaggerit.json_builder import JsonBuilder
 from swaggerit.utils import build_validator, set_logger
 from swaggerit.request import SwaggerRequest
 from swaggerit.response import SwaggerResponse
+from swaggerit.codecs import DEFAULT_CODEC
 from jsonschema import ValidationError, SchemaError
-from copy import deepcopy
-import ujson
 
 
 class SwaggerMethod(object):
 
-    def __init__(self, operation, schema, definitions, schema_dir, *, authorizer=None):
+    def __init__(self, operation, schema, definitions, schema_dir, *,
+                 authorizer=None, authorizer_cache=None, codec=DEFAULT_CODEC,
+                 resolvers=None):
         set_logger(self)
         self._operation = operation
+        self._operation_id = schema.get('operationId')
         self._body_validator = None
         self._path_validator = None
         self._query_validator = None
@@ -44,7 +46,11 @@ class SwaggerMethod(object):
         self._has_body_parameter = False
         self.auth_required = False
         self.authorizer = authorizer
+        self.authorizer_cache = authorizer_cache
+        self.codec = codec
+        self.static_response = getattr(operation, 'static_response', None)
 
+        definitions = definitions or None
         query_schema = self._build_default_schema()
         path_schema = self._build_default_schema()
         headers_schema = self._build_default_schema()
@@ -52,12 +58,13 @@ class SwaggerMethod(object):
         for parameter in schema.get('parameters', []):
             if parameter['in'] == 'body':
                 if definitions:
-                    body_schema = deepcopy(parameter['schema'])
-                    body_schema.update({'definitions': definitions})
+                    body_schema = dict(parameter['schema'])
+                    body_schema['definitions'] = definitions
                 else:
                     body_schema = parameter['schema']
 
-                self._body_validator = build_validator(body_schema, self._schema_dir)
+                self._body_validator = build_validator(body_schema, self._schema_dir,
+                                                       definitions, resolvers)
                 self._body_required = parameter.get('required', False)
                 self._has_body_parameter = True
 
@@ -79,13 +86,16 @@ class SwaggerMethod(object):
                     self.auth_required = self._requires_auth(parameter)
 
         if path_schema['properties']:
-            self._path_validator = build_validator(path_schema, self._schema_dir)
+            self._path_validator = build_validator(path_schema, self._schema_dir,
+                                                   definitions, resolvers)
 
         if query_schema['properties']:
-            self._query_validator = build_validator(query_schema, self._schema_dir)
+            self._query_validator = build_validator(query_schema, self._schema_dir,
+                                                    definitions, resolvers)
 
         if headers_schema['properties']:
-            self._headers_validator = build_validator(headers_schema, self._schema_dir)
+            self._headers_validator = build_validator(headers_schema, self._schema_dir,
+                                                      definitions, resolvers)
 
     def _build_default_schema(self):
         return {'type': 'object', 'required': [], 'properties': {}}
@@ -117,7 +127,7 @@ class SwaggerMethod(object):
         if denied is not None:
             return denied
 
-        response_headers = {'content-type': 'application/json'}
+        response_headers = {'content-type': self.codec.content_type}
 
         try:
             body_params = await self._build_body_params(req)
@@ -142,6 +152,11 @@ class SwaggerMethod(object):
             context=req.context
         )
 
+        return await self._execute(req, session)
+
+    async def _execute(self, req, session):
+        response_headers = {'content-type': self.codec.content_type}
+
         try:
             if session is None:
                 resp = await self._operation(req)
@@ -152,7 +167,7 @@ class SwaggerMethod(object):
             return self._valdation_error_to_response(error, response_headers)
 
         except Exception as error:
-            body = ujson.dumps({'message': 'Something unexpected happened'})
+            body = self.codec.encode({'message': 'Something unexpected happened'})
             self._logger.exception('Unexpected')
             return SwaggerResponse(500, body=body, headers=response_headers)
 
@@ -161,6 +176,46 @@ class SwaggerMethod(object):
                 resp.headers.update(response_headers)
             return resp
 
+    def compile(self):
+        authorize = self._authorize \
+            if self.auth_required or self.authorizer is not None else None
+        has_body = self._has_body_parameter or self._body_required
+        validators = [(name, validator) for name, validator in (
+            ('query', self._query_validator),
+            ('path_params', self._path_validator),
+            ('headers', self._headers_validator)
+        ) if validator is not None]
+        body_schema = self._body_validator.schema if self._body_validator else None
+        build_body_params = self._build_body_params
+        build_non_body_params = self._build_non_body_params
+        execute = self._execute
+
+        async def _compiled_method(req, session):
+            if authorize is not None:
+                denied = await authorize(req, session)
+                if denied is not None:
+                    return denied
+
+            if not has_body and not validators \
+                    and req.body is None and req.headers.get('content-type') is None:
+                return await execute(req, session)
+
+            try:
+                params = {'body': await build_body_params(req), 'body_schema': body_schema}
+                for name, validator in validators:
+                    values = getattr(req, name)
+                    values = dict(values) if name == 'headers' else values
+                    params[name] = build_non_body_params(validator, values)
+
+            except (ValidationError, SchemaError) as error:
+                return self._valdation_error_to_response(
+                    error, {'content-type': self.codec.content_type})
+
+            return await execute(req._replace(**params), session)
+
+        _compiled_method.method = self
+        return _compiled_method
+
     def _valdation_error_to_response(self, error, headers):
         if error.absolute_path or error.absolute_schema_path:
             message = '{}. Failed validating instance{} for schema{}'.format(
@@ -178,7 +233,7 @@ class SwaggerMethod(object):
             body['schema'] = error.schema
         if error.instance:
             body['instance'] = error.instance
-        return SwaggerResponse(400, body=ujson.dumps(body), headers=headers)
+        return SwaggerResponse(400, body=self.codec.encode(body), headers=headers)
 
     def _format_error_path(self, path):
         path = [str(p) for p in path]
@@ -188,7 +243,12 @@ class SwaggerMethod(object):
         authorization = req.headers.get('authorization')
 
         if self.auth_required or (self.authorizer and authorization is not None):
-            response = await self.authorizer(req, session)
+            if self.authorizer_cache is None:
+                response = await self.authorizer(req, session)
+            else:
+                response = await self.authorizer_cache.authorize(
+                    self.authorizer, req, session, self._operation_id)
+
             if response is not None:
                 return response
 
@@ -201,7 +261,7 @@ class SwaggerMethod(object):
         elif self._body_required and req.body is None:
             raise ValidationError('Request body is missing', instance=req.body)
 
-        elif content_type is not None and 'application/json' in content_type:
+        elif content_type is not None and self.codec.content_type in content_type:
             if req.body is None:
                 raise ValidationError(
                     "Request body must be setted when 'content-type' header is setted",
@@ -225,11 +285,11 @@ class SwaggerMethod(object):
             return req.body
 
     async def _cast_body(self, body):
-        body = (await body.read()).decode()
+        body = await body.read()
         try:
-            return (ujson.loads(body), None)
+            return (self.codec.decode(body), None)
         except Exception as error:
-            return body, error
+            return body.decode(errors='replace'), error
 
     def _build_non_body_params(self, validator, params):
         if validator:
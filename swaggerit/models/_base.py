@@ -26,6 +26,7 @@ _all_models = dict()
 
 from swaggerit.exceptions import SwaggerItModelError
 from swaggerit.utils import set_logger
+from swaggerit.codecs import DEFAULT_CODEC
 from types import MethodType
 import ujson
 import re
@@ -56,9 +57,12 @@ def _init(obj, name):
         _all_models[key] = obj
 
     set_logger(obj)
+    obj.__codec__ = getattr(obj, '__codec__', DEFAULT_CODEC)
     obj.get_model = MethodType(_get_model, obj)
     obj._unpack_obj = MethodType(_unpack_obj, obj)
     obj._pack_obj = MethodType(_pack_obj, obj)
+    obj._decode_obj = MethodType(_decode_obj, obj)
+    obj._encode_obj = MethodType(_encode_obj, obj)
 
 def _camel_case_convert(name):
     s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
@@ -67,12 +71,20 @@ def _camel_case_convert(name):
 def _get_model(obj, name):
     return _all_models.get(name)
 
+# _pack_obj/_unpack_obj keep working with json text for subclasses and user code,
+# _encode_obj/_decode_obj produce and read the model codec bytes used on the wire
 def _unpack_obj(inst, obj):
     return ujson.loads(obj)
 
 def _pack_obj(inst, obj):
     return ujson.dumps(obj, escape_forward_slashes=False)
 
+def _decode_obj(inst, obj):
+    return inst.__codec__.decode(obj)
+
+def _encode_obj(inst, obj):
+    return inst.__codec__.encode(obj)
+
 
 class _ModelBase(object):
     __all_models__ = _all_models
@@ -22,12 +22,12 @@
 
 
 from swaggerit.models._base import _ModelBaseMeta, _ModelBase
-from swaggerit.constants import SWAGGER_VALIDATOR
+from swaggerit import constants
 from swaggerit.exceptions import SwaggerItModelError
 from swaggerit.utils import get_module_path, set_method
-from swaggerit.response import SwaggerResponse
+from swaggerit.response import SwaggerResponse, static_response
+from types import MethodType
 import re
-import ujson
 
 
 class _ModelSwaggerItMeta(_ModelBaseMeta):
@@ -38,13 +38,15 @@ class _ModelSwaggerItMeta(_ModelBaseMeta):
 
 
 def _init(obj):
-    set_method(obj, _build_response)
+    build_response = getattr(obj, '_build_response', None)
+    if build_response is None or getattr(build_response, '__func__', None) is _build_response:
+        obj._build_response = MethodType(_build_response, obj)
 
     if hasattr(obj, '__model_base__') and hasattr(obj, '__swagger_json__'):
         if not 'paths' in obj.__swagger_json__:
             raise SwaggerItModelError("The 'paths' property of swagger json is mandatory.")
 
-        SWAGGER_VALIDATOR.validate(obj.__swagger_json__['paths'])
+        constants.SWAGGER_VALIDATOR.validate(obj.__swagger_json__['paths'])
         _validate_operation(obj)
 
         if isinstance(obj, type):
@@ -60,14 +62,75 @@ def _init(obj):
         _set_default_options(obj, model_name)
 
 def _format_definitions_names(obj, model_name):
-    definitions = obj.__swagger_json__.get('definitions', {})
-    definitions_keys = list(definitions.keys())
-    for def_name in definitions_keys:
-        definitions['{}.{}'.format(model_name, def_name)] = definitions.pop(def_name)
+    schema = obj.__swagger_json__
 
-    schema = ujson.dumps(obj.__swagger_json__, escape_forward_slashes=False)
-    schema = re.sub(r'("\$ref":"#/definitions/)([^/"]+)', r'\1{}.\2'.format(model_name), schema)
-    obj.__swagger_json__ = ujson.loads(schema)
+    if isinstance(obj, type):
+        formatted_schema = _build_formatted_schema(schema, model_name)
+
+    elif schema is getattr(type(obj), '__swagger_json__', None):
+        model = type(obj)
+        cached = model.__dict__.get('__formatted_swagger_json__')
+
+        if cached is None or cached[0] is not schema:
+            cached = (schema, _build_formatted_schema(schema, model_name))
+            model.__formatted_swagger_json__ = cached
+
+        formatted_schema = cached[1]
+
+    else:
+        formatted_schema = _build_formatted_schema(schema, model_name)
+
+    obj.__swagger_json__ = _copy_paths_schemas(formatted_schema)
+
+def _build_formatted_schema(schema, model_name):
+    ref_prefix = '#/definitions/'
+    schema = dict(_format_refs(schema, ref_prefix, '{}{}.'.format(ref_prefix, model_name)))
+    definitions = schema.get('definitions')
+
+    if definitions:
+        schema['definitions'] = {'{}.{}'.format(model_name, def_name): definition
+                                 for def_name, definition in definitions.items()}
+
+    return schema
+
+def _format_refs(node, prefix, new_prefix):
+    if isinstance(node, dict):
+        formatted = None
+
+        for key, value in node.items():
+            if key == '$ref':
+                if isinstance(value, str) and value.startswith(prefix):
+                    new_value = new_prefix + value[len(prefix):]
+                else:
+                    continue
+            elif isinstance(value, (dict, list)):
+                new_value = _format_refs(value, prefix, new_prefix)
+                if new_value is value:
+                    continue
+            else:
+                continue
+
+            if formatted is None:
+                formatted = dict(node)
+            formatted[key] = new_value
+
+        return node if formatted is None else formatted
+
+    if isinstance(node, list):
+        formatted = [_format_refs(value, prefix, new_prefix) for value in node]
+        if any(new is not old for new, old in zip(formatted, node)):
+            return formatted
+
+    return node
+
+def _copy_paths_schemas(schema):
+    schema = dict(schema)
+    schema['paths'] = {
+        path_name: {key: dict(value) if isinstance(value, dict) else value
+                    for key, value in path.items()}
+        for path_name, path in schema['paths'].items()
+    }
+    return schema
 
 def _format_operations_names(obj, model_name):
     for path_name, path in obj.__swagger_json__['paths'].items():
@@ -99,11 +162,16 @@ def _set_default_options(obj, model_name):
             schema['options'] = _build_options_schema(options_operation_name, model_name)
 
 def _build_response(obj, status_code, headers=None, body=None):
+    if body is not None and (headers is None or 'content-type' not in headers):
+        headers = dict(headers or {})
+        headers['content-type'] = obj.__codec__.content_type
+
     return SwaggerResponse(status_code, headers, body)
 
 def _options_operation_decor(headers):
+    @static_response(200, headers)
     async def _options_operation(obj, req, sess):
-        return obj._build_response(200, headers)
+        pass
 
     return _options_operation
 
@@ -53,7 +53,7 @@ def _create_job(obj, func, jobs_id, req, session, *arg, **kwargs):
     job_hash = '{:x}'.format(random.getrandbits(128))
     job = partial(func, req, session, *arg, **kwargs)
     session.loop.run_in_executor(None, obj._job_watcher, jobs_id, job_hash, job, session)
-    return obj._build_response(201, body=obj._pack_obj({'job_hash': job_hash}))
+    return obj._build_response(201, body=obj._encode_obj({'job_hash': job_hash}))
 
 def _job_watcher(obj, jobs_id, job_hash, job, session):
     asyncio.run_coroutine_threadsafe(
@@ -97,7 +97,7 @@ def _job_watcher(obj, jobs_id, job_hash, job, session):
 async def _set_job(obj, jobs_id, job_hash, job_obj, session):
     key = obj._build_jobs_key(jobs_id)
     last_job_key = obj._build_last_job_key(jobs_id)
-    job_obj = obj._pack_obj(job_obj)
+    job_obj = obj._encode_obj(job_obj)
 
     await session.redis_bind.hset(key, job_hash, job_obj)
     if await session.redis_bind.ttl(key) < 0:
@@ -125,7 +125,7 @@ async def _get_job(obj, jobs_id, req, session):
     if job_obj is None:
         return obj._build_response(404)
     else:
-        return obj._build_response(200, body=job_obj.decode())
+        return obj._build_response(200, body=job_obj)
 
 async def _get_all_jobs(obj, jobs_id, req, session):
     jobs = await session.redis_bind.hgetall(obj._build_jobs_key(jobs_id))
@@ -137,13 +137,16 @@ async def _get_all_jobs(obj, jobs_id, req, session):
         all_jobs = defaultdict(dict)
 
         for job_id, job in jobs.items():
-            job = obj._unpack_obj(job)
+            job = obj._decode_obj(job)
             all_jobs[job.pop('status')][job_id] = job
 
-        return obj._pack_obj(all_jobs).encode()
+        return obj._encode_obj(all_jobs)
 
 def _copy_session(obj, session):
     return type(session)(bind=session.bind.engine.connect(),
                          redis_bind=session.redis_bind,
                          elsearch_bind=session.elsearch_bind,
-                         loop=session.loop)
+                         loop=session.loop,
+                         sql_executor=session.sql_executor,
+                         local_cache=session.local_cache,
+                         cache_write_behind=session.cache_write_behind)
@@ -24,6 +24,11 @@
 from swaggerit.models.orm._swaggerit_meta import _ModelSwaggerItOrmMeta
 from swaggerit.models._base import _ModelBaseMeta
 from swaggerit.exceptions import SwaggerItModelError
+import zlib
+
+
+_COMPRESSED_MARKER = b'\x00'
+_TOMBSTONE_MARKER = b'\x01'
 
 
 class _ModelRedisBaseMeta(_ModelSwaggerItOrmMeta):
@@ -35,6 +40,11 @@ class _ModelRedisBaseMeta(_ModelSwaggerItOrmMeta):
 
         _ModelSwaggerItOrmMeta.__init__(cls, name, bases_classes, attributes)
         cls.__key_separator__ = getattr(cls, '__key_separator__', b'|')
+        cls.__raw_passthrough__ = getattr(cls, '__raw_passthrough__', True)
+        cls.__storage_codec__ = getattr(cls, '__storage_codec__', None)
+        cls.__cache_compression_threshold__ = \
+            getattr(cls, '__cache_compression_threshold__', None)
+        cls.__cache_compression_level__ = getattr(cls, '__cache_compression_level__', 6)
 
     def _to_list(cls, objs):
         return objs if isinstance(objs, list) else [objs]
@@ -69,7 +79,68 @@ class _ModelRedisBaseMeta(_ModelSwaggerItOrmMeta):
         else:
             return {key: getattr(instance, key) for key in keys}
 
+    def _encode_cache_value(cls, value):
+        threshold = cls.__cache_compression_threshold__
+        if threshold is None:
+            return value
+
+        if isinstance(value, str):
+            value = value.encode()
+
+        if len(value) < threshold:
+            return value
+
+        return _COMPRESSED_MARKER + zlib.compress(value, cls.__cache_compression_level__)
+
+    def _encode_cache_values(cls, values_map):
+        if cls.__cache_compression_threshold__ is None:
+            return values_map
+
+        return {key: cls._encode_cache_value(value) for key, value in values_map.items()}
+
+    def _decode_cache_value(cls, value):
+        if isinstance(value, bytes) and value[:1] == _COMPRESSED_MARKER:
+            return zlib.decompress(value[1:])
+
+        return value
+
+    def _get_storage_codec(cls):
+        return cls.__codec__ if cls.__storage_codec__ is None else cls.__storage_codec__
+
+    def _pack_cache_obj(cls, obj):
+        return cls._get_storage_codec().encode(obj)
+
+    def _unpack_cache_obj(cls, value):
+        return cls._get_storage_codec().decode(cls._decode_cache_value(value))
+
+    def _is_tombstone(cls, obj):
+        return isinstance(obj, bytes) and obj[:1] == _TOMBSTONE_MARKER
+
+    def _is_raw_cache_value(cls, value):
+        return not (isinstance(value, bytes)
+                    and value[:1] in (_COMPRESSED_MARKER, _TOMBSTONE_MARKER))
+
+    def _to_raw_objs(cls, objs):
+        raw_objs = []
+        for obj in objs:
+            if isinstance(obj, str):
+                obj = obj.encode()
+
+            if cls._is_tombstone(obj):
+                continue
+
+            if not cls._is_raw_cache_value(obj):
+                obj = cls._encode_obj(cls._unpack_cache_obj(obj))
+
+            raw_objs.append(obj)
+
+        return raw_objs
+
+    def _use_raw_passthrough(cls, session):
+        return _ModelSwaggerItOrmMeta._use_raw_passthrough(cls, session) \
+            and cls._get_storage_codec() is cls.__codec__
+
     def _unpack_objs(cls, objs):
         if isinstance(objs, dict):
             objs = objs.values()
-        return [cls._unpack_obj(obj) for obj in objs if obj is not None]
+        return [cls._unpack_cache_obj(obj) for obj in objs if obj is not None]
@@ -29,7 +29,8 @@ from functools import partial
 
 class _ModelSwaggerItOrmMeta(_ModelJobsMeta):
 
-    async def _execute_operation(cls, operation, status_code, has_404=True, pack_first=False):
+    async def _execute_operation(cls, operation, status_code, has_404=True,
+                                 pack_first=False, raw=False):
         try:
             objs = await operation()
 
@@ -39,7 +40,7 @@ class _ModelSwaggerItOrmMeta(_ModelJobsMeta):
             }
             if len(error.args) > 1:
                 error_obj['instance'] = error.args[1]
-            return cls._build_response(400, body=cls._pack_obj(error_obj))
+            return cls._build_response(400, body=cls._encode_obj(error_obj))
 
         except IntegrityError as error:
             error_obj = {
@@ -51,18 +52,34 @@ class _ModelSwaggerItOrmMeta(_ModelJobsMeta):
             }
             if len(error.detail):
                 error_obj['details'] = error.detail
-            return cls._build_response(400, body=cls._pack_obj(error_obj))
+            return cls._build_response(400, body=cls._encode_obj(error_obj))
 
         else:
+            if raw:
+                objs = cls._to_raw_objs(objs)
+
             if has_404 and not objs:
                 return cls._build_response(404)
             else:
-                if pack_first:
-                    body = cls._pack_obj(objs[0])
+                if raw:
+                    body = cls._join_raw_objs(objs, pack_first)
+                elif pack_first:
+                    body = cls._encode_obj(objs[0])
                 else:
-                    body = cls._pack_obj(objs)
+                    body = cls._encode_obj(objs)
                 return cls._build_response(status_code, body=body)
 
+    def _to_raw_objs(cls, objs):
+        return [obj.encode() if isinstance(obj, str) else obj for obj in objs]
+
+    def _join_raw_objs(cls, objs, pack_first):
+        return objs[0] if pack_first else cls.__codec__.join(objs)
+
+    def _use_raw_passthrough(cls, session):
+        return cls.__raw_passthrough__ and session.redis_bind is not None \
+            and hasattr(cls.__codec__, 'join') \
+            and getattr(cls.get, '__func__', None) is getattr(type(cls), 'get', None)
+
     async def swagger_insert(cls, req, session):
         operation = partial(cls.insert, session, req.body, **req.query)
         return await cls._execute_operation(operation, 201, False)
@@ -88,10 +105,18 @@ class _ModelSwaggerItOrmMeta(_ModelJobsMeta):
         return await cls._execute_operation(operation, 204, False)
 
     async def swagger_get(cls, req, session):
+        if cls._use_raw_passthrough(session):
+            operation = partial(cls.get_raw, session, ids=[req.path_params], **req.query)
+            return await cls._execute_operation(operation, 200, pack_first=True, raw=True)
+
         operation = partial(cls.get, session, ids=[req.path_params], **req.query)
         return await cls._execute_operation(operation, 200, pack_first=True)
 
     async def swagger_get_many(cls, req, session):
+        if req.query.get('ids') is not None and cls._use_raw_passthrough(session):
+            operation = partial(cls.get_raw, session, **req.query)
+            return await cls._execute_operation(operation, 200, raw=True)
+
         operation = partial(cls.get, session, **req.query)
         return await cls._execute_operation(operation, 200)
 
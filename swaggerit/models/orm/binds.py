@@ -1,6 +1,6 @@
 from aioes import Elasticsearch
 from aioes.client import IndicesClient
-import ujson
+from swaggerit.codecs import DEFAULT_CODEC
 
 
 class ElSearchBind(object):
@@ -22,15 +22,15 @@ class ElSearchBind(object):
             }
         )
 
-    async def bulk_update_dict(self, doc_type, dict_):
-        return await self._bulk_dict(doc_type, dict_, 'update')
+    async def bulk_update_dict(self, doc_type, dict_, codec=DEFAULT_CODEC):
+        return await self._bulk_dict(doc_type, dict_, 'update', codec)
 
-    async def _bulk_dict(self, doc_type, dict_, type_):
+    async def _bulk_dict(self, doc_type, dict_, type_, codec):
         body = []
         for key, value in dict_.items():
             key = key.decode() if isinstance(key, bytes) else key
             body.append({type_: {'_id': key}})
-            value = ujson.loads(value)
+            value = codec.decode(value)
 
             if type_ == 'update':
                 body.append({'doc': value})
@@ -39,8 +39,8 @@ class ElSearchBind(object):
 
         return await self._client.bulk(body, index=self._index, doc_type=doc_type)
 
-    async def bulk_create_dict(self, doc_type, dict_):
-        return await self._bulk_dict(doc_type, dict_, 'create')
+    async def bulk_create_dict(self, doc_type, dict_, codec=DEFAULT_CODEC):
+        return await self._bulk_dict(doc_type, dict_, 'create', codec)
 
     async def bulk_delete(self, doc_type, keys):
         body = [
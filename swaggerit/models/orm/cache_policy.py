@@ -0,0 +1,237 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.utils import set_logger
+import asyncio
+import hashlib
+import time
+
+
+_DELETE_FROM_INDEX_SCRIPT = '''
+local members
+if ARGV[1] == 'rank' then
+    local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[2])
+    if excess <= 0 then
+        return {}
+    end
+    members = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+else
+    members = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+end
+
+for i = 1, #members, 1000 do
+    local chunk = {unpack(members, i, math.min(i + 999, #members))}
+    redis.call('HDEL', KEYS[1], unpack(chunk))
+    for j = 2, #KEYS do
+        redis.call('ZREM', KEYS[j], unpack(chunk))
+    end
+end
+
+return members
+'''
+_DELETE_FROM_INDEX_SCRIPT_SHA = hashlib.sha1(_DELETE_FROM_INDEX_SCRIPT.encode()).hexdigest()
+
+
+class CachePolicy(object):
+
+    def __init__(self, max_entries=None, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+    def get_lru_key(self, hash_key):
+        return '{}__lru'.format(hash_key)
+
+    def get_ttl_key(self, hash_key):
+        return '{}__ttl'.format(hash_key)
+
+    def _get_indexes_keys(self, hash_key):
+        keys = []
+        if self.max_entries is not None:
+            keys.append(self.get_lru_key(hash_key))
+        if self.ttl is not None:
+            keys.append(self.get_ttl_key(hash_key))
+
+        return keys
+
+    def _build_pairs(self, score, insts_keys):
+        pairs = []
+        for inst_key in insts_keys:
+            pairs.extend((score, inst_key))
+
+        return pairs
+
+    def touch(self, pipeline, hash_key, insts_keys, now):
+        if self.max_entries is not None and insts_keys:
+            pipeline.zadd(self.get_lru_key(hash_key), *self._build_pairs(now, insts_keys),
+                          exist=pipeline.ZSET_IF_EXIST)
+
+    def add(self, pipeline, hash_key, insts_keys, now):
+        if not insts_keys:
+            return
+
+        if self.max_entries is not None:
+            pipeline.zadd(self.get_lru_key(hash_key), *self._build_pairs(now, insts_keys))
+
+        if self.ttl is not None:
+            pipeline.zadd(self.get_ttl_key(hash_key),
+                          *self._build_pairs(now + self.ttl, insts_keys))
+
+    def get_expirations(self, pipeline, hash_key, insts_keys):
+        if self.ttl is not None:
+            ttl_key = self.get_ttl_key(hash_key)
+            for inst_key in insts_keys:
+                pipeline.zscore(ttl_key, inst_key)
+
+    def drop_expired(self, objs, expirations, now):
+        return [None if expire_at is not None and float(expire_at) <= now else obj
+                for obj, expire_at in zip(objs, expirations)]
+
+    def remove(self, pipeline, hash_key, insts_keys):
+        if insts_keys:
+            for index_key in self._get_indexes_keys(hash_key):
+                pipeline.zrem(index_key, *insts_keys)
+
+    def clear(self, pipeline, hash_keys):
+        indexes_keys = []
+        for hash_key in hash_keys:
+            indexes_keys.extend(self._get_indexes_keys(hash_key))
+
+        if indexes_keys:
+            pipeline.delete(*indexes_keys)
+
+    async def evict(self, redis, hash_key, size=None):
+        if self.max_entries is None:
+            return []
+
+        if size is not None and size <= self.max_entries:
+            return []
+
+        return await self._delete(
+            redis, hash_key, self.get_lru_key(hash_key), 'rank', self.max_entries)
+
+    async def expire(self, redis, hash_key, now):
+        if self.ttl is None:
+            return []
+
+        return await self._delete(redis, hash_key, self.get_ttl_key(hash_key), 'score', now)
+
+    async def _delete(self, redis, hash_key, index_key, mode, limit):
+        indexes_keys = [key for key in self._get_indexes_keys(hash_key) if key != index_key]
+        keys = [hash_key, index_key] + indexes_keys
+        args = [mode, limit]
+
+        try:
+            return await redis.evalsha(_DELETE_FROM_INDEX_SCRIPT_SHA, keys=keys, args=args)
+        except Exception as error:
+            if not str(error).startswith('NOSCRIPT'):
+                raise
+
+        return await redis.eval(_DELETE_FROM_INDEX_SCRIPT, keys=keys, args=args)
+
+
+class CacheSweeper(object):
+
+    def __init__(self, interval=60):
+        set_logger(self)
+        self.interval = interval
+        self._models = []
+        self._redis = None
+        self._local_cache = None
+        self._worker = None
+        self._stopping = None
+        self._clean_stats()
+
+    def _clean_stats(self):
+        self.sweeps = 0
+        self.expired = 0
+        self.evicted = 0
+        self.errors = 0
+
+    def start(self, models, redis, local_cache=None, loop=None):
+        self._models = [model for model in models
+                        if getattr(model, '__cache_policy__', None) is not None]
+        self._redis = redis
+        self._local_cache = local_cache
+        self._stopping = asyncio.Event()
+        self._worker = asyncio.ensure_future(self._run(), loop=loop)
+
+    async def stop(self):
+        if self._worker is None:
+            return
+
+        self._stopping.set()
+        await self._worker
+        self._worker = None
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self.sweep()
+
+    async def sweep(self):
+        now = time.time()
+        changed_keys = dict()
+
+        for model in self._models:
+            try:
+                for hash_key in await self._get_hashes_keys(model):
+                    insts_keys = await self._sweep_hash(model.__cache_policy__, hash_key, now)
+                    if insts_keys:
+                        changed_keys[hash_key] = set(insts_keys)
+
+            except Exception:
+                self.errors += 1
+                self._logger.exception('Cache sweep failed')
+
+        if changed_keys and self._local_cache is not None:
+            await self._redis.publish(self._local_cache.channel,
+                                      self._local_cache.build_message(changed_keys))
+            self._local_cache.invalidate(changed_keys)
+
+        self.sweeps += 1
+        return changed_keys
+
+    async def _get_hashes_keys(self, model):
+        hashes_keys = set([key.decode() for key in
+                           await self._redis.smembers(model.get_filters_names_key())])
+        hashes_keys.add(model.__key__)
+        return hashes_keys
+
+    async def _sweep_hash(self, policy, hash_key, now):
+        expired = await policy.expire(self._redis, hash_key, now)
+        evicted = await policy.evict(self._redis, hash_key)
+        self.expired += len(expired)
+        self.evicted += len(evicted)
+        return expired + evicted
+
+    def stats(self):
+        return {
+            'models': len(self._models),
+            'interval': self.interval,
+            'sweeps': self.sweeps,
+            'expired': self.expired,
+            'evicted': self.evicted,
+            'errors': self.errors
+        }
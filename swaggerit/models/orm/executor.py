@@ -0,0 +1,129 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from weakref import WeakKeyDictionary
+import asyncio
+import time
+
+
+class SQLExecutor(object):
+
+    def __init__(self, bind=None, max_workers=None, max_queued=None, loop=None):
+        if max_workers is None:
+            max_workers = self._get_pool_size(bind)
+
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._loop = loop
+        self._executors = [ThreadPoolExecutor(1) for _ in range(max_workers)]
+        self._workers_loads = [0] * max_workers
+        self._affinities = WeakKeyDictionary()
+        self._semaphore = None
+        self._lock = Lock()
+        self._clean_stats()
+
+    def _get_pool_size(self, bind):
+        pool = getattr(getattr(bind, 'engine', bind), 'pool', None)
+        size = getattr(pool, 'size', None)
+
+        if callable(size):
+            return size() + max(getattr(pool, '_max_overflow', 0), 0)
+
+        return 5
+
+    def _clean_stats(self):
+        self.queued = 0
+        self.running = 0
+        self.executed = 0
+        self.queue_time = 0.0
+        self.max_queue_time = 0.0
+        self.exec_time = 0.0
+
+    async def run(self, func, *args, affinity=None):
+        if self.max_queued is None:
+            return await self._submit(func, args, affinity)
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers + self.max_queued)
+
+        async with self._semaphore:
+            return await self._submit(func, args, affinity)
+
+    def _submit(self, func, args, affinity):
+        loop = self._loop or asyncio.get_event_loop()
+        with self._lock:
+            worker = self._get_worker(affinity)
+            self._workers_loads[worker] += 1
+            self.queued += 1
+
+        return loop.run_in_executor(self._executors[worker], self._run,
+                                    worker, time.monotonic(), func, args)
+
+    def _get_worker(self, affinity):
+        worker = None if affinity is None else self._affinities.get(affinity)
+
+        if worker is None:
+            worker = min(range(self.max_workers), key=self._workers_loads.__getitem__)
+            if affinity is not None:
+                self._affinities[affinity] = worker
+
+        return worker
+
+    def _run(self, worker, submitted_at, func, args):
+        started_at = time.monotonic()
+        queue_time = started_at - submitted_at
+
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.queue_time += queue_time
+            self.max_queue_time = max(self.max_queue_time, queue_time)
+
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._workers_loads[worker] -= 1
+                self.running -= 1
+                self.executed += 1
+                self.exec_time += time.monotonic() - started_at
+
+    def stats(self):
+        with self._lock:
+            executed = self.executed
+            return {
+                'max_workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'queued': self.queued,
+                'running': self.running,
+                'executed': executed,
+                'avg_queue_time': self.queue_time / executed if executed else 0.0,
+                'max_queue_time': self.max_queue_time,
+                'avg_exec_time': self.exec_time / executed if executed else 0.0
+            }
+
+    def shutdown(self, wait=True):
+        for executor in self._executors:
+            executor.shutdown(wait=wait)
@@ -24,7 +24,6 @@
 from swaggerit.models.orm._redis_base import _ModelRedisBaseMeta
 from collections import OrderedDict, deque
 from copy import deepcopy
-import ujson
 
 
 class ModelRedisElSearchMeta(_ModelRedisBaseMeta):
@@ -42,23 +41,27 @@ class ModelRedisElSearchMeta(_ModelRedisBaseMeta):
                 continue
 
             obj_key = cls.get_instance_key(obj)
-            ids_objs_map[obj_key] = cls._pack_obj(obj)
+            ids_objs_map[obj_key] = cls._pack_cache_obj(obj)
             counter += 1
 
             if counter == cls.CHUNKS:
-                await session.redis_bind.hmset_dict(cls.__key__, ids_objs_map)
+                await session.redis_bind.hmset_dict(
+                    cls.__key__, cls._encode_cache_values(ids_objs_map))
 
                 if cls.__use_elsearch__:
-                    await session.elsearch_bind.bulk_create_dict(cls.__key__, ids_objs_map)
+                    await session.elsearch_bind.bulk_create_dict(
+                        cls.__key__, ids_objs_map, cls._get_storage_codec())
 
                 ids_objs_map = dict()
                 counter = 0
 
         if ids_objs_map:
-            await session.redis_bind.hmset_dict(cls.__key__, ids_objs_map)
+            await session.redis_bind.hmset_dict(
+                cls.__key__, cls._encode_cache_values(ids_objs_map))
 
             if cls.__use_elsearch__:
-                await session.elsearch_bind.bulk_create_dict(cls.__key__, ids_objs_map)
+                await session.elsearch_bind.bulk_create_dict(
+                    cls.__key__, ids_objs_map, cls._get_storage_codec())
 
         return objs
 
@@ -97,23 +100,27 @@ class ModelRedisElSearchMeta(_ModelRedisBaseMeta):
                 elif not cls._validate(obj):
                     continue
 
-                set_map[key] = cls._pack_obj(obj)
+                set_map[key] = cls._pack_cache_obj(obj)
                 counter += 1
 
                 if counter == cls.CHUNKS:
-                    await session.redis_bind.hmset_dict(cls.__key__, set_map)
+                    await session.redis_bind.hmset_dict(
+                        cls.__key__, cls._encode_cache_values(set_map))
 
                     if cls.__use_elsearch__:
-                        await session.elsearch_bind.bulk_update_dict(cls.__key__, set_map)
+                        await session.elsearch_bind.bulk_update_dict(
+                            cls.__key__, set_map, cls._get_storage_codec())
 
                     set_map = OrderedDict()
                     counter = 0
 
             if set_map:
-                await session.redis_bind.hmset_dict(cls.__key__, set_map)
+                await session.redis_bind.hmset_dict(
+                    cls.__key__, cls._encode_cache_values(set_map))
 
                 if cls.__use_elsearch__:
-                    await session.elsearch_bind.bulk_update_dict(cls.__key__, set_map)
+                    await session.elsearch_bind.bulk_update_dict(
+                        cls.__key__, set_map, cls._get_storage_codec())
 
         if keys_objs_to_del:
             await session.redis_bind.hdel(cls.__key__, *keys_objs_to_del.keys())
@@ -156,21 +163,26 @@ class ModelRedisElSearchMeta(_ModelRedisBaseMeta):
             return ret
 
     async def get(cls, session, ids=None, limit=None, offset=None, **kwargs):
+        return cls._unpack_objs(await cls.get_raw(session, ids, limit, offset, **kwargs))
+
+    async def get_raw(cls, session, ids=None, limit=None, offset=None, **kwargs):
         if limit is not None and offset is not None:
             limit += offset
 
-        elif ids is None and limit is None and offset is None:
-            return cls._unpack_objs(await session.redis_bind.hgetall(cls.__key__))
+        if ids is None and limit is None and offset is None:
+            objs = (await session.redis_bind.hgetall(cls.__key__)).values()
 
-        if ids is None:
+        elif ids is None:
             keys = [k for k in await session.redis_bind.hkeys(cls.__key__)][offset:limit]
             if keys:
-                return cls._unpack_objs(await session.redis_bind.hmget(cls.__key__, *keys))
+                objs = await session.redis_bind.hmget(cls.__key__, *keys)
             else:
                 return []
         else:
             ids = cls._to_list(ids)
-            return cls._unpack_objs(await session.redis_bind.hmget(cls.__key__, *ids[offset:limit]))
+            objs = await session.redis_bind.hmget(cls.__key__, *ids[offset:limit])
+
+        return [cls._decode_cache_value(obj) for obj in objs if obj is not None]
 
     async def search(cls, session, pattern, page=0, size=100):
         if cls.__use_elsearch__:
@@ -23,10 +23,10 @@
 
 from sqlalchemy.orm import sessionmaker, Session as SessionSA
 from sqlalchemy.orm.query import Query
-from sqlalchemy import event
+from sqlalchemy import event, inspect
 from collections import defaultdict
-import ujson
 import asyncio
+import time
 
 
 class _SessionBase(SessionSA):
@@ -37,8 +37,12 @@ class _SessionBase(SessionSA):
             autocommit=False, twophase=False, weak_identity_map=True,
             binds=None, extension=None, info=None, query_cls=Query,
             redis_bind=None, elsearch_bind=None, loop=None, redis_bind_sync=None,
-            redis_bind_cy=None):
+            redis_bind_cy=None, sql_executor=None, local_cache=None,
+            cache_write_behind=None):
         self.redis_bind = redis_bind
+        self.sql_executor = sql_executor
+        self.local_cache = local_cache
+        self.cache_write_behind = cache_write_behind
         self.elsearch_bind = elsearch_bind
         self.user = None
         self.loop = loop
@@ -54,80 +58,284 @@ class _SessionBase(SessionSA):
     def _clean_redis_sets(self):
         self._insts_to_hdel = set()
         self._insts_to_hmset = set()
+        self._keys_to_hdel = set()
+        self._models_to_invalidate = set()
+        self._insts_deleted = set()
+
+    async def run_sql(self, func, *args):
+        if self.sql_executor is None:
+            return func(*args)
+
+        return await self.sql_executor.run(func, *args, affinity=self)
 
     async def commit(self):
         try:
-            SessionSA.commit(self)
-            if self.redis_bind is not None:
-                await self._exec_hdel(self._insts_to_hdel)
-                await self._update_objects_on_redis()
+            if self.redis_bind is not None and self.cache_write_behind is None:
+                await self._commit_and_update_objects_on_redis()
+            else:
+                await self.run_sql(SessionSA.commit, self)
+                if self.redis_bind is not None:
+                    await self._enqueue_redis_changes()
         finally:
             self._clean_redis_sets()
 
+    async def aclose(self):
+        await self.run_sql(SessionSA.close, self)
+
     def delete(self, instance):
-        self._insts_to_hmset.update(instance.get_related(self))
+        self._insts_deleted.add(instance)
         return SessionSA.delete(self, instance)
 
-    async def _update_objects_on_redis(self):
-        insts_to_hmset = set.union(self._insts_to_hdel, self._insts_to_hmset)
-        insts_to_hmset_count = 0
-
-        while len(insts_to_hmset) != insts_to_hmset_count:
-            insts_to_hmset_count = len(insts_to_hmset)
-            insts_to_hmset_copy = insts_to_hmset.copy()
-            [insts_to_hmset.update(inst.get_related(self)) for inst in insts_to_hmset_copy]
-
+    def delete_many(self, instances):
+        self._mark_related_for_hmset_dict(instances)
+
+        for inst in instances:
+            SessionSA.delete(self, inst)
+
+    def _mark_related_for_hmset_dict(self, instances):
+        models_ids_map = defaultdict(list)
+        for inst in instances:
+            models_ids_map[type(inst)].append(inst.get_ids_map())
+
+        for model, ids in models_ids_map.items():
+            self._insts_to_hmset.update(model.get_related_by_ids(self, ids))
+
+    def _mark_deleted_related_for_hmset_dict(self):
+        if self._insts_deleted:
+            insts_deleted = self._insts_deleted
+            self._insts_deleted = set()
+            self._mark_related_for_hmset_dict(insts_deleted)
+
+    async def _commit_and_update_objects_on_redis(self):
+        models_to_invalidate, insts_to_hdel, insts_to_hmset = \
+            await self.run_sql(self._flush_and_get_redis_changes)
+        await self.run_sql(SessionSA.commit, self)
+        await self._apply_redis_changes(models_to_invalidate, insts_to_hdel, insts_to_hmset)
+
+    def _flush_and_get_redis_changes(self):
+        self.flush()
+        return self._get_redis_changes()
+
+    async def _apply_redis_changes(self, models_to_invalidate, insts_to_hdel, insts_to_hmset):
+        if not insts_to_hdel and not insts_to_hmset and not models_to_invalidate:
+            return
+
+        models = set(models_to_invalidate)
+        models.update([inst[0] for inst in insts_to_hdel])
+        models.update([inst[0] for inst in insts_to_hmset])
+        models_filters_names = await self._get_models_filters_names(models)
+
+        transaction = self.redis_bind.multi_exec()
+        changed_keys = self._exec_invalidation(
+            transaction, models_to_invalidate, models_filters_names)
+        self._update_changed_keys(
+            changed_keys, self._exec_hdel(transaction, insts_to_hdel, models_filters_names))
+        self._update_changed_keys(
+            changed_keys, self._exec_hmset_dict(transaction, insts_to_hmset, models_filters_names))
+
+        await transaction.execute()
+
+        if self.local_cache is not None:
+            await self.redis_bind.publish(self.local_cache.channel,
+                                          self.local_cache.build_message(changed_keys))
+            self.local_cache.invalidate(changed_keys)
+
+    def _update_changed_keys(self, changed_keys, new_changed_keys):
+        for model_key, insts_keys in new_changed_keys.items():
+            if model_key not in changed_keys:
+                changed_keys[model_key] = insts_keys
+            elif changed_keys[model_key] is not None:
+                changed_keys[model_key].update(insts_keys)
+
+    def _get_redis_changes(self):
+        insts_to_hmset = self._get_related_closure(
+            set.union(self._insts_to_hdel, self._insts_to_hmset))
         insts_to_hmset.difference_update(self._insts_to_hdel)
-        await self._exec_hmset_dict(insts_to_hmset)
 
-    async def _exec_hdel(self, insts):
-        models_keys_insts_keys_map = defaultdict(set)
+        models_to_invalidate = [
+            model for model in self._get_models_to_invalidate() if model.__use_redis__]
+        insts_to_hdel = [(type(inst), type(inst).get_instance_key(inst))
+                         for inst in self._insts_to_hdel
+                         if self._is_cached_individually(type(inst), models_to_invalidate)]
+        insts_to_hdel.extend([(model, inst_key) for model, inst_key in self._keys_to_hdel
+                              if self._is_cached_individually(model, models_to_invalidate)])
+        insts_to_hmset = [(type(inst), type(inst).get_instance_key(inst),
+                           getattr(inst, 'old_redis_key', None),
+                           type(inst)._encode_cache_value(type(inst)._pack_cache_obj(inst.todict())))
+                          for inst in insts_to_hmset
+                          if self._is_cached_individually(type(inst), models_to_invalidate)]
+
+        return models_to_invalidate, insts_to_hdel, insts_to_hmset
+
+    async def _enqueue_redis_changes(self):
+        write_behind = self.cache_write_behind
+        keys_to_hdel = []
+
+        for inst in self._insts_to_hdel:
+            model = type(inst)
+            if model.__use_redis__:
+                inst_key = model.get_instance_key(self._get_identity_ids_map(inst))
+                keys_to_hdel.append((model, inst_key))
+                await write_behind.put(model, inst_key)
 
-        for inst in insts:
+        for inst in self._insts_to_hmset.difference(self._insts_to_hdel):
             model = type(inst)
             if not model.__use_redis__:
                 continue
 
-            filters_names_set = await self._get_filters_names_set(inst)
-            for filters_names in filters_names_set:
-                model_redis_key = model.get_key(filters_names.decode())
-                inst_redis_key = model.get_instance_key(inst)
+            ids_map = self._get_identity_ids_map(inst)
+            inst_key = model.get_instance_key(ids_map)
+            inst_old_key = getattr(inst, 'old_redis_key', None)
+            keys_to_hdel.append((model, inst_key))
+            await write_behind.put(model, inst_key, ids_map)
+
+            if inst_old_key is not None and inst_old_key != inst_key:
+                keys_to_hdel.append((model, inst_old_key))
+                await write_behind.put(model, inst_old_key)
+
+        for model, inst_key in self._keys_to_hdel:
+            if model.__use_redis__:
+                keys_to_hdel.append((model, inst_key))
+                await write_behind.put(model, inst_key)
+
+        for model in self._models_to_invalidate:
+            write_behind.invalidate(model)
+
+        if write_behind.read_your_writes and keys_to_hdel:
+            await self._apply_redis_changes([], keys_to_hdel, [])
+
+    def expunge_by_keys(self, model, insts_keys):
+        for inst in list(self.identity_map.values()):
+            if type(inst) is model and \
+                    model.get_instance_key(self._get_identity_ids_map(inst)) in insts_keys:
+                self.expunge(inst)
+
+    def _get_identity_ids_map(self, inst):
+        state = inspect(inst)
+        mapper = state.mapper
+        return {mapper.get_property_by_column(column).key: value
+                for column, value in zip(mapper.primary_key, state.identity)}
+
+    def _get_related_closure(self, insts):
+        related = set(insts)
+        level = related
+
+        while level:
+            models_ids_map = defaultdict(list)
+            for inst in level:
+                model = type(inst)
+                if model not in self._models_to_invalidate:
+                    models_ids_map[model].append(inst.get_ids_map())
+
+            level = set()
+            for model, ids in models_ids_map.items():
+                level.update(model.get_related_by_ids(self, ids))
+
+            level.difference_update(related)
+            related.update(level)
+
+        return related
+
+    def _get_models_to_invalidate(self):
+        models = set(self._models_to_invalidate)
+        level = models
+
+        while level:
+            next_level = set()
+            for model in level:
+                for relationship in model.get_backrefs():
+                    next_level.add(model.get_model_from_rel(relationship, parent=True))
+
+            level = next_level.difference(models)
+            models.update(level)
+
+        return models
+
+    def _is_cached_individually(self, model, models_to_invalidate):
+        return model.__use_redis__ and model not in models_to_invalidate
+
+    async def _get_models_filters_names(self, models):
+        models = list(models)
+        pipeline = self.redis_bind.pipeline()
+
+        for model in models:
+            pipeline.smembers(model.get_filters_names_key())
+
+        models_filters_names = dict()
+        for model, filters_names in zip(models, await pipeline.execute()):
+            filters_names = set([filters_name.decode() for filters_name in filters_names])
+            filters_names.add(model.__key__)
+            models_filters_names[model] = filters_names
+
+        return models_filters_names
+
+    def _exec_invalidation(self, transaction, models, models_filters_names):
+        models_keys_map = dict()
+
+        for model in models:
+            models_keys = list(models_filters_names[model])
+            transaction.delete(*models_keys)
+            models_keys_map.update([(model_key, None) for model_key in models_keys])
+
+            if model.__cache_policy__ is not None:
+                model.__cache_policy__.clear(transaction, models_keys)
+
+        return models_keys_map
+
+    def _exec_hdel(self, transaction, insts, models_filters_names):
+        models_keys_insts_keys_map = defaultdict(set)
+        models_keys_models_map = dict()
+
+        for model, inst_redis_key in insts:
+            for model_redis_key in models_filters_names[model]:
                 models_keys_insts_keys_map[model_redis_key].add(inst_redis_key)
+                models_keys_models_map[model_redis_key] = model
 
         for model_key, insts_keys in models_keys_insts_keys_map.items():
-            await self.redis_bind.hdel(model_key, *insts_keys)
+            transaction.hdel(model_key, *insts_keys)
+            self._remove_from_cache_policy(
+                transaction, models_keys_models_map[model_key], model_key, insts_keys)
 
-    async def _get_filters_names_set(self, inst):
-        filters_names_key = type(inst).get_filters_names_key()
-        filters_names = set(await self.redis_bind.smembers(filters_names_key))
-        filters_names.add(type(inst).__key__.encode())
-        return filters_names
+        return models_keys_insts_keys_map
 
-    async def _exec_hmset_dict(self, insts):
+    def _exec_hmset_dict(self, transaction, insts, models_filters_names):
         models_keys_insts_keys_insts_map = defaultdict(dict)
         models_keys_insts_keys_map = defaultdict(set)
+        models_keys_models_map = dict()
 
-        for inst in insts:
-            model = type(inst)
-            if not model.__use_redis__:
-                continue
-
-            filters_names_set = await self._get_filters_names_set(inst)
-            for filters_names in filters_names_set:
-                model_redis_key = model.get_key(filters_names.decode())
-                inst_redis_key = model.get_instance_key(inst)
-
-                inst_old_redis_key = getattr(inst, 'old_redis_key', None)
+        for model, inst_redis_key, inst_old_redis_key, inst_dumped in insts:
+            for model_redis_key in models_filters_names[model]:
                 if inst_old_redis_key is not None and inst_old_redis_key != inst_redis_key:
                     models_keys_insts_keys_map[model_redis_key].add(inst_old_redis_key)
 
-                models_keys_insts_keys_insts_map[model_redis_key][inst_redis_key] = ujson.dumps(inst.todict())
+                models_keys_insts_keys_insts_map[model_redis_key][inst_redis_key] = inst_dumped
+                models_keys_models_map[model_redis_key] = model
 
+        now = time.time()
         for model_key, insts_keys_insts_map in models_keys_insts_keys_insts_map.items():
-            await self.redis_bind.hmset_dict(model_key, insts_keys_insts_map)
+            chunk_size = models_keys_models_map[model_key].__bulk_chunk_size__
+            insts_items = list(insts_keys_insts_map.items())
+            for i in range(0, len(insts_items), chunk_size):
+                transaction.hmset_dict(model_key, dict(insts_items[i:i+chunk_size]))
+
+            policy = models_keys_models_map[model_key].__cache_policy__
+            if policy is not None:
+                policy.add(transaction, model_key, list(insts_keys_insts_map), now)
 
         for model_key, insts_keys in models_keys_insts_keys_map.items():
-            await self.redis_bind.hdel(model_key, *insts_keys)
+            transaction.hdel(model_key, *insts_keys)
+            self._remove_from_cache_policy(
+                transaction, models_keys_models_map[model_key], model_key, insts_keys)
+
+        changed_keys = dict(models_keys_insts_keys_map)
+        for model_key, insts_keys_insts_map in models_keys_insts_keys_insts_map.items():
+            changed_keys[model_key] = changed_keys.get(model_key, set()).union(insts_keys_insts_map)
+
+        return changed_keys
+
+    def _remove_from_cache_policy(self, transaction, model, model_key, insts_keys):
+        if model.__cache_policy__ is not None:
+            model.__cache_policy__.remove(transaction, model_key, list(insts_keys))
 
     def mark_for_hdel(self, inst):
         self._insts_to_hdel.add(inst)
@@ -135,10 +343,25 @@ class _SessionBase(SessionSA):
     def mark_for_hmset_dict(self, inst):
         self._insts_to_hmset.add(inst)
 
+    def mark_key_for_hdel(self, model, inst_key):
+        self._keys_to_hdel.add((model, inst_key))
+
+    def mark_related_keys_for_hdel(self, model, ids):
+        for inst in self._get_related_closure(model.get_related_by_ids(self, ids)):
+            self.mark_key_for_hdel(type(inst), type(inst).get_instance_key(inst))
+
+    def mark_for_invalidation(self, model):
+        self._models_to_invalidate.add(model)
+
 
 Session = sessionmaker(class_=_SessionBase)
 
 
+@event.listens_for(Session, 'before_flush')
+def deleting_from_database(session, flush_context, instances):
+    session._mark_deleted_related_for_hmset_dict()
+
+
 @event.listens_for(Session, 'persistent_to_deleted')
 def deleted_from_database(session, instance):
     if session.redis_bind is not None and instance is not None:
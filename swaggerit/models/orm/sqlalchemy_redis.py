@@ -21,17 +21,18 @@
 # SOFTWARE.
 
 
-from swaggerit.models.orm._redis_base import _ModelRedisBaseMeta
+from swaggerit.models.orm._redis_base import _ModelRedisBaseMeta, _TOMBSTONE_MARKER
 from swaggerit.exceptions import SwaggerItModelError
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from sqlalchemy.ext.declarative.clsregistry import _class_resolver
 from sqlalchemy.orm.properties import RelationshipProperty, ColumnProperty
 from sqlalchemy.orm.attributes import InstrumentedAttribute
-from sqlalchemy import or_, and_, inspect
-from collections import OrderedDict
+from sqlalchemy import or_, and_, tuple_, inspect, bindparam, Column, orm
+from collections import OrderedDict, defaultdict
+from itertools import islice
 from copy import deepcopy
-import ujson
 import asyncio
+import time
 
 
 class _ModelSQLAlchemyRedisBaseInitMetaMixin(DeclarativeMeta, _ModelRedisBaseMeta):
@@ -51,14 +52,27 @@ class _ModelSQLAlchemyRedisBaseInitMetaMixin(DeclarativeMeta, _ModelRedisBaseMet
             cls.__relationships__ = dict()
             cls.__columns__ = set(cls.__table__.c)
             cls.__use_redis__ = getattr(cls, '__use_redis__', True)
+            cls.__max_related_fanout__ = getattr(cls, '__max_related_fanout__', 1000)
+            cls.__related_chunk_size__ = getattr(cls, '__related_chunk_size__', 500)
+            cls.__max_in_list__ = getattr(cls, '__max_in_list__', 1000)
+            cls.__bulk_chunk_size__ = getattr(cls, '__bulk_chunk_size__', 1000)
+            cls.__eager_loading__ = getattr(cls, '__eager_loading__', 'selectin')
+            cls.__eager_loading_depth__ = getattr(cls, '__eager_loading_depth__', 3)
+            cls.__cache_policy__ = getattr(cls, '__cache_policy__', None)
+            cls.__negative_cache_ttl__ = getattr(cls, '__negative_cache_ttl__', None)
+            cls.__cache_fill_lease__ = getattr(cls, '__cache_fill_lease__', None)
+            cls.__cache_fill_lease_poll__ = getattr(cls, '__cache_fill_lease_poll__', 0.01)
+            cls.__cache_fills_in_flight__ = dict()
+            cls.__warm_cache_chunk_size__ = getattr(cls, '__warm_cache_chunk_size__', 1000)
+            cls.__warm_cache_pause__ = getattr(cls, '__warm_cache_pause__', 0)
             cls.__todict_schema__ = {}
-            all_models = [m for m in cls.__all_models__.values()
-                          if isinstance(m, type) and issubclass(m, cls.__model_base__)]
-            cls._set_backrefs_for_all_models(all_models)
+            cls._set_relationships()
+            cls.__model_base__.__relationships_graph_built__ = False
 
         else:
             _ModelRedisBaseMeta.__init__(cls, name, bases_classes, attributes)
             cls.__model_base__ = cls
+            cls.__relationships_graph_built__ = False
 
     def _set_primaries_keys(cls):
         primaries_keys = {}
@@ -85,18 +99,38 @@ class _ModelSQLAlchemyRedisBaseInitMetaMixin(DeclarativeMeta, _ModelRedisBaseMet
             raise SwaggerItModelError("'{}' class must inherit from '{}'".format(
                                  name, cls.__model_base__.__name__))
 
-    def _set_backrefs_for_all_models(cls, all_models):
-        all_relationships = set()
+    def build_relationships_graph(cls):
+        model_base = cls.__model_base__
+        if model_base.__relationships_graph_built__:
+            return
+
+        models_index = {m.__name__: m for m in cls.__all_models__.values()
+                        if isinstance(m, type) and issubclass(m, model_base)}
+
+        for model in models_index.values():
+            model.__backrefs__ = set()
+
+        for model in models_index.values():
+            for relationship in model.__relationships__.values():
+                rel_model = cls._get_model_from_rel_index(relationship, models_index)
+                if rel_model is not None \
+                        and rel_model != cls.get_model_from_rel(relationship, parent=True):
+                    rel_model.__backrefs__.add(relationship)
+
+        model_base.__relationships_graph_built__ = True
+
+    def _get_model_from_rel_index(cls, relationship, models_index):
+        argument = relationship.prop.argument
+        resolver = getattr(argument, '__self__', argument)
+        if isinstance(resolver, _class_resolver):
+            return models_index.get(resolver.arg)
 
-        for model in all_models:
-            model._set_relationships()
-            all_relationships.update(model.__relationships__.values())
+        if isinstance(argument, type) and models_index.get(argument.__name__) is argument:
+            return argument
 
-        for model in all_models:
-            for relationship in all_relationships:
-                if model != cls.get_model_from_rel(relationship, all_models, parent=True) and \
-                        model == cls.get_model_from_rel(relationship, all_models):
-                    model.__backrefs__.add(relationship)
+    def get_backrefs(cls):
+        cls.build_relationships_graph()
+        return cls.__backrefs__
 
     def _set_relationships(cls):
         if cls.__relationships__:
@@ -119,6 +153,10 @@ class _ModelSQLAlchemyRedisBaseInsertMetaMixin(type):
     async def insert(cls, session, objs, commit=True, todict=True, **kwargs):
         input_ = deepcopy(objs)
         objs = cls._to_list(objs)
+
+        if cls._is_bulk_insertable(objs):
+            return await cls._bulk_insert(session, objs, commit, todict)
+
         new_insts = set()
 
         for obj in objs:
@@ -130,7 +168,55 @@ class _ModelSQLAlchemyRedisBaseInsertMetaMixin(type):
         if commit:
             await session.commit()
 
-        return cls._build_todict_list(new_insts) if todict else list(new_insts)
+        return await session.run_sql(cls._build_todict_list, new_insts) \
+            if todict else list(new_insts)
+
+    def _is_bulk_insertable(cls, objs):
+        if not objs or not cls._is_columns_only(objs):
+            return False
+
+        primaries_keys = cls.__primaries_keys__.keys()
+        return all([id_name in obj or id_name in primaries_keys
+                    for obj in objs for id_name in cls.__id_names__])
+
+    async def _bulk_insert(cls, session, objs, commit, todict):
+        chunk_size = cls.__bulk_chunk_size__
+        insts = []
+
+        for i in range(0, len(objs), chunk_size):
+            insts.extend(await session.run_sql(
+                cls._bulk_insert_rows, session, objs[i:i+chunk_size]))
+
+        if session.redis_bind is not None:
+            for inst in insts:
+                session.mark_for_hmset_dict(inst)
+
+        if todict:
+            insts = await session.run_sql(cls._build_todict_list, insts)
+
+        if commit:
+            await session.commit()
+
+        return insts
+
+    def _bulk_insert_rows(cls, session, objs):
+        primaries_keys = cls.__primaries_keys__.keys()
+        mappings_groups = defaultdict(list)
+
+        for obj in objs:
+            mappings_groups[tuple(sorted(obj))].append(dict(obj))
+
+        mappings = []
+        for keys, mappings_group in mappings_groups.items():
+            return_defaults = not primaries_keys <= set(keys) or \
+                any([None in [mapping[key] for key in primaries_keys]
+                     for mapping in mappings_group])
+            session.bulk_insert_mappings(cls, mappings_group, return_defaults=return_defaults)
+            mappings.extend(mappings_group)
+
+        ids = [cls.get_ids_from_values(mapping) for mapping in mappings]
+        query = cls._build_query(session)
+        return cls._order_by_ids(cls._get_all_by_ids(query, ids), ids)
 
 
 class _ModelSQLAlchemyRedisBaseUpdateMetaMixin(type):
@@ -141,39 +227,133 @@ class _ModelSQLAlchemyRedisBaseUpdateMetaMixin(type):
         ids = [cls.get_ids_from_values(
             obj) for obj in objs] if not ids else cls._to_list(ids)
 
+        if cls._is_bulk_updatable(objs, ids):
+            return await cls._bulk_update(session, objs, ids, commit, todict)
+
         insts = await cls.get(session, ids, todict=False)
 
+        id_names = ids[0].keys()
+        keys_objs_map = dict()
+        for id_, obj in zip(ids, objs):
+            keys_objs_map.setdefault(cls.get_instance_key(id_, id_names), obj)
+
+        insts_objs = await session.run_sql(
+            cls._build_update_insts_objs, insts, keys_objs_map, id_names)
+
+        for inst, obj in insts_objs:
+            await inst.init(session, input_, **obj)
+
+        if commit:
+            await session.commit()
+
+        return await session.run_sql(cls._build_todict_list, insts) if todict else insts
+
+    def _build_update_insts_objs(cls, insts, keys_objs_map, id_names):
+        insts_objs = []
         for inst in insts:
             inst.old_redis_key = cls.get_instance_key(inst)
+            insts_objs.append((inst, keys_objs_map[cls.get_instance_key(inst, id_names)]))
+
+        return insts_objs
+
+    def _is_bulk_updatable(cls, objs, ids):
+        if not objs or len(objs) != len(ids) or not cls._is_columns_only(objs):
+            return False
 
-        id_insts_zip = [(cls.get_instance_ids_map(inst, ids[0].keys()), inst) for inst in insts]
+        id_names = ids[0].keys()
 
-        for id_, inst in id_insts_zip:
-            await inst.init(session, input_, **objs[ids.index(id_)])
+        for id_, obj in zip(ids, objs):
+            if id_.keys() != id_names or None in id_.values():
+                return False
+
+            for attr_name, value in obj.items():
+                if attr_name in id_ and value != id_[attr_name]:
+                    return False
+
+        return True
+
+    async def _bulk_update(cls, session, objs, ids, commit, todict):
+        insts = await session.run_sql(cls._bulk_update_rows, session, objs, ids)
+
+        if session.redis_bind is not None:
+            for inst in insts:
+                session.mark_for_hmset_dict(inst)
+
+        if todict:
+            insts = await session.run_sql(cls._build_todict_list, insts)
 
         if commit:
             await session.commit()
 
-        return cls._build_todict_list(insts) if todict else insts
+        return insts
+
+    def _bulk_update_rows(cls, session, objs, ids):
+        columns = cls._get_columns_by_attr_name()
+        id_names = list(ids[0].keys())
+        filters = and_(*[columns[id_name] == bindparam('_id_' + id_name) for id_name in id_names])
+        params_groups = defaultdict(list)
+
+        for id_, obj in zip(ids, objs):
+            params = {columns[attr_name].key: value for attr_name, value in obj.items()
+                      if attr_name not in id_}
+            if params:
+                params.update([('_id_' + id_name, id_[id_name]) for id_name in id_names])
+                params_groups[tuple(sorted(params))].append(params)
+
+        for params in params_groups.values():
+            session.execute(cls.__table__.update().where(filters), params)
+
+        query = cls._build_query(session).populate_existing()
+        return cls._order_by_ids(cls._get_all_by_ids(query, ids), ids)
 
 
 class _ModelSQLAlchemyRedisBaseDeleteMetaMixin(type):
 
     async def delete(cls, session, ids, commit=True, **kwargs):
         ids = cls._to_list(ids)
-        filters = cls.build_filters_by_ids(ids)
-        instances = cls._build_query(session).filter(filters).all()
-        [session.delete(inst) for inst in instances]
+
+        if cls._is_bulk_deletable(ids):
+            await session.run_sql(cls._bulk_delete_rows, session, ids)
+        else:
+            instances = await session.run_sql(
+                cls._get_all_by_ids, cls._build_query(session), ids)
+            await session.run_sql(cls._delete_instances, session, instances)
 
         if commit:
             await session.commit()
 
+    def _delete_instances(cls, session, instances):
+        session.delete_many(instances)
+
+    def _is_bulk_deletable(cls, ids):
+        id_names = set(cls.__id_names__)
+        return bool(ids) and not cls.__mapper__.relationships \
+            and id_names == set(cls.__primaries_keys__) \
+            and all([id_.keys() == id_names and None not in id_.values() for id_ in ids])
+
+    def _bulk_delete_rows(cls, session, ids):
+        insts_keys = set([cls.get_instance_key(id_) for id_ in ids])
+
+        if session.redis_bind is not None:
+            session.mark_related_keys_for_hdel(cls, ids)
+
+            for inst_key in insts_keys:
+                session.mark_key_for_hdel(cls, inst_key)
+
+        chunk_size = cls.__max_in_list__
+        for i in range(0, len(ids), chunk_size):
+            cls._build_query(session) \
+                .filter(cls.build_filters_by_ids(ids[i:i+chunk_size])) \
+                .delete(synchronize_session=False)
+
+        session.expunge_by_keys(cls, insts_keys)
+
 
 class _ModelSQLAlchemyRedisBaseGetMetaMixin(type):
 
     async def get(cls, session, ids=None, limit=None, offset=None, todict=True, **kwargs):
         if ids is None:
-            query = cls._build_query(session, kwargs)
+            query = cls._build_query(session, kwargs, eager_loading=todict)
 
             if limit is not None:
                 query = query.limit(limit)
@@ -181,7 +361,7 @@ class _ModelSQLAlchemyRedisBaseGetMetaMixin(type):
             if offset is not None:
                 query = query.offset(offset)
 
-            return cls._build_todict_list(query.all()) if todict else query.all()
+            return await session.run_sql(cls._get_all, query, todict)
 
         if limit is not None and offset is not None:
             limit += offset
@@ -189,9 +369,48 @@ class _ModelSQLAlchemyRedisBaseGetMetaMixin(type):
         ids = cls._to_list(ids)
         return await cls._get_many(session, ids[offset:limit], todict, kwargs)
 
-    def _build_query(cls, session, kwargs=None):
+    def _get_all(cls, query, todict):
+        insts = query.all()
+        return cls._build_todict_list(insts) if todict else insts
+
+    def _get_all_by_ids(cls, query, ids):
+        chunk_size = cls.__max_in_list__
+        insts = []
+
+        for i in range(0, len(ids), chunk_size):
+            insts.extend(query.filter(cls.build_filters_by_ids(ids[i:i+chunk_size])).all())
+
+        return insts
+
+    def _get_many_from_db(cls, query, ids, todict):
+        insts = cls._order_by_ids(cls._get_all_by_ids(query, ids), ids)
+        return cls._build_todict_list(insts) if todict else insts
+
+    def _order_by_ids(cls, insts, ids):
+        if not ids or any([id_.keys() != ids[0].keys() for id_ in ids]):
+            return insts
+
+        id_names = ids[0].keys()
+
+        keys_insts_map = defaultdict(list)
+        for inst in insts:
+            keys_insts_map[cls.get_instance_key(inst, id_names)].append(inst)
+
+        ordered_insts = []
+        for key in OrderedDict.fromkeys([cls.get_instance_key(id_, id_names) for id_ in ids]):
+            ordered_insts.extend(keys_insts_map.pop(key, []))
+
+        for key_insts in keys_insts_map.values():
+            ordered_insts.extend(key_insts)
+
+        return ordered_insts
+
+    def _build_query(cls, session, kwargs=None, eager_loading=False):
         query = session.query(cls)
 
+        if eager_loading:
+            query = query.options(*cls.get_eager_loading_options())
+
         if kwargs:
             for prop_name, value in kwargs.items():
                 if isinstance(value, dict):
@@ -234,66 +453,400 @@ class _ModelSQLAlchemyRedisBaseGetMetaMixin(type):
 
     async def _get_many(cls, session, ids, todict, kwargs):
         if not todict or session.redis_bind is None:
-            filters = cls.build_filters_by_ids(ids)
-            insts = cls._build_query(session, kwargs).filter(filters).all()
+            query = cls._build_query(session, kwargs, eager_loading=todict)
+            return await session.run_sql(cls._get_many_from_db, query, ids, todict)
 
-            if todict:
-                return [inst.todict() for inst in insts]
-            else:
-                return insts
+        return [cls._unpack_cache_obj(obj)
+                for obj in await cls._get_many_raw(session, ids, kwargs)]
 
+    async def get_raw(cls, session, ids, limit=None, offset=None, **kwargs):
+        if limit is not None and offset is not None:
+            limit += offset
+
+        ids = cls._to_list(ids)
+        return await cls._get_many_raw(session, ids[offset:limit], kwargs)
+
+    async def _get_many_raw(cls, session, ids, kwargs):
         model_redis_key = type(cls).get_key(cls, '_'.join(kwargs.keys()))
         ids_redis_keys = [cls.get_instance_key(id_, id_.keys()) for id_ in ids]
-        objs = await session.redis_bind.hmget(model_redis_key, *ids_redis_keys)
-        ids_not_cached = [id_ for i, (id_, obj) in enumerate(zip(ids, objs)) if obj is None]
-        objs = [ujson.loads(obj) for obj in objs if obj is not None]
+        objs = await cls._get_cached_objs(session, model_redis_key, ids_redis_keys)
+        objs = cls._drop_expired_tombstones(objs, time.time())
+        ids_not_cached = OrderedDict([(key, id_) for key, id_, obj
+                                      in zip(ids_redis_keys, ids, objs) if obj is None])
 
         if ids_not_cached:
-            await session.redis_bind.sadd(cls.get_filters_names_key(), model_redis_key)
-            filters = cls.build_filters_by_ids(ids_not_cached)
-            instances = cls._build_query(session).filter(filters).all()
-            if instances:
-                items_to_set = {
-                    cls.get_instance_key(inst): ujson.dumps(inst.todict()) for inst in instances}
-                await session.redis_bind.hmset_dict(model_redis_key, items_to_set)
-
-                for inst in instances:
-                    inst_ids = cls.get_instance_ids_map(inst, ids[0].keys())
-                    index = ids_not_cached.index(inst_ids)
-                    objs.insert(index, inst.todict())
+            objs_not_cached = await cls._fill_cache(session, model_redis_key, ids_not_cached)
+            objs = [objs_not_cached.get(key) if obj is None else obj
+                    for key, obj in zip(ids_redis_keys, objs)]
+
+        return [cls._decode_cache_value(obj) for obj in objs
+                if obj is not None and not cls._is_tombstone(obj)]
+
+    async def _fill_cache(cls, session, model_redis_key, ids_not_cached):
+        fills_in_flight = cls.__cache_fills_in_flight__
+        ids_to_fill = OrderedDict()
+        waiting = dict()
+
+        for key, id_ in ids_not_cached.items():
+            fill = fills_in_flight.get((model_redis_key, key))
+            if fill is None:
+                ids_to_fill[key] = id_
+            else:
+                waiting[key] = fill
+
+        objs = dict()
+        if ids_to_fill:
+            fills = [(key, asyncio.Future()) for key in ids_to_fill]
+            fills_in_flight.update([((model_redis_key, key), fill) for key, fill in fills])
+
+            try:
+                objs.update(await cls._fill_cache_with_lease(
+                    session, model_redis_key, ids_to_fill))
+
+                for key, fill in fills:
+                    fill.set_result(objs.get(key))
+
+            finally:
+                for key, fill in fills:
+                    fills_in_flight.pop((model_redis_key, key), None)
+                    if not fill.done():
+                        fill.cancel()
+
+        if waiting:
+            await asyncio.wait(list(waiting.values()))
+            ids_to_refill = OrderedDict()
+
+            for key, fill in waiting.items():
+                if fill.cancelled():
+                    ids_to_refill[key] = ids_not_cached[key]
+                else:
+                    objs[key] = fill.result()
+
+            if ids_to_refill:
+                objs.update(await cls._fill_cache_with_lease(
+                    session, model_redis_key, ids_to_refill))
+
+        return objs
+
+    async def _fill_cache_with_lease(cls, session, model_redis_key, ids_not_cached):
+        if cls.__cache_fill_lease__ is None:
+            return await cls._fill_cache_from_db(
+                session, model_redis_key, list(ids_not_cached.values()))
+
+        keys = list(ids_not_cached)
+        leases_keys = [cls._get_fill_lease_key(model_redis_key, key) for key in keys]
+        pipeline = session.redis_bind.pipeline()
+
+        for lease_key in leases_keys:
+            pipeline.set(lease_key, b'1', pexpire=int(cls.__cache_fill_lease__ * 1000),
+                         exist=pipeline.SET_IF_NOT_EXIST)
+
+        leases = await pipeline.execute()
+        leased_keys = [key for key, lease in zip(keys, leases) if lease]
+        objs = dict()
+
+        if leased_keys:
+            try:
+                objs.update(await cls._fill_cache_from_db(
+                    session, model_redis_key, [ids_not_cached[key] for key in leased_keys]))
+            finally:
+                await session.redis_bind.delete(*[
+                    lease_key for lease_key, lease in zip(leases_keys, leases) if lease])
+
+        ids_to_wait = OrderedDict([(key, ids_not_cached[key])
+                                   for key, lease in zip(keys, leases) if not lease])
+        if ids_to_wait:
+            objs.update(await cls._wait_cache_fill(session, model_redis_key, ids_to_wait))
+
+        return objs
+
+    def _get_fill_lease_key(cls, model_redis_key, inst_key):
+        return '{}__lease:{}'.format(model_redis_key, inst_key.decode())
+
+    async def _wait_cache_fill(cls, session, model_redis_key, ids_not_cached):
+        keys = list(ids_not_cached)
+        objs = dict()
+        waited = 0
+
+        while keys and waited < cls.__cache_fill_lease__:
+            await asyncio.sleep(cls.__cache_fill_lease_poll__)
+            waited += cls.__cache_fill_lease_poll__
+            redis_objs = await session.redis_bind.hmget(model_redis_key, *keys)
+            redis_objs = cls._drop_expired_tombstones(redis_objs, time.time())
+            objs.update([(key, obj) for key, obj in zip(keys, redis_objs) if obj is not None])
+            keys = [key for key in keys if key not in objs]
+
+        if keys:
+            objs.update(await cls._fill_cache_from_db(
+                session, model_redis_key, [ids_not_cached[key] for key in keys]))
 
         return objs
 
+    async def _fill_cache_from_db(cls, session, model_redis_key, ids):
+        local_cache = session.local_cache
+        if local_cache is not None:
+            generation = local_cache.get_generation(model_redis_key)
+
+        await session.redis_bind.sadd(cls.get_filters_names_key(), model_redis_key)
+        instances = await session.run_sql(
+            cls._get_all_by_ids, cls._build_query(session, eager_loading=True), ids)
+        items_to_set = dict()
+
+        if instances:
+            insts_dicts = await session.run_sql(cls._build_todict_list, instances)
+            items_to_set.update([
+                (cls.get_instance_key(inst),
+                 cls._encode_cache_value(cls._pack_cache_obj(inst_dict)))
+                for inst, inst_dict in zip(instances, insts_dicts)])
+
+        items_to_set.update(cls._build_tombstones(ids, items_to_set))
+
+        if items_to_set:
+            await cls._set_cached_objs(session, model_redis_key, items_to_set)
+
+            if local_cache is not None:
+                local_cache.set_many(model_redis_key, items_to_set, generation)
+
+        id_names = ids[0].keys()
+        return {cls.get_instance_key(inst, id_names): items_to_set[cls.get_instance_key(inst)]
+                for inst in instances}
+
+    def _drop_expired_tombstones(cls, objs, now):
+        return [None if cls._is_tombstone(obj) and float(obj[1:]) <= now else obj
+                for obj in objs]
+
+    def _build_tombstones(cls, ids, insts_keys_objs_map):
+        if cls.__negative_cache_ttl__ is None:
+            return {}
+
+        tombstone = _TOMBSTONE_MARKER + repr(time.time() + cls.__negative_cache_ttl__).encode()
+        id_names = set(cls.__id_names__)
+        tombstones = dict()
+
+        for id_ in ids:
+            if set(id_.keys()) == id_names:
+                inst_key = cls.get_instance_key(id_)
+                if inst_key not in insts_keys_objs_map:
+                    tombstones[inst_key] = tombstone
+
+        return tombstones
+
+    async def _get_cached_objs(cls, session, model_redis_key, ids_redis_keys):
+        local_cache = session.local_cache
+        if local_cache is None:
+            return await cls._hmget(session, model_redis_key, ids_redis_keys)
+
+        objs = local_cache.get_many(model_redis_key, ids_redis_keys)
+        keys_not_cached = [key for key, obj in zip(ids_redis_keys, objs) if obj is None]
+        if not keys_not_cached:
+            return objs
+
+        generation = local_cache.get_generation(model_redis_key)
+        redis_objs = await cls._hmget(session, model_redis_key, keys_not_cached)
+        redis_objs = dict(zip(keys_not_cached, redis_objs))
+        local_cache.set_many(model_redis_key, redis_objs, generation)
+
+        return [redis_objs[key] if obj is None else obj for key, obj in zip(ids_redis_keys, objs)]
+
+    async def _hmget(cls, session, model_redis_key, insts_keys):
+        policy = cls.__cache_policy__
+        if policy is None:
+            return await session.redis_bind.hmget(model_redis_key, *insts_keys)
+
+        now = time.time()
+        pipeline = session.redis_bind.pipeline()
+        pipeline.hmget(model_redis_key, *insts_keys)
+        policy.touch(pipeline, model_redis_key, insts_keys, now)
+        policy.get_expirations(pipeline, model_redis_key, insts_keys)
+        results = await pipeline.execute()
+
+        if policy.ttl is None:
+            return results[0]
+
+        return policy.drop_expired(results[0], results[-len(insts_keys):], now)
+
+    async def _set_cached_objs(cls, session, model_redis_key, insts_keys_objs_map):
+        policy = cls.__cache_policy__
+        if policy is None:
+            await session.redis_bind.hmset_dict(model_redis_key, insts_keys_objs_map)
+            return
+
+        pipeline = session.redis_bind.pipeline()
+        pipeline.hmset_dict(model_redis_key, insts_keys_objs_map)
+        policy.add(pipeline, model_redis_key, list(insts_keys_objs_map), time.time())
+
+        if policy.max_entries is not None:
+            pipeline.zcard(policy.get_lru_key(model_redis_key))
+            size = (await pipeline.execute())[-1]
+            await policy.evict(session.redis_bind, model_redis_key, size)
+        else:
+            await pipeline.execute()
+
     def get_filters_names_key(cls):
         return cls.get_key('_filters_names')
 
 
+class _ModelSQLAlchemyRedisBaseWarmCacheMetaMixin(type):
+
+    async def warm_cache(cls, session, chunk_size=None, pause=None, **kwargs):
+        # Only the model hash is warmed, the kwargs just select the rows to
+        # load. The '<key>_<filters>' hashes of get with filters keep being
+        # filled on demand.
+        if session.redis_bind is None or not cls.__use_redis__:
+            return 0
+
+        chunk_size = cls.__warm_cache_chunk_size__ if chunk_size is None else chunk_size
+        pause = cls.__warm_cache_pause__ if pause is None else pause
+        query = cls._build_query(session, kwargs) \
+            .options(*cls.get_eager_loading_options(strategy='selectin')) \
+            .execution_options(stream_results=True).yield_per(chunk_size)
+        instances = await session.run_sql(iter, query)
+        warmed = 0
+        writing = None
+
+        try:
+            while True:
+                insts_keys_objs_map = await session.run_sql(
+                    cls._build_warm_cache_chunk, instances, chunk_size)
+
+                if writing is not None:
+                    await writing
+                    writing = None
+                    await asyncio.sleep(pause)
+
+                if not insts_keys_objs_map:
+                    break
+
+                writing = asyncio.ensure_future(
+                    cls._set_cached_objs(session, cls.__key__, insts_keys_objs_map))
+                warmed += len(insts_keys_objs_map)
+
+        except BaseException:
+            if writing is not None:
+                await asyncio.gather(writing, return_exceptions=True)
+            raise
+
+        return warmed
+
+    def _build_warm_cache_chunk(cls, instances, chunk_size):
+        instances = list(islice(instances, chunk_size))
+        return {
+            cls.get_instance_key(inst): cls._encode_cache_value(cls._pack_cache_obj(inst_dict))
+            for inst, inst_dict in zip(instances, cls._build_todict_list(instances))}
+
+    async def swagger_warm_cache(cls, req, session):
+        try:
+            kwargs = cls._build_warm_cache_kwargs(req.query)
+        except SwaggerItModelError as error:
+            error_obj = {'message': error.args[0], 'instance': error.args[1]}
+            return cls._build_response(400, body=cls._encode_obj(error_obj))
+
+        session = cls._copy_session(session)
+        return cls._create_job(cls._warm_cache_job, cls.get_key('warm_cache'),
+                               req, session, **kwargs)
+
+    def _build_warm_cache_kwargs(cls, query):
+        kwargs = dict(query)
+
+        for name, type_, minimum in (('chunk_size', int, 1), ('pause', float, 0)):
+            if kwargs.get(name) is None:
+                continue
+
+            try:
+                kwargs[name] = type_(kwargs[name])
+            except (TypeError, ValueError):
+                kwargs[name] = None
+
+            if kwargs[name] is None or kwargs[name] < minimum:
+                raise SwaggerItModelError(
+                    "'{}' must be a number greater than or equal to {}".format(name, minimum),
+                    query)
+
+        return kwargs
+
+    async def _warm_cache_job(cls, req, session, **kwargs):
+        return {'warmed': await cls.warm_cache(session, **kwargs)}
+
+    async def swagger_get_warm_cache_job(cls, req, session):
+        return await cls._get_job(cls.get_key('warm_cache'), req, session)
+
+
 class ModelSQLAlchemyRedisBaseMeta(
         _ModelSQLAlchemyRedisBaseInitMetaMixin,
         _ModelSQLAlchemyRedisBaseInsertMetaMixin,
         _ModelSQLAlchemyRedisBaseUpdateMetaMixin,
         _ModelSQLAlchemyRedisBaseDeleteMetaMixin,
-        _ModelSQLAlchemyRedisBaseGetMetaMixin):
+        _ModelSQLAlchemyRedisBaseGetMetaMixin,
+        _ModelSQLAlchemyRedisBaseWarmCacheMetaMixin):
 
     def get_model_from_rel(cls, relationship, all_models=None, parent=False):
         if parent:
             return relationship.prop.parent.class_
 
-        if isinstance(relationship.prop.argument, _class_resolver):
+        argument = relationship.prop.argument
+        resolver = getattr(argument, '__self__', argument)
+
+        if isinstance(resolver, _class_resolver):
             if all_models is None:
-                return relationship.prop.argument()
+                return argument()
 
             for model in all_models:
-                if model.__name__ == relationship.prop.argument.arg:
+                if model.__name__ == resolver.arg:
                     return model
 
             return
 
-        return relationship.prop.argument
+        return argument
 
     def _build_todict_list(cls, insts):
         return [inst.todict() for inst in insts]
 
+    def get_eager_loading_options(cls, schema=None, strategy=None):
+        if schema is None:
+            schema = cls.__todict_schema__
+
+        return cls._build_eager_loading_options(
+            schema, None, (cls,), cls.__eager_loading_depth__, strategy)
+
+    def _build_eager_loading_options(cls, schema, parent_option, path, depth, strategy=None):
+        options = []
+        if cls.__eager_loading__ is None or depth <= 0:
+            return options
+
+        for rel_name, relationship in cls.__relationships__.items():
+            rel_model = cls.get_model_from_rel(relationship)
+            if (rel_name in schema and not schema[rel_name]) or rel_model in path \
+                    or relationship.prop.lazy == 'dynamic':
+                continue
+
+            loader_name = (cls.__eager_loading__ if strategy is None else strategy) + 'load'
+            if parent_option is None:
+                option = getattr(orm, loader_name)(relationship)
+            else:
+                option = getattr(parent_option, loader_name)(relationship)
+
+            rel_schema = schema.get(rel_name)
+            rel_schema = rel_schema if isinstance(rel_schema, dict) else rel_model.__todict_schema__
+
+            options.append(option)
+            options.extend(rel_model._build_eager_loading_options(
+                rel_schema, option, path + (rel_model,), depth - 1, strategy))
+
+        return options
+
+    def _is_columns_only(cls, objs):
+        if cls.init is not ModelSQLAlchemyRedisBaseSuper.init \
+                or cls._setattr is not ModelSQLAlchemyRedisBaseSuper._setattr \
+                or cls._validate is not ModelSQLAlchemyRedisBaseSuper._validate:
+            return False
+
+        columns = cls._get_columns_by_attr_name()
+        return all([columns.keys() >= obj.keys() for obj in objs])
+
+    def _get_columns_by_attr_name(cls):
+        return {prop.key: prop.columns[0] for prop in cls.__mapper__.column_attrs
+                if isinstance(prop.columns[0], Column) and prop.columns[0].table is cls.__table__}
+
     def get_ids_from_values(cls, values):
         cast = lambda id_name, value: getattr(cls, id_name).type.python_type(value) \
             if value is not None else None
@@ -303,6 +856,14 @@ class ModelSQLAlchemyRedisBaseMeta(
         if len(ids) == 1:
             return cls._get_obj_i_comparison(ids[0])
 
+        id_names = list(ids[0].keys())
+        if all([id_.keys() == ids[0].keys() and None not in id_.values() for id_ in ids]):
+            if len(id_names) == 1:
+                return getattr(cls, id_names[0]).in_([id_[id_names[0]] for id_ in ids])
+
+            return tuple_(*[getattr(cls, name) for name in id_names]).in_(
+                [tuple([id_[name] for name in id_names]) for id_ in ids])
+
         or_clause_args = []
         for i in range(0, len(ids)):
             comparison = cls._get_obj_i_comparison(ids[i])
@@ -310,6 +871,42 @@ class ModelSQLAlchemyRedisBaseMeta(
 
         return or_(*or_clause_args)
 
+    def get_related_by_ids(cls, session, ids):
+        related = set()
+        if not ids:
+            return related
+
+        for relationship in cls.get_backrefs():
+            rel_model = cls.get_model_from_rel(relationship, parent=True)
+            rel_insts = cls._get_related_model_insts(session, relationship, rel_model, ids)
+
+            if rel_insts is None:
+                session.mark_for_invalidation(rel_model)
+            else:
+                related.update(rel_insts)
+
+        return related
+
+    def _get_related_model_insts(cls, session, relationship, rel_model, ids):
+        max_fanout = rel_model.__max_related_fanout__
+        chunk_size = cls.__related_chunk_size__
+        rel_insts = set()
+
+        for i in range(0, len(ids), chunk_size):
+            filters = cls.build_filters_by_ids(ids[i:i+chunk_size])
+            query = rel_model._build_query(session).join(relationship).filter(filters)
+            query = query.distinct()
+
+            if max_fanout is None:
+                rel_insts.update(query.all())
+                continue
+
+            rel_insts.update(query.limit(max_fanout + 1).all())
+            if len(rel_insts) > max_fanout:
+                return None
+
+        return rel_insts
+
     def _get_obj_i_comparison(cls, attributes):
         if len(attributes) == 1:
             attr_name = [i for i in attributes.keys()][0]
@@ -339,12 +936,48 @@ class ModelSQLAlchemyRedisBaseSuper(object):
         if input_ is None:
             input_ = deepcopy(kwargs)
 
+        rels_insts_map = await self._get_relationships_instances(session, kwargs)
+
         for key, value in kwargs.items():
-            await self._setattr(key, value, session, input_)
+            await self._setattr(key, value, session, input_, rels_insts_map)
 
         await self._validate(session, input_)
 
-    async def _setattr(self, attr_name, value, session, input_):
+    async def _get_relationships_instances(self, session, values):
+        cls = type(self)
+        rels_ids_map = defaultdict(list)
+
+        for attr_name, value in values.items():
+            relationship = cls._get_relationship(attr_name) if hasattr(cls, attr_name) else None
+            if relationship is None:
+                continue
+
+            if relationship.prop.uselist is not True:
+                value = [value]
+
+            if isinstance(value, list) and all([isinstance(v, dict) for v in value]):
+                rel_model = cls.get_model_from_rel(relationship)
+                rels_ids_map[rel_model].extend(self._get_ids_from_rels_values(rel_model, value))
+
+        rels_insts_map = dict()
+        for rel_model, ids in rels_ids_map.items():
+            rels_insts_map[rel_model] = await self._get_insts_keys_map(session, rel_model, ids)
+
+        return rels_insts_map
+
+    async def _get_insts_keys_map(self, session, rel_model, ids):
+        ids_to_get = OrderedDict()
+        for rel_ids in ids:
+            if None not in rel_ids.values():
+                ids_to_get.setdefault(rel_model.get_instance_key(rel_ids), rel_ids)
+
+        if not ids_to_get:
+            return dict()
+
+        insts = await rel_model.get(session, list(ids_to_get.values()), todict=False)
+        return {rel_model.get_instance_key(inst): inst for inst in insts}
+
+    async def _setattr(self, attr_name, value, session, input_, rels_insts_map=None):
         cls = type(self)
         if not hasattr(cls, attr_name):
             raise TypeError("{} is an invalid keyword argument for {}".format(attr_name, cls.__name__))
@@ -352,12 +985,14 @@ class ModelSQLAlchemyRedisBaseSuper(object):
         relationship = cls._get_relationship(attr_name)
 
         if relationship is not None:
-            await self._set_relationship(relationship, attr_name, value, session, input_)
+            await self._set_relationship(relationship, attr_name, value,
+                                         session, input_, rels_insts_map)
 
         else:
             setattr(self, attr_name, value)
 
-    async def _set_relationship(self, relationship, attr_name, values_list, session, input_):
+    async def _set_relationship(self, relationship, attr_name, values_list,
+                                session, input_, rels_insts_map=None):
         cls = type(self)        
         rel_model = cls.get_model_from_rel(relationship)
 
@@ -366,33 +1001,32 @@ class ModelSQLAlchemyRedisBaseSuper(object):
                 raise SwaggerItModelError("Relationship '{}' don't use lists.".format(attr_name), input_)
             values_list = [values_list]
 
-        rel_insts = await self._get_instances_from_values(session, rel_model, values_list)
+        rel_insts = await self._get_instances_from_values(
+            session, rel_model, values_list, rels_insts_map)
 
         for rel_values, rel_inst in zip(list(values_list), list(rel_insts)):
             if rel_inst is not None and rel_values.get('_operation') == 'delete':
                 values_list.remove(rel_values)
                 rel_insts.remove(rel_inst)
-                await type(rel_inst).delete(session, rel_inst.get_ids_map(), commit=True)
+                rel_ids = await session.run_sql(rel_inst.get_ids_map)
+                await type(rel_inst).delete(session, rel_ids, commit=True)
 
         for rel_values, rel_inst in zip(values_list, rel_insts):
                 await self._do_nested_operation(rel_values, rel_inst,
                                                 attr_name, relationship, session, input_)
 
-    async def _get_instances_from_values(self, session, rel_model, rels_values):
+    async def _get_instances_from_values(self, session, rel_model, rels_values,
+                                         rels_insts_map=None):
         ids_to_get = self._get_ids_from_rels_values(rel_model, rels_values)
         if not ids_to_get:
             return []
 
-        # attribution made just to keep the reference on session identity_map
-        instances = await rel_model.get(session, ids_to_get, todict=False)
-
-        rels_ints = []
-        for rel_ids in ids_to_get:
-            rel_inst = await rel_model.get(session, rel_ids, todict=False)
-            rel_inst = rel_inst[0] if rel_inst else None
-            rels_ints.append(rel_inst)
+        if rels_insts_map is not None and rel_model in rels_insts_map:
+            insts_keys_map = rels_insts_map[rel_model]
+        else:
+            insts_keys_map = await self._get_insts_keys_map(session, rel_model, ids_to_get)
 
-        return rels_ints
+        return [insts_keys_map.get(rel_model.get_instance_key(rel_ids)) for rel_ids in ids_to_get]
 
     def _get_ids_from_rels_values(self, rel_model, rels_values):
         ids = []
@@ -411,14 +1045,14 @@ class ModelSQLAlchemyRedisBaseSuper(object):
                 "Can't execute nested '{}' operation".format(operation), input_)
 
         if operation == 'get':
-            self._do_get(attr_name, relationship, rel_inst)
+            await session.run_sql(self._do_get, attr_name, relationship, rel_inst)
 
         elif operation == 'update':
-            self._do_get(attr_name, relationship, rel_inst)
+            await session.run_sql(self._do_get, attr_name, relationship, rel_inst)
             await rel_inst.init(session, input_, **rel_values)
 
         elif operation == 'remove':
-            self._do_remove(attr_name, relationship, rel_inst, input_)
+            await session.run_sql(self._do_remove, attr_name, relationship, rel_inst, input_)
 
         elif operation == 'insert':
             await self._do_insert(session, attr_name, relationship, rel_values)
@@ -455,7 +1089,9 @@ class ModelSQLAlchemyRedisBaseSuper(object):
     async def _do_insert(self, session, attr_name, relationship, rel_values):
         rel_model = type(self).get_model_from_rel(relationship)
         rel_inst = await rel_model.new(session, **rel_values)
+        await session.run_sql(self._do_append, attr_name, relationship, rel_inst)
 
+    def _do_append(self, attr_name, relationship, rel_inst):
         if relationship.prop.uselist is not True:
             setattr(self, attr_name, rel_inst)
         else:
@@ -466,23 +1102,7 @@ class ModelSQLAlchemyRedisBaseSuper(object):
         pass
 
     def get_related(self, session):
-        related = set()
-        cls = type(self)
-        for relationship in cls.__backrefs__:
-            related_model_insts = self._get_related_model_insts(
-                session, relationship, parent=True)
-            related.update(related_model_insts)
-
-        return related
-
-    def _get_related_model_insts(self, session, relationship, parent=False):
-        cls = type(self)
-        rel_model = cls.get_model_from_rel(relationship, parent=parent)
-
-        filters = cls.build_filters_by_ids([self.get_ids_map()])
-        result = set(rel_model._build_query(session).join(
-            relationship).filter(filters).all())
-        return result
+        return type(self).get_related_by_ids(session, [self.get_ids_map()])
 
     def todict(self, schema=None):
         if schema is None:
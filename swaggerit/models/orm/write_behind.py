@@ -0,0 +1,222 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.utils import set_logger
+from collections import OrderedDict, defaultdict
+import asyncio
+
+
+class CacheWriteBehind(object):
+
+    def __init__(self, max_queue_size=10000, batch_size=500, flush_interval=0.05,
+                 read_your_writes=False, max_retries=3, retry_backoff=0.1):
+        set_logger(self)
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.read_your_writes = read_your_writes
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._pending = OrderedDict()
+        self._models_to_invalidate = set()
+        self._session_factory = None
+        self._worker = None
+        self._stopping = False
+        self._has_pending = None
+        self._has_space = None
+        self._clean_stats()
+
+    def _clean_stats(self):
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.batches = 0
+        self.errors = 0
+        self.retries = 0
+        self.dropped = 0
+
+    def start(self, session_factory, loop=None):
+        self._session_factory = session_factory
+        self._stopping = False
+        self._has_pending = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+
+        if self._pending or self._models_to_invalidate:
+            self._has_pending.set()
+
+        self._worker = asyncio.ensure_future(self._run(), loop=loop)
+
+    async def stop(self):
+        if self._worker is None:
+            return
+
+        self._stopping = True
+        self._has_pending.set()
+        await self._worker
+        self._worker = None
+
+    async def put(self, model, inst_key, ids_map=None):
+        key = (model, inst_key)
+
+        while key not in self._pending and len(self._pending) >= self.max_queue_size:
+            if self._has_space is None:
+                await self.flush()
+            else:
+                self._has_space.clear()
+                await self._has_space.wait()
+
+        if key in self._pending:
+            self.coalesced += 1
+            del self._pending[key]
+
+        self._pending[key] = ids_map
+        self.enqueued += 1
+
+        if self._has_pending is not None:
+            self._has_pending.set()
+
+    def invalidate(self, model):
+        self._models_to_invalidate.add(model)
+        self.enqueued += 1
+
+        if self._has_pending is not None:
+            self._has_pending.set()
+
+    async def _run(self):
+        while True:
+            await self._has_pending.wait()
+            if not self._stopping:
+                await asyncio.sleep(self.flush_interval)
+
+            self._has_pending.clear()
+            await self.flush()
+
+            if self._stopping:
+                return
+
+    async def flush(self):
+        if self._session_factory is None and (self._pending or self._models_to_invalidate):
+            raise RuntimeError("'{}' must be started before flushing".format(type(self).__name__))
+
+        while self._pending or self._models_to_invalidate:
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popitem(last=False))
+
+            models_to_invalidate = self._models_to_invalidate
+            self._models_to_invalidate = set()
+
+            if self._has_space is not None:
+                self._has_space.set()
+
+            await self._flush_batch_with_retries(batch, models_to_invalidate)
+
+    async def _flush_batch_with_retries(self, batch, models_to_invalidate):
+        for retry in range(self.max_retries + 1):
+            if retry:
+                self.retries += 1
+                await asyncio.sleep(self.retry_backoff * 2 ** (retry - 1))
+
+            try:
+                await self._flush_batch(batch, models_to_invalidate)
+            except Exception:
+                self.errors += 1
+                self._logger.exception('Cache write-behind flush failed')
+            else:
+                self.flushed += len(batch) + len(models_to_invalidate)
+                self.batches += 1
+                return
+
+        await self._drop_batch(batch, models_to_invalidate)
+
+    async def _flush_batch(self, batch, models_to_invalidate):
+        session = self._build_session()
+        models_keys_ids = defaultdict(list)
+
+        try:
+            for (model, inst_key), ids_map in batch:
+                if ids_map is None:
+                    session.mark_key_for_hdel(model, inst_key)
+                else:
+                    models_keys_ids[model].append((inst_key, ids_map))
+
+            for model, keys_ids in models_keys_ids.items():
+                insts = await model.get(session, [ids for _, ids in keys_ids], todict=False)
+                insts_keys = set()
+
+                for inst in insts:
+                    session.mark_for_hmset_dict(inst)
+                    insts_keys.add(model.get_instance_key(inst))
+
+                for inst_key, _ in keys_ids:
+                    if inst_key not in insts_keys:
+                        session.mark_key_for_hdel(model, inst_key)
+
+            for model in models_to_invalidate:
+                session.mark_for_invalidation(model)
+
+            await session.commit()
+
+        finally:
+            await session.aclose()
+
+    async def _drop_batch(self, batch, models_to_invalidate):
+        session = self._build_session()
+
+        try:
+            for (model, inst_key), _ in batch:
+                session.mark_key_for_hdel(model, inst_key)
+
+            for model in models_to_invalidate:
+                session.mark_for_invalidation(model)
+
+            await session.commit()
+
+        except Exception:
+            self.errors += 1
+            self._logger.exception('Cache write-behind drop failed')
+
+        else:
+            self.dropped += len(batch) + len(models_to_invalidate)
+
+        finally:
+            await session.aclose()
+
+    def _build_session(self):
+        session = self._session_factory()
+        session.cache_write_behind = None
+        return session
+
+    def stats(self):
+        return {
+            'pending': len(self._pending) + len(self._models_to_invalidate),
+            'max_queue_size': self.max_queue_size,
+            'enqueued': self.enqueued,
+            'coalesced': self.coalesced,
+            'flushed': self.flushed,
+            'batches': self.batches,
+            'errors': self.errors,
+            'retries': self.retries,
+            'dropped': self.dropped
+        }
@@ -23,15 +23,13 @@
 
 from swaggerit.models._base import _ModelBase
 from swaggerit.models._swaggerit_meta import _init
-from copy import deepcopy
 
 
 class SwaggerItModel(_ModelBase):
 
     def __init__(self, key_sufix=None, schema=None):
         _ModelBase.__init__(self, key_sufix)
-        schema = type(self).__swagger_json__ if schema is None else schema
-        self.__swagger_json__ = deepcopy(schema)
+        self.__swagger_json__ = type(self).__swagger_json__ if schema is None else schema
         _init(self)
         self.__name__ = type(self).__name__
 
@@ -22,6 +22,8 @@
 
 
 from collections import namedtuple
+from functools import wraps
+from types import MappingProxyType
 
 
 _SwaggerResponse = namedtuple('SwaggerResponse', ['status_code', 'headers', 'body'])
@@ -35,3 +37,17 @@ class SwaggerResponse(_SwaggerResponse):
             headers={} if headers is None else headers,
             body=body
         )
+
+
+def static_response(status_code, headers=None, body=None):
+    response = SwaggerResponse(status_code, MappingProxyType(dict(headers or {})), body)
+
+    def decorator(operation):
+        @wraps(operation)
+        async def _static_operation(*args, **kwargs):
+            return SwaggerResponse(response.status_code, dict(response.headers), response.body)
+
+        _static_operation.static_response = response
+        return _static_operation
+
+    return decorator
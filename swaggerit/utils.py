@@ -29,10 +29,46 @@ import ujson
 import sys
 
 
-def build_validator(schema, path):
+def build_validator(schema, path, definitions=None, resolvers=None):
+    if definitions is None:
+        return Draft4Validator(schema, resolver=_build_resolver(schema, path))
+
+    if resolvers is not None and not _has_local_refs(schema):
+        cached = resolvers.get(path)
+
+        if cached is None or cached[0] is not definitions:
+            resolver = _build_resolver({'definitions': definitions}, path)
+            cached = resolvers[path] = (definitions, resolver)
+
+        return Draft4Validator(schema, resolver=cached[1])
+
+    referrer = schema
+    if 'definitions' not in schema:
+        referrer = dict(schema)
+        referrer['definitions'] = definitions
+
+    return Draft4Validator(schema, resolver=_build_resolver(referrer, path))
+
+
+def _has_local_refs(schema, root=True):
+    if isinstance(schema, dict):
+        ref = schema.get('$ref')
+        if isinstance(ref, str) and ref.startswith('#') \
+                and not ref.startswith('#/definitions/'):
+            return True
+
+        return any(_has_local_refs(value, False) for key, value in schema.items()
+                   if not (root and key == 'definitions'))
+
+    elif isinstance(schema, list):
+        return any(_has_local_refs(value, False) for value in schema)
+
+    return False
+
+
+def _build_resolver(schema, path):
     handlers = {'': _URISchemaHandler(path)}
-    resolver = RefResolver.from_schema(schema, handlers=handlers)
-    return Draft4Validator(schema, resolver=resolver)
+    return RefResolver.from_schema(schema, handlers=handlers)
 
 
 class _URISchemaHandler(object):
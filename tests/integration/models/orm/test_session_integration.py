@@ -22,6 +22,8 @@
 
 
 from tests.integration.models.orm.fixtures import *
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as SessionSA
 from unittest import mock
 import pytest
 import ujson
@@ -74,17 +76,36 @@ class TestSessionCommitRedisSet(object):
 
     @pytest.mark.asyncio(forbid_global_loop=False)
     async def test_if_error_right_raised(self, session, redis, request):
-        met_bkp = redis.hmset_dict
+        met_bkp = redis.multi_exec
         def fin():
-            redis.hmset_dict = met_bkp
+            redis.multi_exec = met_bkp
         request.addfinalizer(fin)
 
         session.add(await Model10.new(session, id=1))
-        redis.hmset_dict = raises
+        redis.multi_exec = mock.MagicMock(return_value=mock.MagicMock(execute=raises))
 
         with pytest.raises(ExceptionTest):
             await session.commit()
 
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_commit_uses_one_pipeline_and_one_transaction(self, session, redis):
+        for id_ in range(1, 51):
+            session.add(await Model10.new(session, id=id_))
+            session.add(await Model11.new(session, id=id_))
+
+        with mock.patch.object(redis, 'pipeline', wraps=redis.pipeline) as pipeline, \
+                mock.patch.object(redis, 'multi_exec', wraps=redis.multi_exec) as multi_exec, \
+                mock.patch.object(redis, 'smembers') as smembers, \
+                mock.patch.object(redis, 'hmset_dict') as hmset_dict:
+            await session.commit()
+
+        assert pipeline.call_count == 1
+        assert multi_exec.call_count == 1
+        assert not smembers.called
+        assert not hmset_dict.called
+        assert len(await redis.hgetall(Model10.__key__)) == 50
+        assert len(await redis.hgetall(Model11.__key__)) == 50
+
     @pytest.mark.asyncio(forbid_global_loop=False)
     async def test_if_istances_are_seted_on_redis_with_two_models_correctly(
             self, session, redis):
@@ -192,19 +213,41 @@ class TestSessionCommitRedisDelete(object):
 
     @pytest.mark.asyncio(forbid_global_loop=False)
     async def test_if_error_right_raised(self, session, redis, request):
-        met_bkp = redis.hdel
+        met_bkp = redis.multi_exec
         def fin():
-            redis.hdel = met_bkp
+            redis.multi_exec = met_bkp
         request.addfinalizer(fin)
 
         inst1 = await Model10.new(session, id=1)
         session.add(inst1)
         await session.commit()
         session.delete(inst1)
-        redis.hdel = raises
+        redis.multi_exec = mock.MagicMock(return_value=mock.MagicMock(execute=raises))
         with pytest.raises(ExceptionTest):
             await session.commit()
 
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_commit_deletes_using_one_pipeline_and_one_transaction(
+            self, session, redis):
+        insts = []
+        for id_ in range(1, 51):
+            insts.append(await Model10.new(session, id=id_))
+        session.add_all(insts)
+        await session.commit()
+        [session.delete(inst) for inst in insts]
+
+        with mock.patch.object(redis, 'pipeline', wraps=redis.pipeline) as pipeline, \
+                mock.patch.object(redis, 'multi_exec', wraps=redis.multi_exec) as multi_exec, \
+                mock.patch.object(redis, 'smembers') as smembers, \
+                mock.patch.object(redis, 'hdel') as hdel:
+            await session.commit()
+
+        assert pipeline.call_count == 1
+        assert multi_exec.call_count == 1
+        assert not smembers.called
+        assert not hdel.called
+        assert await redis.hgetall(Model10.__key__) == {}
+
     @pytest.mark.asyncio(forbid_global_loop=False)
     async def test_if_istances_are_seted_on_redis_with_two_models_correctly(
             self, session, redis):
@@ -269,3 +312,120 @@ class TestSessionCommitRedisDelete(object):
 
         assert await redis.hgetall(Model10.__key__) == {}
         assert await redis.hgetall(Model11.__key__) == {}
+
+
+class TestSessionCommitRedisInvalidation(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_related_instances_are_updated_on_redis(self, session, redis):
+        m11 = await Model13.new(session, id=1)
+        m21 = await Model14.new(session, id=1)
+        m21.Model13 = m11
+        session.add_all([m11, m21])
+        await session.commit()
+
+        session.mark_for_hmset_dict(m11)
+        await redis.delete(Model14.__key__)
+        await session.commit()
+
+        assert await redis.hgetall(Model14.__key__) == {
+            b'1': ujson.dumps(m21.todict()).encode()
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_related_model_is_invalidated_when_fanout_exceeded(self, session, redis):
+        m11 = await Model13.new(session, id=1)
+        m21 = await Model14.new(session, id=1)
+        m22 = await Model14.new(session, id=2)
+        m21.Model13 = m11
+        m22.Model13 = m11
+        session.add_all([m11, m21, m22])
+        await session.commit()
+
+        assert len(await redis.hgetall(Model14.__key__)) == 2
+
+        session.mark_for_hmset_dict(m11)
+        with mock.patch.object(Model14, '__max_related_fanout__', 1):
+            await session.commit()
+
+        assert await redis.exists(Model14.__key__) == 0
+        assert await redis.hgetall(Model13.__key__) == {
+            b'1': ujson.dumps(m11.todict()).encode()
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_model_marked_for_invalidation_is_deleted_from_redis(
+            self, session, redis):
+        session.add(await Model10.new(session, id=1))
+        await session.commit()
+
+        session.mark_for_invalidation(Model10)
+        await session.commit()
+
+        assert await redis.exists(Model10.__key__) == 0
+
+
+class TestSessionCommitFailure(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_redis_is_not_changed_when_flush_fails(self, session, redis):
+        session.add(await Model10.new(session, id=1))
+        await session.commit()
+        await redis.delete(Model10.__key__)
+
+        session.add(await Model10.new(session, id=1))
+        with mock.patch.object(redis, 'multi_exec', wraps=redis.multi_exec) as multi_exec:
+            with pytest.raises(IntegrityError):
+                await session.commit()
+
+        assert not multi_exec.called
+        assert await redis.exists(Model10.__key__) == 0
+
+        session.rollback()
+        session.add(await Model10.new(session, id=2))
+        await session.commit()
+
+        assert await redis.hgetall(Model10.__key__) == {
+            b'2': ujson.dumps({'id': 2}).encode()
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_redis_is_not_changed_when_sql_commit_fails(self, session, redis):
+        session.add(await Model10.new(session, id=1))
+
+        with mock.patch.object(SessionSA, 'commit', side_effect=ExceptionTest), \
+                mock.patch.object(redis, 'multi_exec', wraps=redis.multi_exec) as multi_exec:
+            with pytest.raises(ExceptionTest):
+                await session.commit()
+
+        assert not multi_exec.called
+        assert await redis.exists(Model10.__key__) == 0
+
+        session.rollback()
+        assert session.query(Model10).all() == []
+
+        session.add(await Model10.new(session, id=2))
+        await session.commit()
+
+        assert await redis.hgetall(Model10.__key__) == {
+            b'2': ujson.dumps({'id': 2}).encode()
+        }
+
+
+class TestSessionCommitRedisFilteredHashes(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_filtered_hashes_are_updated_on_commit(self, session, redis):
+        inst = await Model13.new(session, id=1)
+        session.add(inst)
+        await session.commit()
+
+        assert await Model13.get(session, {'id': 1}, id=1) == [{'id': 1}]
+        assert await redis.smembers(Model13.get_filters_names_key()) == [b'Model13_id']
+        assert await redis.hgetall('Model13_id') == {b'1': b'{"id":1}'}
+
+        session.delete(inst)
+        await session.commit()
+
+        assert await redis.hgetall('Model13_id') == {}
+        assert await redis.exists('Model13_Model13_id') == 0
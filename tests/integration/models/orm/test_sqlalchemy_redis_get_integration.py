@@ -21,11 +21,18 @@
 # SOFTWARE.
 
 
-from tests.integration.models.orm.fixtures import Model13
+from tests.integration.models.orm.fixtures import (
+    Model8, Model9, Model13, Model13_two_ids, Model14, Model15)
+from swaggerit.cache import LocalCache
+from swaggerit.models.orm.cache_policy import CachePolicy, CacheSweeper
+from swaggerit.request import SwaggerRequest
+from swaggerit.codecs import MsgPackCodec
 from unittest import mock
 from asyncio import coroutine
+import asyncio
 import pytest
 import ujson
+import sqlalchemy as sa
 
 
 def CoroMock():
@@ -213,3 +220,485 @@ class TestModelBaseGet(object):
     async def test_without_ids_and_with_limit_and_offset(self, session, redis, request):
         await Model13.insert(session, [{}, {}, {}])
         assert await Model13.get(session, limit=1, offset=1) == [{'id': 2}]
+
+
+class TestModelBaseGetWithLocalCache(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_uses_local_cache(self, session, redis):
+        session.local_cache = LocalCache()
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+
+        assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+        with mock.patch.object(redis, 'hmget', wraps=redis.hmget) as hmget:
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+        assert not hmget.called
+        assert session.local_cache.stats()['hits'] == 1
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_commit_invalidates_local_cache(self, session):
+        session.local_cache = LocalCache()
+        inst = await Model13.new(session, id=1)
+        session.add(inst)
+        await session.commit()
+        await Model13.get(session, {'id': 1})
+
+        session.delete(inst)
+        await session.commit()
+
+        assert session.local_cache.get_many('Model13', [b'1']) == [None]
+        assert await Model13.get(session, {'id': 1}) == []
+
+
+class TestModelBaseGetWithCachePolicy(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_evicts_entries_above_max_entries(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        session.add(await Model13.new(session, id=2))
+        await session.commit()
+        await redis.delete('Model13')
+
+        with mock.patch.object(Model13, '__cache_policy__', CachePolicy(max_entries=1)):
+            assert await Model13.get(session, [{'id': 1}, {'id': 2}]) == [{'id': 1}, {'id': 2}]
+
+        assert await redis.hkeys('Model13') == [b'2']
+        assert await redis.zrange('Model13__lru') == [b'2']
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_commit_removes_deleted_entries_from_indexes(self, session, redis):
+        with mock.patch.object(Model13, '__cache_policy__', CachePolicy(max_entries=10, ttl=60)):
+            inst = await Model13.new(session, id=1)
+            session.add(inst)
+            await session.commit()
+
+            assert await redis.zrange('Model13__lru') == [b'1']
+            assert await redis.zrange('Model13__ttl') == [b'1']
+
+            session.delete(inst)
+            await session.commit()
+
+        assert await redis.zcard('Model13__lru') == 0
+        assert await redis.zcard('Model13__ttl') == 0
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_sweeper_removes_expired_entries(self, session, redis, loop):
+        with mock.patch.object(Model13, '__cache_policy__', CachePolicy(ttl=0)):
+            session.add(await Model13.new(session, id=1))
+            await session.commit()
+            sweeper = CacheSweeper()
+            sweeper.start([Model13], redis, loop=loop)
+            await sweeper.sweep()
+            await sweeper.stop()
+
+        assert await redis.hgetall('Model13') == {}
+        assert sweeper.stats()['expired'] == 1
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_reloads_expired_entries_before_sweep(self, session, redis):
+        with mock.patch.object(Model13, '__cache_policy__', CachePolicy(ttl=60)):
+            session.add(await Model13.new(session, id=1))
+            await session.commit()
+            await redis.hset('Model13', '1', '{"id":1,"stale":true}')
+            await redis.zadd('Model13__ttl', 0, b'1')
+
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+            assert await redis.hget('Model13', '1') == b'{"id":1}'
+            assert await redis.zscore('Model13__ttl', b'1') > 0
+
+
+class TestModelBaseGetWithNegativeCache(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_caches_missing_ids(self, session, redis):
+        with mock.patch.object(Model13, '__negative_cache_ttl__', 60):
+            assert await Model13.get(session, {'id': 1}) == []
+
+            with mock.patch.object(Model13, '_build_query') as build_query:
+                assert await Model13.get(session, {'id': 1}) == []
+
+        assert not build_query.called
+        assert (await redis.hget('Model13', b'1')).startswith(b'\x01')
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_commit_replaces_tombstone(self, session):
+        with mock.patch.object(Model13, '__negative_cache_ttl__', 60):
+            assert await Model13.get(session, {'id': 1}) == []
+
+            session.add(await Model13.new(session, id=1))
+            await session.commit()
+
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_ignores_expired_tombstones(self, session, redis):
+        await redis.hset('Model13', b'1', b'\x010')
+        session.add(await Model13.new(session, id=1))
+        await session.run_sql(session.flush)
+
+        assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_does_not_cache_missing_ids_by_default(self, session, redis):
+        assert await Model13.get(session, {'id': 1}) == []
+        assert await redis.hget('Model13', b'1') is None
+
+
+class TestModelBaseGetStampedeProtection(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_concurrent_misses_query_once(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        await redis.delete('Model13')
+
+        with mock.patch.object(Model13, '_fill_cache_from_db',
+                               wraps=Model13._fill_cache_from_db) as fill:
+            results = await asyncio.gather(*[
+                Model13.get(session, {'id': 1}) for _ in range(10)])
+
+        assert results == [[{'id': 1}]] * 10
+        assert fill.call_count == 1
+        assert Model13.__cache_fills_in_flight__ == {}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_waits_for_lease_holder(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        await redis.delete('Model13')
+        await redis.set('Model13__lease:1', b'1')
+
+        async def fill_as_lease_holder():
+            await asyncio.sleep(0.02)
+            await redis.hset('Model13', b'1', b'{"id":1,"filled":true}')
+
+        with mock.patch.object(Model13, '__cache_fill_lease__', 1):
+            future = asyncio.ensure_future(fill_as_lease_holder())
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1, 'filled': True}]
+            await future
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_fills_after_lease_timeout(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        await redis.delete('Model13')
+        await redis.set('Model13__lease:1', b'1')
+
+        with mock.patch.object(Model13, '__cache_fill_lease__', 0.05):
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_releases_acquired_lease(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        await redis.delete('Model13')
+
+        with mock.patch.object(Model13, '__cache_fill_lease__', 10):
+            assert await Model13.get(session, {'id': 1}) == [{'id': 1}]
+
+        assert await redis.exists('Model13__lease:1') == 0
+
+
+class TestModelBaseGetWithInList(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_queries_ids_in_chunks(self, session, redis):
+        for id_ in range(1, 6):
+            session.add(await Model13.new(session, id=id_))
+        await session.commit()
+        await redis.delete('Model13')
+
+        with mock.patch.object(Model13, '__max_in_list__', 2):
+            with mock.patch.object(Model13, 'build_filters_by_ids',
+                                   wraps=Model13.build_filters_by_ids) as build_filters:
+                objs = await Model13.get(session, [{'id': 4}, {'id': 1}, {'id': 5}])
+
+        assert objs == [{'id': 4}, {'id': 1}, {'id': 5}]
+        assert build_filters.call_count == 2
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_without_cache_keeps_ids_order(self, session):
+        for id_ in range(1, 4):
+            session.add(await Model13.new(session, id=id_))
+        await session.commit()
+
+        insts = await Model13.get(session, [{'id': 3}, {'id': 1}, {'id': 2}], todict=False)
+        assert [inst.id for inst in insts] == [3, 1, 2]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_if_get_with_composite_ids_keeps_ids_order(self, session):
+        session.add(await Model13_two_ids.new(session, id=1, id2=2))
+        session.add(await Model13_two_ids.new(session, id=2, id2=1))
+        await session.commit()
+
+        insts = await Model13_two_ids.get(
+            session, [{'id': 2, 'id2': 1}, {'id': 1, 'id2': 2}], todict=False)
+        assert [(inst.id, inst.id2) for inst in insts] == [(2, 1), (1, 2)]
+
+    def test_build_filters_by_ids_with_in_list(self):
+        filters = Model13.build_filters_by_ids([{'id': 1}, {'id': 2}])
+        assert str(filters) == '"Model13".id IN (:id_1, :id_2)'
+
+    def test_build_filters_by_ids_with_none_values(self):
+        filters = Model13.build_filters_by_ids([{'id': 1}, {'id': None}])
+        assert 'IS NULL' in str(filters)
+
+
+class TestModelBaseWarmCache(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_sets_all_rows_in_chunks(self, session, redis):
+        for id_ in range(1, 6):
+            session.add(await Model13.new(session, id=id_))
+        await session.commit()
+        await redis.delete('Model13')
+
+        with mock.patch.object(redis, 'hmset_dict', wraps=redis.hmset_dict) as hmset_dict:
+            assert await Model13.warm_cache(session, chunk_size=2) == 5
+
+        assert hmset_dict.call_count == 3
+        assert await redis.hgetall('Model13') == {
+            str(id_).encode(): ujson.dumps({'id': id_}).encode() for id_ in range(1, 6)
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_with_filters(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        session.add(await Model13.new(session, id=2))
+        await session.commit()
+        await redis.delete('Model13')
+
+        assert await Model13.warm_cache(session, id=2) == 1
+        assert await redis.hgetall('Model13') == {b'2': b'{"id":2}'}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_without_rows(self, session, redis):
+        assert await Model13.warm_cache(session) == 0
+        assert await redis.hgetall('Model13') == {}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_loads_relationships_per_chunk(self, session, redis, engine):
+        for id_ in range(1, 5):
+            session.add(await Model9.new(session, id=id_))
+            session.add(await Model8.new(session, id=id_, model9_id=id_))
+        await session.commit()
+        await redis.delete('model8')
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        sa.event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            assert await Model8.warm_cache(session, chunk_size=2) == 4
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', listener)
+
+        assert len(statements) == 3
+        assert ujson.loads(await redis.hget('model8', '4')) == {
+            'id': 4, 'model9_id': 4, 'model6_id': None,
+            'model9': {'id': 4, 'model7_id': None}
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_waits_pending_write_on_error(self, session, redis):
+        for id_ in range(1, 6):
+            session.add(await Model13.new(session, id=id_))
+        await session.commit()
+        await redis.delete('Model13')
+
+        build_chunk = Model13._build_warm_cache_chunk
+        calls = []
+
+        def build_chunk_failing(instances, chunk_size):
+            calls.append(chunk_size)
+            if len(calls) == 2:
+                raise RuntimeError()
+            return build_chunk(instances, chunk_size)
+
+        with mock.patch.object(Model13, '_build_warm_cache_chunk', side_effect=build_chunk_failing):
+            with pytest.raises(RuntimeError):
+                await Model13.warm_cache(session, chunk_size=2)
+
+        assert await redis.hgetall('Model13') == {b'1': b'{"id":1}', b'2': b'{"id":2}'}
+
+
+class TestModelBaseSwaggerWarmCache(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_warm_cache_casts_query_values(self, session):
+        req = SwaggerRequest('/', 'post', query={'chunk_size': '2', 'pause': '0.5', 'id': 1})
+
+        with mock.patch.object(Model13, '_create_job') as create_job:
+            await Model13.swagger_warm_cache(req, session)
+
+        args, kwargs = create_job.call_args
+        assert args[0] == Model13._warm_cache_job
+        assert kwargs == {'chunk_size': 2, 'pause': 0.5, 'id': 1}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_warm_cache_with_invalid_chunk_size(self, session):
+        for chunk_size in ('test', '0', '-1'):
+            req = SwaggerRequest('/', 'post', query={'chunk_size': chunk_size})
+
+            with mock.patch.object(Model13, '_create_job') as create_job:
+                resp = await Model13.swagger_warm_cache(req, session)
+
+            assert resp.status_code == 400
+            assert ujson.loads(resp.body) == {
+                'message': "'chunk_size' must be a number greater than or equal to 1",
+                'instance': {'chunk_size': chunk_size}
+            }
+            assert not create_job.called
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_warm_cache_with_invalid_pause(self, session):
+        req = SwaggerRequest('/', 'post', query={'pause': 'test'})
+        resp = await Model13.swagger_warm_cache(req, session)
+        assert resp.status_code == 400
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_warm_cache_job(self, session, redis):
+        session.add(await Model13.new(session, id=1))
+        session.add(await Model13.new(session, id=2))
+        await session.commit()
+        await redis.delete('Model13')
+
+        req = SwaggerRequest('/', 'post')
+        assert await Model13._warm_cache_job(req, session, chunk_size=1) == {'warmed': 2}
+        assert await redis.hgetall('Model13') == {b'1': b'{"id":1}', b'2': b'{"id":2}'}
+
+
+class TestModelBaseGetRaw(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_raw_returns_cached_blobs_in_ids_order(self, session):
+        session.add(await Model13.new(session, id=1))
+        session.add(await Model13.new(session, id=2))
+        await session.commit()
+
+        objs = await Model13.get_raw(session, [{'id': 2}, {'id': 3}, {'id': 1}])
+        assert [ujson.loads(obj) for obj in objs] == [{'id': 2}, {'id': 1}]
+
+        objs = await Model13.get_raw(session, [{'id': 2}, {'id': 1}])
+        assert [ujson.loads(obj) for obj in objs] == [{'id': 2}, {'id': 1}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_get_splices_cached_blobs(self, session):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        await Model13.get(session, {'id': 1})
+        req = SwaggerRequest('/model13/1', 'get', path_params={'id': 1})
+
+        with mock.patch.object(Model13, '_unpack_cache_obj') as unpack_cache_obj:
+            resp = await Model13.swagger_get(req, session)
+
+        assert not unpack_cache_obj.called
+        assert resp.status_code == 200
+        assert isinstance(resp.body, bytes)
+        assert ujson.loads(resp.body) == {'id': 1}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_get_many_splices_cached_blobs(self, session):
+        session.add(await Model13.new(session, id=1))
+        session.add(await Model13.new(session, id=2))
+        await session.commit()
+        req = SwaggerRequest('/model13', 'get', query={'ids': [{'id': 1}, {'id': 2}]})
+
+        resp = await Model13.swagger_get_many(req, session)
+
+        assert resp.body.startswith(b'[') and resp.body.endswith(b']')
+        assert ujson.loads(resp.body) == [{'id': 1}, {'id': 2}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_get_many_splices_cached_blobs_with_msgpack(self, session):
+        pytest.importorskip('msgpack')
+        codec = MsgPackCodec()
+        req = SwaggerRequest('/model13', 'get', query={'ids': [{'id': 1}, {'id': 2}]})
+
+        with mock.patch.object(Model13, '__codec__', codec):
+            session.add(await Model13.new(session, id=1))
+            session.add(await Model13.new(session, id=2))
+            await session.commit()
+            resp = await Model13.swagger_get_many(req, session)
+
+        assert resp.headers['content-type'] == 'application/msgpack'
+        assert codec.decode(resp.body) == [{'id': 1}, {'id': 2}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_swagger_get_without_raw_passthrough(self, session):
+        session.add(await Model13.new(session, id=1))
+        await session.commit()
+        req = SwaggerRequest('/model13/1', 'get', path_params={'id': 1})
+
+        with mock.patch.object(Model13, '__raw_passthrough__', False):
+            resp = await Model13.swagger_get(req, session)
+
+        assert resp.body == b'{"id":1}'
+
+
+class TestModelBaseGetWithEagerLoading(object):
+
+    async def _get_queries(self, session, engine, model, **kwargs):
+        session.expunge_all()
+        queries = []
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            objs = await model.get(session, **kwargs)
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        return objs, queries
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_loads_relationships_with_one_query(self, session, engine):
+        for id_ in range(1, 4):
+            await Model14.insert(
+                session, {'id': id_, 'Model13': {'id': id_, '_operation': 'insert'}})
+
+        objs, queries = await self._get_queries(session, engine, Model14)
+
+        assert objs == [{'id': id_, 'Model13_id': id_, 'Model13': {'id': id_}}
+                        for id_ in range(1, 4)]
+        assert len(queries) == 2
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_skips_relationships_excluded_from_schema(self, session, engine):
+        await Model14.insert(session, {'id': 1, 'Model13': {'id': 1, '_operation': 'insert'}})
+
+        with mock.patch.object(Model14, '__todict_schema__', {'Model13': False}):
+            objs, queries = await self._get_queries(session, engine, Model14)
+
+        assert objs == [{'id': 1, 'Model13_id': 1}]
+        assert len(queries) == 1
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_without_eager_loading(self, session, engine):
+        for id_ in range(1, 4):
+            await Model14.insert(
+                session, {'id': id_, 'Model13': {'id': id_, '_operation': 'insert'}})
+
+        with mock.patch.object(Model14, '__eager_loading__', None):
+            objs, queries = await self._get_queries(session, engine, Model14)
+
+        assert len(objs) == 3
+        assert len(queries) == 4
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_with_joined_eager_loading(self, session, engine):
+        await Model14.insert(session, {'id': 1, 'Model13': {'id': 1, '_operation': 'insert'}})
+
+        with mock.patch.object(Model14, '__eager_loading__', 'joined'):
+            objs, queries = await self._get_queries(session, engine, Model14)
+
+        assert objs == [{'id': 1, 'Model13_id': 1, 'Model13': {'id': 1}}]
+        assert len(queries) == 1
+
+    def test_eager_loading_options_follow_nested_relationships(self):
+        assert len(Model15.get_eager_loading_options()) == 3
+        assert len(Model13.get_eager_loading_options()) == 0
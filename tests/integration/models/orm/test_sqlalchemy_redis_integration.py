@@ -22,9 +22,12 @@
 
 
 from tests.integration.models.orm.fixtures import *
+from swaggerit.models.orm.session import Session
+from swaggerit.models.orm.executor import SQLExecutor
 from swaggerit.exceptions import SwaggerItModelError
 from copy import deepcopy
 from unittest import mock
+import threading
 import pytest
 import ujson
 import sqlalchemy as sa
@@ -187,6 +190,76 @@ class TestModelBaseGetRelated(object):
         assert m11.Model14 == [m21, m22]
         assert m21.get_related(session) == {m11}
 
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_related_by_ids_makes_one_query_per_backref(
+            self, session, engine):
+        m11 = await Model13.new(session, id=1)
+        m12 = await Model13.new(session, id=2)
+        m21 = await Model14.new(session, id=1)
+        m22 = await Model14.new(session, id=2)
+        m23 = await Model14.new(session, id=3)
+        m21.Model13 = m11
+        m22.Model13 = m12
+        m23.Model13 = m12
+        session.add_all([m11, m12, m21, m22, m23])
+        await session.commit()
+
+        queries = []
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            related = Model13.get_related_by_ids(session, [{'id': 1}, {'id': 2}])
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert {m21, m22, m23}.issubset(related)
+        assert len(queries) == len(Model13.get_backrefs())
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_related_by_ids_marks_model_for_invalidation_when_fanout_exceeded(
+            self, session):
+        m11 = await Model13.new(session, id=1)
+        m21 = await Model14.new(session, id=1)
+        m22 = await Model14.new(session, id=2)
+        m21.Model13 = m11
+        m22.Model13 = m11
+        session.add_all([m11, m21, m22])
+        await session.commit()
+
+        with mock.patch.object(Model14, '__max_related_fanout__', 1), \
+                mock.patch.object(session, 'mark_for_invalidation') as mark_for_invalidation:
+            related = Model13.get_related_by_ids(session, [{'id': 1}])
+
+        assert not {m21, m22}.intersection(related)
+        assert mock.call(Model14) in mark_for_invalidation.call_args_list
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_get_related_by_ids_counts_each_related_instance_once(self, session):
+        m41 = await Model4.new(session, id=1)
+        m42 = await Model4.new(session, id=2)
+        m11 = await Model1.new(session, id=1)
+        m12 = await Model1.new(session, id=2)
+        m11.model4 = [m41, m42]
+        m12.model4 = [m42]
+        session.add_all([m41, m42, m11, m12])
+        await session.commit()
+
+        with mock.patch.object(Model1, '__max_related_fanout__', 2), \
+                mock.patch.object(session, 'mark_for_invalidation') as mark_for_invalidation:
+            related = Model4.get_related_by_ids(session, [{'id': 1}, {'id': 2}])
+
+        assert {m11, m12}.issubset(related)
+        assert mock.call(Model1) not in mark_for_invalidation.call_args_list
+
+        with mock.patch.object(Model1, '__max_related_fanout__', 1), \
+                mock.patch.object(session, 'mark_for_invalidation') as mark_for_invalidation:
+            related = Model4.get_related_by_ids(session, [{'id': 1}, {'id': 2}])
+
+        assert not {m11, m12}.intersection(related)
+        assert mock.call(Model1) in mark_for_invalidation.call_args_list
+
 
 class TestModelBaseInsert(object):
 
@@ -527,6 +600,98 @@ class TestModelBaseInsert(object):
             await Model14.insert(session, {'Model13': {'id': 1, '_operation': 'delete'}})
 
 
+class TestModelBaseNestedResolution(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_nested_list_is_resolved_with_one_query(self, session, engine):
+        await Model13.insert(session, [{'id': id_} for id_ in range(1, 11)])
+
+        queries = []
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            inst = await Model14_mtm.new(
+                session, id=1, Model13=[{'id': id_} for id_ in range(10, 0, -1)])
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert [m13.id for m13 in inst.Model13] == list(range(10, 0, -1))
+        assert len(queries) == 1
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_each_related_model_is_resolved_with_one_query(
+            self, session, engine):
+        await Model13.insert(session, [{'id': 1}, {'id': 2}])
+        await Model14_mtm.insert(session, {'id': 1})
+
+        queries = []
+        def before_cursor_execute(conn, cursor, statement, *args):
+            queries.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            inst = await Model15_mtm.new(
+                session, id=1, Model13={'id': 2}, Model14={'id': 1})
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert inst.Model13.id == 2
+        assert inst.Model14.id == 1
+        assert len(queries) == 2
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_nested_list_with_missing_ids_raises_error(self, session):
+        await Model13.insert(session, {'id': 1})
+
+        with pytest.raises(SwaggerItModelError):
+            await Model14_mtm.new(session, id=1, Model13=[{'id': 1}, {'id': 2}])
+
+
+class TestModelBaseBulkInsert(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_insert_with_columns_only_uses_executemany_in_chunks(self, session, engine):
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, executemany))
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            with mock.patch.object(Model13, '__bulk_chunk_size__', 2):
+                objs = await Model13.insert(session, [{'id': 3}, {'id': 1}, {'id': 2}])
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert objs == [{'id': 3}, {'id': 1}, {'id': 2}]
+        assert [executemany for statement, executemany in statements
+                if statement.startswith('INSERT')] == [True, False]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_insert_with_columns_only_collects_generated_ids(self, session):
+        objs = await Model13_two_ids.insert(session, [{'id2': 1}, {'id2': 2}])
+        assert objs == [{'id': 1, 'id2': 1}, {'id': 2, 'id2': 2}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_insert_with_columns_only_sets_cache_in_chunks(self, session, redis):
+        with mock.patch.object(Model13, '__bulk_chunk_size__', 2):
+            await Model13.insert(session, [{'id': id_} for id_ in range(1, 6)])
+
+        assert await redis.hgetall('Model13') == {
+            str(id_).encode(): ujson.dumps({'id': id_}).encode() for id_ in range(1, 6)
+        }
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_insert_with_relationships_does_not_use_bulk_insert(self, session):
+        with mock.patch.object(Model14, '_bulk_insert') as bulk_insert:
+            objs = await Model14.insert(
+                session, {'id': 1, 'Model13': {'id': 1, '_operation': 'insert'}})
+
+        assert not bulk_insert.called
+        assert objs == [{'id': 1, 'Model13_id': 1, 'Model13': {'id': 1}}]
+
+
 class TestModelBaseUpdate(object):
 
     @pytest.mark.asyncio(forbid_global_loop=False)
@@ -734,6 +899,117 @@ class TestModelBaseUpdate(object):
         assert session.query(Model14_mtm).one().todict() == {'id': 1, 'Model13': [{'id': 1}]}
 
 
+@pytest.fixture
+def executor_session(session, engine, redis, loop):
+    executor = SQLExecutor(engine, max_workers=2)
+    executor_session = Session(bind=engine, redis_bind=redis, loop=loop, sql_executor=executor)
+    threads = set()
+
+    def listener(*args):
+        threads.add(threading.get_ident())
+
+    sa.event.listen(engine, 'before_cursor_execute', listener)
+    executor_session.threads = threads
+    yield executor_session
+    sa.event.remove(engine, 'before_cursor_execute', listener)
+    loop.run_until_complete(executor_session.aclose())
+    executor.shutdown()
+
+
+class TestModelBaseUpdateWithSQLExecutor(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_nested_operations(self, executor_session):
+        session = executor_session
+        await Model14_mtm.insert(session, {'Model13': [{'_operation': 'insert'}, {'_operation': 'insert'}]})
+        await Model14_mtm.update(session, {'id': 1, 'Model13': [
+            {'id': 2, '_operation': 'remove'},
+            {'id': 3, '_operation': 'insert'}]})
+
+        assert await Model14_mtm.get(session, {'id': 1}) == [{'id': 1, 'Model13': [{'id': 1}, {'id': 3}]}]
+        assert threading.get_ident() not in session.threads
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_nested_delete(self, executor_session):
+        session = executor_session
+        await Model14_mtm.insert(session, {'Model13': [{'_operation': 'insert'}, {'_operation': 'insert'}]})
+        await Model14_mtm.update(session, {'id': 1, 'Model13': [{'id': 1, '_operation': 'delete'}]})
+
+        assert await Model14_mtm.get(session, {'id': 1}) == [{'id': 1, 'Model13': [{'id': 2}]}]
+        assert await Model13.get(session, {'id': 1}) == []
+        assert threading.get_ident() not in session.threads
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_session_delete_updates_related(self, executor_session, redis):
+        session = executor_session
+        await Model14_mtm.insert(session, {'Model13': [{'_operation': 'insert'}, {'_operation': 'insert'}]})
+        [model13] = await Model13.get(session, {'id': 1}, todict=False)
+        session.delete(model13)
+        await session.commit()
+
+        assert await redis.hget('Model13', '1') is None
+        assert ujson.loads(await redis.hget('Model14_mtm', '1')) == {'id': 1, 'Model13': [{'id': 2}]}
+        assert threading.get_ident() not in session.threads
+
+
+class TestModelBaseBulkUpdate(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_columns_only_uses_executemany(self, session, engine):
+        await Model13_nested.insert(session, [{'id': id_} for id_ in range(1, 4)])
+
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, executemany))
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            objs = await Model13_nested.update(session, [
+                {'id': 3, 'test': 'test3'},
+                {'id': 1, 'test': 'test1'},
+                {'id': 4, 'test': 'test4'}])
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert objs == [{'id': 3, 'test': 'test3'}, {'id': 1, 'test': 'test1'}]
+        assert [executemany for statement, executemany in statements
+                if statement.startswith('UPDATE')] == [True]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_columns_only_refreshes_cache(self, session, redis):
+        await Model13_nested.insert(session, [{'id': 1}, {'id': 2}])
+        assert await Model13_nested.get(session, [{'id': 1}, {'id': 2}]) == \
+            [{'id': 1, 'test': None}, {'id': 2, 'test': None}]
+
+        await Model13_nested.update(session, {'id': 2, 'test': 'test_updated'})
+
+        assert await Model13_nested.get(session, [{'id': 1}, {'id': 2}]) == \
+            [{'id': 1, 'test': None}, {'id': 2, 'test': 'test_updated'}]
+        assert ujson.loads(await redis.hget('Model13_nested', b'2')) == \
+            {'id': 2, 'test': 'test_updated'}
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_relationships_does_not_use_bulk_update(self, session):
+        await Model13_nested.insert(session, {'id': 1})
+        await Model14_nested.insert(session, {'id': 1})
+
+        with mock.patch.object(Model14_nested, '_bulk_update') as bulk_update:
+            await Model14_nested.update(session, {'id': 1, 'Model13': {'id': 1}})
+
+        assert not bulk_update.called
+        assert session.query(Model14_nested).one().Model13_id == 1
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_update_with_new_ids_does_not_use_bulk_update(self, session):
+        await Model13_nested.insert(session, {'id': 1})
+
+        with mock.patch.object(Model13_nested, '_bulk_update') as bulk_update:
+            objs = await Model13_nested.update(session, {'id': 2}, ids={'id': 1})
+
+        assert not bulk_update.called
+        assert objs == [{'id': 2, 'test': None}]
+
+
 class TestModelBaseDelete(object):
 
     @pytest.mark.asyncio(forbid_global_loop=False)
@@ -765,3 +1041,54 @@ class TestModelBaseDelete(object):
 
         await Model13_three_ids.delete(session , {'id': 1, 'id2': 2, 'id3': 3})
         assert await Model13_three_ids.get(session) == []
+
+
+class TestModelBaseBulkDelete(object):
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_delete_without_relationships_uses_one_statement(self, session, engine):
+        await Model13.insert(session, [{'id': id_} for id_ in range(1, 5)])
+
+        statements = []
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        sa.event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            await Model13.delete(session, [{'id': 1}, {'id': 3}, {'id': 4}])
+        finally:
+            sa.event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+        assert len([statement for statement in statements
+                    if statement.startswith('DELETE')]) == 1
+        assert await Model13.get(session) == [{'id': 2}]
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_delete_without_relationships_deletes_cache_keys(self, session, redis):
+        await Model13.insert(session, [{'id': 1}, {'id': 2}])
+        assert await Model13.get(session, [{'id': 1}, {'id': 2}]) == [{'id': 1}, {'id': 2}]
+
+        await Model13.delete(session, [{'id': 1}, {'id': 2}])
+
+        assert await redis.hgetall('Model13') == {}
+        assert await Model13.get(session, [{'id': 1}, {'id': 2}]) == []
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_delete_without_relationships_deletes_related_cache_keys(self, session, redis):
+        await Model15.insert(session, {'id': 1, 'Model13': {'id': 1, '_operation': 'insert'}})
+        assert await redis.hget('Model15', b'1') is not None
+
+        await Model13.delete(session, {'id': 1})
+
+        assert await redis.hget('Model15', b'1') is None
+        assert await Model15.get(session, {'id': 1}) == []
+
+    @pytest.mark.asyncio(forbid_global_loop=False)
+    async def test_delete_with_relationships_does_not_use_bulk_delete(self, session):
+        await Model14.insert(session, {'id': 1})
+
+        with mock.patch.object(Model14, '_bulk_delete_rows') as bulk_delete_rows:
+            await Model14.delete(session, {'id': 1})
+
+        assert not bulk_delete_rows.called
+        assert await Model14.get(session) == []
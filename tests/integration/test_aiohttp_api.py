@@ -22,6 +22,8 @@
 
 
 from tests.integration.fixtures import ModelSQLAlchemyRedisBase
+from swaggerit.aiohttp_api import AioHttpAPI
+from swaggerit.response import SwaggerResponse
 import pytest
 import sqlalchemy as sa
 
@@ -87,6 +89,12 @@ class TestAioHttpAPI(object):
         assert resp.status == 201
         assert await resp.json() == [{'id': 1, 'm2_id': None, 'model2': None}]
 
+    async def test_options(self, client, session):
+        resp = await (await client).options('/model1/1')
+        assert resp.status == 200
+        assert resp.headers['Allow'] == 'PATCH'
+        assert resp.headers['Content-Type'] == 'application/json'
+
     async def test_get_swagger_json(self, client, session):
         resp = await (await client).get( '/doc/swagger.json')
         assert resp.status == 200
@@ -139,3 +147,24 @@ class TestAioHttpAPI(object):
                     }
                 }
             }
+
+
+async def deny_authorizer(req, session):
+    return SwaggerResponse(401)
+
+
+class TestAioHttpAPIWithAuthorizer(object):
+
+    @pytest.fixture
+    def api(self, engine, redis, models, loop):
+        return AioHttpAPI(models, sqlalchemy_bind=engine, redis_bind=redis,
+                          title='Test API', loop=loop, authorizer=deny_authorizer)
+
+    async def test_options_without_authorization_header(self, client, session):
+        resp = await (await client).options('/model1/1')
+        assert resp.status == 200
+        assert resp.headers['Allow'] == 'PATCH'
+
+    async def test_options_with_authorization_header_calls_authorizer(self, client, session):
+        resp = await (await client).options('/model1/1', headers={'Authorization': 'test'})
+        assert resp.status == 401
@@ -0,0 +1,95 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.api import SwaggerAPI
+from swaggerit.response import SwaggerResponse
+from unittest import mock
+
+
+class RoutesAPI(SwaggerAPI):
+
+    def __init__(self, handlers):
+        self._compile_handlers = False
+        self.handlers = handlers
+        self.routes = []
+
+    def get_model_methods(self, model):
+        return iter(self.handlers)
+
+    def _get_base_path(self):
+        return ''
+
+    def _set_handler_decorator(self, handler):
+        return 'dynamic'
+
+    def _set_static_handler_decorator(self, response, authorized_handler=None):
+        return 'static' if authorized_handler is None else ('static', authorized_handler)
+
+    def _set_route(self, path, method, handler):
+        self.routes.append((path, method, handler))
+
+    def _set_swagger_doc(self, swagger_doc_url):
+        pass
+
+
+def build_handler(static_response=None, authorizer=None):
+    return mock.MagicMock(static_response=static_response, auth_required=False,
+                          authorizer=authorizer)
+
+
+class Model(object):
+    __swagger_json__ = {'paths': {}}
+
+
+class TestSwaggerAPIRoutes(object):
+
+    def test_static_get_routes_answer_head(self):
+        api = RoutesAPI([('/static', 'get', build_handler(SwaggerResponse(200)))])
+        api._set_model_routes(Model)
+
+        assert api.routes == [('/static', 'get', 'static'), ('/static', 'head', 'static')]
+
+    def test_dynamic_get_routes_do_not_answer_head(self):
+        api = RoutesAPI([('/dynamic', 'get', build_handler())])
+        api._set_model_routes(Model)
+
+        assert api.routes == [('/dynamic', 'get', 'dynamic')]
+
+    def test_static_get_routes_keep_declared_head(self):
+        class HeadModel(object):
+            __swagger_json__ = {'paths': {'/static': {'get': {}, 'head': {}}}}
+
+        api = RoutesAPI([('/static', 'get', build_handler(SwaggerResponse(200)))])
+        api._set_model_routes(HeadModel)
+
+        assert api.routes == [('/static', 'get', 'static')]
+
+    def test_static_routes_with_authorizer_keep_authorized_handler(self):
+        handler = build_handler(SwaggerResponse(200), authorizer=mock.MagicMock())
+        api = RoutesAPI([('/static', 'get', handler)])
+        api._set_model_routes(Model)
+
+        assert api.routes == [
+            ('/static', 'get', ('static', 'dynamic')),
+            ('/static', 'head', ('static', 'dynamic'))
+        ]
@@ -0,0 +1,372 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.cache import TTLCache, AuthorizerCache, LocalCache
+from swaggerit.request import SwaggerRequest
+from swaggerit.response import SwaggerResponse
+from unittest import mock
+import asyncio
+import time
+
+
+class Session(object):
+    user = None
+
+
+def build_authorizer(response=None, user='test'):
+    async def authorizer(req, session):
+        authorizer.calls += 1
+        session.user = user
+        return response
+
+    authorizer.calls = 0
+    return authorizer
+
+
+def build_request(authorization='test', path_params=None):
+    return SwaggerRequest('/', 'get', path_params=path_params,
+                          headers={'authorization': authorization})
+
+
+def build_subscriber():
+    subscriber = mock.MagicMock()
+    subscriber.messages = []
+
+    async def subscribe(channel):
+        return [FakeChannel(subscriber.messages)]
+
+    async def unsubscribe(channel):
+        pass
+
+    async def wait_closed():
+        pass
+
+    subscriber.subscribe = mock.MagicMock(side_effect=subscribe)
+    subscriber.unsubscribe = unsubscribe
+    subscriber.wait_closed = wait_closed
+    return subscriber
+
+
+class TestTTLCache(object):
+
+    def test_get_and_set(self):
+        cache = TTLCache()
+        cache.set('test', 1)
+        assert cache.get('test') == 1
+        assert cache.get('invalid') is None
+
+    def test_set_evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2)
+        cache.set('test1', 1)
+        cache.set('test2', 2)
+        cache.get('test1')
+        cache.set('test3', 3)
+
+        assert 'test1' in cache
+        assert 'test2' not in cache
+        assert 'test3' in cache
+
+    def test_get_expired(self):
+        cache = TTLCache(ttl=10)
+        with mock.patch('swaggerit.cache.time.monotonic', return_value=0):
+            cache.set('test', 1)
+
+        with mock.patch('swaggerit.cache.time.monotonic', return_value=10):
+            assert cache.get('test') is None
+
+        assert len(cache) == 0
+
+    def test_stats(self):
+        cache = TTLCache()
+        cache.set('test', 1)
+        cache.get('test')
+        cache.get('invalid')
+
+        assert cache.stats() == {
+            'size': 1,
+            'max_size': 1024,
+            'hits': 1,
+            'misses': 1,
+            'hit_ratio': 0.5
+        }
+
+
+class TestAuthorizerCache(object):
+
+    def test_authorize_calls_authorizer_once(self, loop):
+        cache = AuthorizerCache()
+        authorizer = build_authorizer()
+
+        for _ in range(3):
+            session = Session()
+            result = loop.run_until_complete(
+                cache.authorize(authorizer, build_request(), session, 'test'))
+            assert result is None
+            assert session.user == 'test'
+
+        assert authorizer.calls == 1
+
+    def test_authorize_caches_by_operation(self, loop):
+        cache = AuthorizerCache()
+        authorizer = build_authorizer()
+
+        loop.run_until_complete(cache.authorize(authorizer, build_request(), Session(), 'test1'))
+        loop.run_until_complete(cache.authorize(authorizer, build_request(), Session(), 'test2'))
+
+        assert authorizer.calls == 2
+
+    def test_authorize_caches_by_path_params(self, loop):
+        cache = AuthorizerCache()
+        authorizer = build_authorizer()
+
+        for id_ in ('1', '2', '1'):
+            loop.run_until_complete(cache.authorize(
+                authorizer, build_request(path_params={'id': id_}), Session(), 'test'))
+
+        assert authorizer.calls == 2
+
+    def test_authorize_caches_denied_responses(self, loop):
+        cache = AuthorizerCache()
+        denied = SwaggerResponse(401)
+        authorizer = build_authorizer(denied)
+
+        for _ in range(2):
+            result = loop.run_until_complete(
+                cache.authorize(authorizer, build_request(), Session(), 'test'))
+            result.headers['content-type'] = 'application/json'
+            assert result.status_code == 401
+            assert result is not denied
+
+        assert authorizer.calls == 1
+
+    def test_authorize_caches_a_copy_of_the_dumped_user(self, loop):
+        class User(object):
+            def todict(self):
+                return {'id': 1, 'roles': ['admin']}
+
+        cache = AuthorizerCache()
+        authorizer = build_authorizer(user=User())
+        sessions = [Session() for _ in range(3)]
+
+        for session in sessions:
+            loop.run_until_complete(cache.authorize(authorizer, build_request(), session, 'test'))
+        sessions[1].user['roles'].append('root')
+
+        assert isinstance(sessions[0].user, User)
+        assert sessions[1].user == {'id': 1, 'roles': ['admin', 'root']}
+        assert sessions[2].user == {'id': 1, 'roles': ['admin']}
+        assert authorizer.calls == 1
+
+    def test_authorize_with_dump_user(self, loop):
+        cache = AuthorizerCache(dump_user=lambda user: user['id'])
+        authorizer = build_authorizer(user={'id': 1, 'name': 'test'})
+        session = Session()
+
+        for _ in range(2):
+            loop.run_until_complete(cache.authorize(authorizer, build_request(), session, 'test'))
+
+        assert session.user == 1
+
+    def test_authorize_deduplicates_concurrent_misses(self, loop):
+        cache = AuthorizerCache()
+        calls = []
+
+        async def authorizer(req, session):
+            calls.append(req)
+            await asyncio.sleep(0.01)
+            session.user = 'test'
+
+        sessions = [Session() for _ in range(3)]
+        results = loop.run_until_complete(asyncio.gather(*[
+            cache.authorize(authorizer, build_request(), session, 'test') for session in sessions]))
+
+        assert results == [None] * 3
+        assert [session.user for session in sessions] == ['test'] * 3
+        assert len(calls) == 1
+
+    def test_authorize_raises_concurrent_misses_errors(self, loop):
+        cache = AuthorizerCache()
+        calls = []
+
+        async def authorizer(req, session):
+            calls.append(req)
+            await asyncio.sleep(0.01)
+            raise ValueError()
+
+        results = loop.run_until_complete(asyncio.gather(*[
+            cache.authorize(authorizer, build_request(), Session(), 'test') for _ in range(2)],
+            return_exceptions=True))
+
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(calls) == 1
+
+    def test_authorize_without_negative_ttl(self, loop):
+        cache = AuthorizerCache(negative_ttl=0)
+        authorizer = build_authorizer(SwaggerResponse(401))
+
+        for _ in range(2):
+            loop.run_until_complete(
+                cache.authorize(authorizer, build_request(), Session(), 'test'))
+
+        assert authorizer.calls == 2
+
+    def test_authorize_without_authorization_header(self, loop):
+        cache = AuthorizerCache()
+        authorizer = build_authorizer()
+        req = SwaggerRequest('/', 'get')
+
+        for _ in range(2):
+            loop.run_until_complete(cache.authorize(authorizer, req, Session(), 'test'))
+
+        assert authorizer.calls == 2
+
+    def test_invalidate(self, loop):
+        cache = AuthorizerCache()
+        authorizer = build_authorizer()
+
+        loop.run_until_complete(cache.authorize(authorizer, build_request('test1'), Session()))
+        loop.run_until_complete(cache.authorize(authorizer, build_request('test2'), Session()))
+        cache.invalidate('test1')
+        loop.run_until_complete(cache.authorize(authorizer, build_request('test1'), Session()))
+        loop.run_until_complete(cache.authorize(authorizer, build_request('test2'), Session()))
+
+        assert authorizer.calls == 3
+
+
+class FakeChannel(object):
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+
+    async def wait_message(self):
+        return bool(self.messages)
+
+    async def get(self):
+        return self.messages.pop(0)
+
+
+class TestLocalCache(object):
+
+    def test_get_many_and_set_many(self):
+        cache = LocalCache()
+        cache.set_many('test', {b'1': b'{"id":1}', b'2': None})
+
+        assert cache.get_many('test', [b'1', b'2']) == [b'{"id":1}', None]
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_invalidate_instances_keys(self):
+        cache = LocalCache()
+        cache.set_many('test', {b'1': b'{"id":1}', b'2': b'{"id":2}'})
+        cache.invalidate({'test': {b'1'}})
+
+        assert cache.get_many('test', [b'1', b'2']) == [None, b'{"id":2}']
+
+    def test_invalidate_model_key(self):
+        cache = LocalCache()
+        cache.set_many('test', {b'1': b'{"id":1}'})
+        cache.set_many('test2', {b'1': b'{"id":1}'})
+        cache.invalidate({'test': None})
+
+        assert cache.get_many('test', [b'1']) == [None]
+        assert cache.get_many('test2', [b'1']) == [b'{"id":1}']
+
+    def test_set_many_skips_values_read_before_an_invalidation(self):
+        cache = LocalCache()
+        generation = cache.get_generation('test')
+        cache.invalidate({'test': {b'1'}})
+        cache.set_many('test', {b'1': b'{"id":1}'}, generation)
+
+        assert cache.get_many('test', [b'1']) == [None]
+
+        cache.set_many('test', {b'1': b'{"id":1}'}, cache.get_generation('test'))
+
+        assert cache.get_many('test', [b'1']) == [b'{"id":1}']
+
+    def test_set_many_ignores_other_models_invalidations(self):
+        cache = LocalCache()
+        generation = cache.get_generation('test')
+        cache.invalidate({'test2': None})
+        cache.set_many('test', {b'1': b'{"id":1}'}, generation)
+
+        assert cache.get_many('test', [b'1']) == [b'{"id":1}']
+
+    def test_values_expire_by_default(self):
+        cache = LocalCache()
+        cache.set_many('test', {b'1': b'{"id":1}'})
+
+        with mock.patch('time.monotonic', return_value=time.monotonic() + 61):
+            assert cache.get_many('test', [b'1']) == [None]
+
+    def test_invalidate_from_message(self):
+        cache = LocalCache()
+        cache.set_many('test', {b'1': b'{"id":1}', b'2': b'{"id":2}'})
+        cache.set_many('test2', {b'1': b'{"id":1}'})
+        cache.invalidate_from_message(cache.build_message({'test': {b'1'}, 'test2': None}))
+
+        assert cache.get_many('test', [b'1', b'2']) == [None, b'{"id":2}']
+        assert cache.get_many('test2', [b'1']) == [None]
+        assert cache.stats()['invalidations'] == 1
+
+    def test_subscribe_with_subscriber_bind(self, loop):
+        subscriber = build_subscriber()
+        cache = LocalCache(channel='test_channel', subscriber_bind=subscriber)
+        cache.set_many('test', {b'1': b'{"id":1}'})
+        subscriber.messages.append(cache.build_message({'test': {b'1'}}))
+        redis = mock.MagicMock()
+
+        async def run():
+            await cache.subscribe(redis, loop)
+            await asyncio.sleep(0)
+            await cache.unsubscribe()
+
+        loop.run_until_complete(run())
+
+        assert subscriber.subscribe.call_args_list == [mock.call('test_channel')]
+        assert not subscriber.close.called
+        assert not redis.subscribe.called
+        assert cache.get_many('test', [b'1']) == [None]
+
+    def test_subscribe_opens_a_dedicated_connection(self, loop):
+        subscriber = build_subscriber()
+        cache = LocalCache(channel='test_channel')
+        cache.set_many('test', {b'1': b'{"id":1}'})
+        subscriber.messages.append(cache.build_message({'test': {b'1'}}))
+        redis = mock.MagicMock(address=('localhost', 6379), db=1)
+
+        async def create_redis(address, db=None, loop=None):
+            return subscriber
+
+        async def run():
+            with mock.patch('aioredis.create_redis', side_effect=create_redis) as create:
+                await cache.subscribe(redis, loop)
+            await asyncio.sleep(0)
+            await cache.unsubscribe()
+            return create
+
+        create = loop.run_until_complete(run())
+
+        assert create.call_args_list == [mock.call(('localhost', 6379), db=1, loop=loop)]
+        assert not redis.subscribe.called
+        assert subscriber.close.called
+        assert cache.get_many('test', [b'1']) == [None]
@@ -0,0 +1,339 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm.cache_policy import CachePolicy, CacheSweeper
+from swaggerit.cache import LocalCache
+from unittest import mock
+import asyncio
+import hashlib
+
+
+class Redis(object):
+    ZSET_IF_EXIST = 'ZSET_IF_EXIST'
+
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.sets = {}
+        self.published = []
+        self.scripts = set()
+
+    async def hmset_dict(self, key, map_):
+        self.hashes.setdefault(key, {}).update(map_)
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def zadd(self, key, *pairs, exist=None):
+        zset = self.zsets.setdefault(key, {})
+        for score, member in zip(pairs[::2], pairs[1::2]):
+            if exist is None or member in zset:
+                zset[member] = score
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrangebyscore(self, key, max):
+        return [member for member in self._sorted(key) if self.zsets[key][member] <= max]
+
+    def _sorted(self, key):
+        zset = self.zsets.get(key, {})
+        return sorted(zset, key=lambda member: zset[member])
+
+    async def zscore(self, key, member):
+        return self.zsets.get(key, {}).get(member)
+
+    async def evalsha(self, sha, keys=[], args=[]):
+        if sha not in self.scripts:
+            raise Exception('NOSCRIPT No matching script. Please use EVAL.')
+
+        return await self._delete_from_index(keys, args)
+
+    async def eval(self, script, keys=[], args=[]):
+        self.scripts.add(hashlib.sha1(script.encode()).hexdigest())
+        return await self._delete_from_index(keys, args)
+
+    async def _delete_from_index(self, keys, args):
+        hash_key, index_key = keys[:2]
+        mode, limit = args
+
+        if mode == 'rank':
+            members = self._sorted(index_key)[:max(await self.zcard(index_key) - limit, 0)]
+        else:
+            members = await self.zrangebyscore(index_key, max=limit)
+
+        await self.hdel(hash_key, *members)
+        for key in keys[1:]:
+            await self.zrem(key, *members)
+
+        return members
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.zsets.pop(key, None)
+
+    async def smembers(self, key):
+        return self.sets.get(key, set())
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def pipeline(self):
+        return Pipeline(self)
+
+    multi_exec = pipeline
+
+
+class Pipeline(object):
+
+    def __init__(self, redis):
+        self.ZSET_IF_EXIST = redis.ZSET_IF_EXIST
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self._commands.append(getattr(self._redis, name)(*args, **kwargs))
+        return command
+
+    async def execute(self):
+        results = []
+        for command in self._commands:
+            results.append(await command)
+
+        return results
+
+
+class Model(object):
+    __key__ = 'model'
+
+    def __init__(self, policy):
+        self.__cache_policy__ = policy
+
+    def get_filters_names_key(self):
+        return 'model__filters_names'
+
+
+def add(loop, redis, policy, hash_key, insts_keys, now):
+    pipeline = redis.pipeline()
+    pipeline.hmset_dict(hash_key, {key: b'{}' for key in insts_keys})
+    policy.add(pipeline, hash_key, insts_keys, now)
+    loop.run_until_complete(pipeline.execute())
+
+
+class TestCachePolicy(object):
+
+    def test_add_indexes_entries(self, loop):
+        redis = Redis()
+        add(loop, redis, CachePolicy(max_entries=10, ttl=5), 'model', [b'1', b'2'], 100)
+
+        assert redis.zsets == {
+            'model__lru': {b'1': 100, b'2': 100},
+            'model__ttl': {b'1': 105, b'2': 105}
+        }
+
+    def test_add_without_limits(self, loop):
+        redis = Redis()
+        add(loop, redis, CachePolicy(), 'model', [b'1'], 100)
+
+        assert redis.zsets == {}
+
+    def test_touch_updates_only_existing_entries(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=10)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        pipeline = redis.pipeline()
+        policy.touch(pipeline, 'model', [b'1', b'2'], 200)
+        loop.run_until_complete(pipeline.execute())
+
+        assert redis.zsets == {'model__lru': {b'1': 200}}
+
+    def test_evict_removes_least_recently_used(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=2)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        add(loop, redis, policy, 'model', [b'2'], 200)
+        add(loop, redis, policy, 'model', [b'3'], 300)
+        pipeline = redis.pipeline()
+        policy.touch(pipeline, 'model', [b'1'], 400)
+        loop.run_until_complete(pipeline.execute())
+
+        assert loop.run_until_complete(policy.evict(redis, 'model')) == [b'2']
+        assert redis.hashes == {'model': {b'1': b'{}', b'3': b'{}'}}
+        assert redis.zsets == {'model__lru': {b'1': 400, b'3': 300}}
+
+    def test_evict_removes_entries_from_all_indexes_in_one_script(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=1, ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        add(loop, redis, policy, 'model', [b'2'], 200)
+
+        with mock.patch.object(redis, 'eval', wraps=redis.eval) as eval_:
+            assert loop.run_until_complete(policy.evict(redis, 'model')) == [b'1']
+
+        assert eval_.call_count == 1
+        assert eval_.call_args[1] == {
+            'keys': ['model', 'model__lru', 'model__ttl'],
+            'args': ['rank', 1]
+        }
+        assert redis.hashes == {'model': {b'2': b'{}'}}
+        assert redis.zsets == {'model__lru': {b'2': 200}, 'model__ttl': {b'2': 210}}
+
+    def test_evict_reuses_loaded_script(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=1)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        add(loop, redis, policy, 'model', [b'2'], 200)
+        loop.run_until_complete(policy.evict(redis, 'model'))
+        add(loop, redis, policy, 'model', [b'3'], 300)
+
+        with mock.patch.object(redis, 'eval') as eval_:
+            assert loop.run_until_complete(policy.evict(redis, 'model')) == [b'2']
+
+        assert not eval_.called
+        assert redis.hashes == {'model': {b'3': b'{}'}}
+
+    def test_evict_skips_script_when_size_is_under_max_entries(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=2)
+
+        with mock.patch.object(redis, 'evalsha') as evalsha, \
+                mock.patch.object(redis, 'eval') as eval_:
+            assert loop.run_until_complete(policy.evict(redis, 'model', 2)) == []
+
+        assert not evalsha.called
+        assert not eval_.called
+
+    def test_evict_under_max_entries(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=2)
+        add(loop, redis, policy, 'model', [b'1', b'2'], 100)
+
+        assert loop.run_until_complete(policy.evict(redis, 'model')) == []
+        assert len(redis.hashes['model']) == 2
+
+    def test_expire_removes_expired_entries(self, loop):
+        redis = Redis()
+        policy = CachePolicy(ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        add(loop, redis, policy, 'model', [b'2'], 200)
+
+        assert loop.run_until_complete(policy.expire(redis, 'model', 150)) == [b'1']
+        assert redis.hashes == {'model': {b'2': b'{}'}}
+        assert redis.zsets == {'model__ttl': {b'2': 210}}
+
+    def test_drop_expired_entries_on_read(self, loop):
+        redis = Redis()
+        policy = CachePolicy(ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 100)
+        add(loop, redis, policy, 'model', [b'2'], 200)
+        pipeline = redis.pipeline()
+        policy.get_expirations(pipeline, 'model', [b'1', b'2', b'3'])
+        expirations = loop.run_until_complete(pipeline.execute())
+
+        assert expirations == [110, 210, None]
+        assert policy.drop_expired([b'1', b'2', b'3'], expirations, 150) == [None, b'2', b'3']
+
+    def test_get_expirations_without_ttl(self, loop):
+        redis = Redis()
+        pipeline = redis.pipeline()
+        CachePolicy(max_entries=10).get_expirations(pipeline, 'model', [b'1'])
+
+        assert loop.run_until_complete(pipeline.execute()) == []
+
+    def test_remove_and_clear(self, loop):
+        redis = Redis()
+        policy = CachePolicy(max_entries=10, ttl=10)
+        add(loop, redis, policy, 'model', [b'1', b'2'], 100)
+        pipeline = redis.pipeline()
+        policy.remove(pipeline, 'model', [b'1'])
+        loop.run_until_complete(pipeline.execute())
+
+        assert redis.zsets == {'model__lru': {b'2': 100}, 'model__ttl': {b'2': 110}}
+
+        pipeline = redis.pipeline()
+        policy.clear(pipeline, ['model'])
+        loop.run_until_complete(pipeline.execute())
+
+        assert redis.zsets == {}
+
+
+class TestCacheSweeper(object):
+
+    def test_sweep_expires_and_evicts_all_model_hashes(self, loop):
+        redis = Redis()
+        redis.sets['model__filters_names'] = {b'model_name'}
+        policy = CachePolicy(max_entries=1, ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 0)
+        add(loop, redis, policy, 'model_name', [b'1'], 10 ** 12)
+        add(loop, redis, policy, 'model_name', [b'2'], 10 ** 12 + 1)
+        sweeper = CacheSweeper()
+        sweeper.start([Model(policy), Model(None)], redis, loop=loop)
+
+        changed_keys = loop.run_until_complete(sweeper.sweep())
+        loop.run_until_complete(sweeper.stop())
+
+        assert changed_keys == {'model': {b'1'}, 'model_name': {b'1'}}
+        assert redis.hashes == {'model': {}, 'model_name': {b'2': b'{}'}}
+        assert sweeper.stats() == {
+            'models': 1,
+            'interval': 60,
+            'sweeps': 1,
+            'expired': 1,
+            'evicted': 1,
+            'errors': 0
+        }
+
+    def test_sweep_invalidates_local_cache(self, loop):
+        redis = Redis()
+        local_cache = LocalCache()
+        local_cache.set_many('model', {b'1': b'{}', b'2': b'{}'})
+        policy = CachePolicy(ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 0)
+        sweeper = CacheSweeper()
+        sweeper.start([Model(policy)], redis, local_cache, loop=loop)
+
+        loop.run_until_complete(sweeper.sweep())
+        loop.run_until_complete(sweeper.stop())
+
+        assert local_cache.get_many('model', [b'1', b'2']) == [None, b'{}']
+        assert redis.published == [(local_cache.channel, '{"model":["1"]}')]
+
+    def test_run_sweeps_periodically(self, loop):
+        redis = Redis()
+        policy = CachePolicy(ttl=10)
+        add(loop, redis, policy, 'model', [b'1'], 0)
+        sweeper = CacheSweeper(interval=0.01)
+        sweeper.start([Model(policy)], redis, loop=loop)
+
+        loop.run_until_complete(asyncio.sleep(0.05))
+        loop.run_until_complete(sweeper.stop())
+
+        assert sweeper.sweeps > 0
+        assert redis.hashes == {'model': {}}
@@ -0,0 +1,146 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.codecs import UJsonCodec, OrJsonCodec, MsgPackCodec, DEFAULT_CODEC
+from swaggerit.method import SwaggerMethod
+from swaggerit.models._base import _ModelBase
+from swaggerit.request import SwaggerRequest
+from swaggerit.response import SwaggerResponse
+import pytest
+
+
+class Body(object):
+
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self):
+        return self.data
+
+
+class TestUJsonCodec(object):
+
+    def test_encode(self):
+        assert UJsonCodec().encode({'url': 'a/b'}) == b'{"url":"a/b"}'
+
+    def test_encode_escaping_forward_slashes(self):
+        assert UJsonCodec(True).encode({'url': 'a/b'}) == b'{"url":"a\\/b"}'
+
+    def test_decode(self):
+        codec = UJsonCodec()
+        assert codec.decode(b'{"id":1}') == {'id': 1}
+        assert codec.decode('{"id":1}') == {'id': 1}
+        assert codec.decode(memoryview(b'{"id":1}')) == {'id': 1}
+
+    def test_join(self):
+        codec = UJsonCodec()
+        assert codec.join([codec.encode({'id': 1}), codec.encode({'id': 2})]) == \
+            b'[{"id":1},{"id":2}]'
+        assert codec.join([]) == b'[]'
+
+    def test_default_codec(self):
+        assert isinstance(DEFAULT_CODEC, UJsonCodec)
+
+
+class TestOrJsonCodec(object):
+
+    def test_round_trip(self):
+        pytest.importorskip('orjson')
+        codec = OrJsonCodec()
+        assert codec.encode({'id': 1}) == b'{"id":1}'
+        assert codec.decode(codec.encode({'id': 1})) == {'id': 1}
+
+
+class TestMsgPackCodec(object):
+
+    def test_round_trip(self):
+        pytest.importorskip('msgpack')
+        codec = MsgPackCodec()
+        assert codec.decode(codec.encode({'id': 1, 'name': 'test'})) == {'id': 1, 'name': 'test'}
+
+    @pytest.mark.parametrize('size', [0, 1, 15, 16, 2**16])
+    def test_join(self, size):
+        pytest.importorskip('msgpack')
+        codec = MsgPackCodec()
+        objs = [{'id': id_} for id_ in range(size)]
+        assert codec.decode(codec.join([codec.encode(obj) for obj in objs])) == objs
+
+
+class FakeCodec(object):
+    content_type = 'application/fake'
+
+    def encode(self, obj):
+        return repr(obj).encode()
+
+    def decode(self, data):
+        return {'decoded': data.decode()}
+
+
+async def operation(req, session=None):
+    return SwaggerResponse(200, body=repr(req.body))
+
+
+class TestSwaggerMethodCodec(object):
+
+    def build_method(self):
+        schema = {
+            'operationId': 'test',
+            'parameters': [{'name': 'body', 'in': 'body', 'schema': {'type': 'object'}}]
+        }
+        return SwaggerMethod(operation, schema, None, '.', codec=FakeCodec())
+
+    def test_decodes_body_with_codec(self, loop):
+        req = SwaggerRequest('/', 'post', headers={'content-type': 'application/fake'},
+                             body=Body(b'test'))
+        resp = loop.run_until_complete(self.build_method()(req, None))
+
+        assert resp.status_code == 200
+        assert resp.body == repr({'decoded': 'test'})
+        assert resp.headers == {'content-type': 'application/fake'}
+
+    def test_encodes_errors_with_codec(self, loop):
+        req = SwaggerRequest('/', 'post', headers={'content-type': 'application/fake'})
+        resp = loop.run_until_complete(self.build_method()(req, None))
+
+        assert resp.status_code == 400
+        assert resp.body == repr({
+            'message': "Request body must be setted when 'content-type' header is setted"
+        }).encode()
+        assert resp.headers == {'content-type': 'application/fake'}
+
+
+class CodecModel(_ModelBase):
+    __codec__ = FakeCodec()
+
+
+class TestModelCodec(object):
+
+    def test_pack_obj_returns_json_text(self):
+        model = CodecModel()
+        assert model._pack_obj({'url': 'a/b'}) == '{"url":"a/b"}'
+        assert model._unpack_obj('{"id":1}') == {'id': 1}
+
+    def test_encode_obj_uses_the_model_codec(self):
+        model = CodecModel()
+        assert model._encode_obj({'id': 1}) == repr({'id': 1}).encode()
+        assert model._decode_obj(b'test') == {'decoded': 'test'}
@@ -0,0 +1,78 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from subprocess import PIPE, run
+import os.path
+import sys
+import pytest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY_MODULES = {'sqlalchemy', 'aiohttp', 'aiohttp_swagger', 'aioes', 'aioredis', 'jsonschema'}
+
+
+def import_time(code):
+    result = run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stdout=PIPE, stderr=PIPE, cwd=ROOT_DIR, universal_newlines=True, check=True
+    )
+    imported = dict()
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+
+        self_time, cumulative_time, name = line[len('import time:'):].split('|')
+        if not cumulative_time.strip().isdigit():
+            continue
+
+        imported[name.strip()] = int(cumulative_time)
+
+    return imported
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="'-X importtime' requires python 3.7")
+class TestImportTime(object):
+
+    def test_import_swaggerit_not_imports_heavy_modules(self):
+        imported = import_time('import swaggerit')
+
+        assert 'swaggerit' in imported
+        assert not HEAVY_MODULES.intersection(name.split('.')[0] for name in imported)
+
+    def test_import_swaggerit_model_not_imports_orm_and_server(self):
+        imported = import_time('import swaggerit; swaggerit.SwaggerItModel')
+
+        assert 'swaggerit.models.swaggerit' in imported
+        assert not {'sqlalchemy', 'aiohttp', 'aioes', 'aioredis'}.intersection(
+            name.split('.')[0] for name in imported)
+
+    def test_lazy_attributes_are_resolved(self):
+        import swaggerit
+        from swaggerit.response import SwaggerResponse
+
+        assert swaggerit.SwaggerResponse is SwaggerResponse
+        assert 'SwaggerItModel' in dir(swaggerit)
+
+        with pytest.raises(AttributeError):
+            swaggerit.NotExists
@@ -0,0 +1,76 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.method import SwaggerMethod
+from swaggerit.request import SwaggerRequest
+from swaggerit.response import SwaggerResponse
+import ujson
+
+
+async def operation(req, session=None):
+    return SwaggerResponse(200, body=ujson.dumps(req.query))
+
+
+def build_method(parameters=None):
+    schema = {'operationId': 'test', 'parameters': parameters or []}
+    return SwaggerMethod(operation, schema, None, '.')
+
+
+class TestSwaggerMethodCompile(object):
+
+    def test_compiled_trivial_route_passes_request_through(self, loop):
+        method = build_method()
+        req = SwaggerRequest('/', 'get')
+        resp = loop.run_until_complete(method.compile()(req, None))
+
+        assert resp.status_code == 200
+        assert resp.body == '{}'
+        assert resp.headers == {'content-type': 'application/json'}
+
+    def test_compiled_trivial_route_rejects_body(self, loop):
+        method = build_method()
+        req = SwaggerRequest('/', 'post', headers={'content-type': 'application/json'})
+
+        generic = loop.run_until_complete(method(req, None))
+        compiled = loop.run_until_complete(method.compile()(req, None))
+
+        assert compiled.status_code == 400
+        assert compiled == generic
+
+    def test_compiled_route_casts_query(self, loop):
+        method = build_method([{'name': 'test', 'in': 'query', 'type': 'integer'}])
+        resp = loop.run_until_complete(
+            method.compile()(SwaggerRequest('/', 'get', query={'test': '1'}), None))
+
+        assert resp.status_code == 200
+        assert ujson.loads(resp.body) == {'test': 1}
+
+    def test_compiled_route_validates_query(self, loop):
+        method = build_method([{'name': 'test', 'in': 'query', 'type': 'integer'}])
+        generic = loop.run_until_complete(
+            method(SwaggerRequest('/', 'get', query={'test': 'test'}), None))
+        compiled = loop.run_until_complete(
+            method.compile()(SwaggerRequest('/', 'get', query={'test': 'test'}), None))
+
+        assert compiled.status_code == 400
+        assert compiled == generic
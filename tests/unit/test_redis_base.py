@@ -0,0 +1,127 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm._redis_base import _ModelRedisBaseMeta
+from swaggerit.models.orm._swaggerit_meta import _ModelSwaggerItOrmMeta
+from swaggerit.codecs import UJsonCodec, MsgPackCodec
+import zlib
+
+
+class Model(object):
+    __cache_compression_threshold__ = 10
+    __cache_compression_level__ = 6
+
+    _encode_cache_value = classmethod(_ModelRedisBaseMeta._encode_cache_value)
+    _encode_cache_values = classmethod(_ModelRedisBaseMeta._encode_cache_values)
+    _decode_cache_value = classmethod(_ModelRedisBaseMeta._decode_cache_value)
+
+
+class CodecModel(Model):
+    __codec__ = UJsonCodec()
+    __storage_codec__ = None
+    __raw_passthrough__ = True
+
+    _get_storage_codec = classmethod(_ModelRedisBaseMeta._get_storage_codec)
+    _pack_cache_obj = classmethod(_ModelRedisBaseMeta._pack_cache_obj)
+    _unpack_cache_obj = classmethod(_ModelRedisBaseMeta._unpack_cache_obj)
+    _is_tombstone = classmethod(_ModelRedisBaseMeta._is_tombstone)
+    _is_raw_cache_value = classmethod(_ModelRedisBaseMeta._is_raw_cache_value)
+    _to_raw_objs = classmethod(_ModelRedisBaseMeta._to_raw_objs)
+    _use_raw_passthrough = classmethod(_ModelRedisBaseMeta._use_raw_passthrough)
+
+    @classmethod
+    def _encode_obj(cls, obj):
+        return cls.__codec__.encode(obj)
+
+
+class Session(object):
+    redis_bind = object()
+
+
+class TestModelRedisBaseCacheCompression(object):
+
+    def test_encode_cache_value_without_threshold(self):
+        class NoCompressionModel(Model):
+            __cache_compression_threshold__ = None
+
+        value = '{"id":1}' * 10
+        assert NoCompressionModel._encode_cache_value(value) is value
+
+    def test_encode_cache_value_below_threshold(self):
+        assert Model._encode_cache_value('{"id":1}') == b'{"id":1}'
+
+    def test_encode_cache_value_above_threshold(self):
+        value = ('{"id":1}' * 10).encode()
+        assert Model._encode_cache_value(value) == b'\x00' + zlib.compress(value, 6)
+
+    def test_encode_cache_values(self):
+        value = '{"id":1}' * 10
+        assert Model._encode_cache_values({b'1': value, b'2': '{}'}) == {
+            b'1': b'\x00' + zlib.compress(value.encode(), 6),
+            b'2': b'{}'
+        }
+
+    def test_decode_cache_value_compressed(self):
+        value = ('{"id":1}' * 10).encode()
+        assert Model._decode_cache_value(Model._encode_cache_value(value)) == value
+
+    def test_decode_cache_value_uncompressed(self):
+        assert Model._decode_cache_value(b'{"id":1}') == b'{"id":1}'
+        assert Model._decode_cache_value('{"id":1}') == '{"id":1}'
+
+
+class TestModelRedisBaseRawPassthrough(object):
+
+    def test_to_raw_objs_keeps_plain_values(self):
+        assert CodecModel._to_raw_objs([b'{"id":1}', '{"id":2}']) == [b'{"id":1}', b'{"id":2}']
+
+    def test_to_raw_objs_drops_tombstones(self):
+        assert CodecModel._to_raw_objs([b'\x011234.5', b'{"id":1}']) == [b'{"id":1}']
+
+    def test_to_raw_objs_reencodes_compressed_values(self):
+        value = CodecModel._encode_cache_value(CodecModel._pack_cache_obj([{'id': 1}] * 10))
+        assert value[:1] == b'\x00'
+        assert CodecModel._to_raw_objs([value]) == [b'[{"id":1}' + b',{"id":1}' * 9 + b']']
+
+    def test_to_raw_objs_reencodes_with_the_response_codec(self):
+        class StorageCodecModel(CodecModel):
+            __storage_codec__ = MsgPackCodec()
+
+        value = StorageCodecModel._encode_cache_value(
+            StorageCodecModel._pack_cache_obj({'id': 1, 'name': 'test' * 10}))
+        assert StorageCodecModel._to_raw_objs([value]) == [
+            UJsonCodec().encode({'id': 1, 'name': 'test' * 10})]
+
+    def test_use_raw_passthrough_with_same_codecs(self, monkeypatch):
+        monkeypatch.setattr(_ModelSwaggerItOrmMeta, '_use_raw_passthrough',
+                            lambda cls, session: True)
+        assert CodecModel._use_raw_passthrough(Session()) is True
+
+    def test_use_raw_passthrough_with_different_storage_codec(self, monkeypatch):
+        monkeypatch.setattr(_ModelSwaggerItOrmMeta, '_use_raw_passthrough',
+                            lambda cls, session: True)
+
+        class StorageCodecModel(CodecModel):
+            __storage_codec__ = MsgPackCodec()
+
+        assert StorageCodecModel._use_raw_passthrough(Session()) is False
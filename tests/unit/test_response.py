@@ -0,0 +1,66 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.response import SwaggerResponse, static_response
+import pytest
+
+
+class TestStaticResponse(object):
+
+    def test_static_response_sets_response_attribute(self):
+        @static_response(200, {'Allow': 'GET'})
+        async def operation(obj, req, session):
+            pass
+
+        assert operation.static_response == SwaggerResponse(200, {'Allow': 'GET'})
+        assert operation.__name__ == 'operation'
+
+    def test_static_response_returns_response(self, loop):
+        @static_response(200, body='test')
+        async def operation(obj, req, session):
+            pass
+
+        resp = loop.run_until_complete(operation(None, None, None))
+
+        assert resp == operation.static_response
+        assert resp is not operation.static_response
+
+    def test_static_response_headers_are_not_shared(self, loop):
+        @static_response(200, {'Allow': 'GET'})
+        async def operation(obj, req, session):
+            pass
+
+        resp = loop.run_until_complete(operation(None, None, None))
+        resp.headers['content-type'] = 'application/json'
+        other_resp = loop.run_until_complete(operation(None, None, None))
+
+        assert other_resp.headers == {'Allow': 'GET'}
+        assert operation.static_response.headers == {'Allow': 'GET'}
+
+    def test_static_response_headers_are_read_only(self):
+        @static_response(200, {'Allow': 'GET'})
+        async def operation(obj, req, session):
+            pass
+
+        with pytest.raises(TypeError):
+            operation.static_response.headers['Allow'] = 'POST'
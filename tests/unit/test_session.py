@@ -0,0 +1,63 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm.session import Session
+
+
+class Pipeline(object):
+
+    def __init__(self, members):
+        self.members = members
+        self.keys = []
+
+    def smembers(self, key):
+        self.keys.append(key)
+
+    async def execute(self):
+        return [self.members[key] for key in self.keys]
+
+
+class Redis(object):
+
+    def __init__(self, members):
+        self.members = members
+
+    def pipeline(self):
+        return Pipeline(self.members)
+
+
+class Model(object):
+    __key__ = 'model'
+
+    @classmethod
+    def get_filters_names_key(cls):
+        return 'model__filters_names'
+
+
+class TestSessionModelsFiltersNames(object):
+
+    def test_filters_names_are_not_prefixed_again(self, loop):
+        session = Session(redis_bind=Redis({'model__filters_names': {b'model_name'}}))
+        filters_names = loop.run_until_complete(session._get_models_filters_names([Model]))
+
+        assert filters_names == {Model: {'model', 'model_name'}}
@@ -0,0 +1,191 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm.executor import SQLExecutor
+from swaggerit.models.orm.session import Session
+from swaggerit.models.orm.factory import FactoryOrmModels
+from unittest import mock
+import sqlalchemy as sa
+import asyncio
+import threading
+import time
+import pytest
+
+
+@pytest.fixture
+def executor():
+    executor = SQLExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class Affinity(object):
+    pass
+
+
+Base = FactoryOrmModels.make_sqlalchemy_redis_base()
+
+
+class Parent(Base):
+    __tablename__ = 'executor_parent'
+    id = sa.Column(sa.Integer, primary_key=True)
+    children = sa.orm.relationship('Child', uselist=True)
+
+
+class Child(Base):
+    __tablename__ = 'executor_child'
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.String(10))
+    parent_id = sa.Column(sa.ForeignKey('executor_parent.id'))
+
+
+class TestSQLExecutor(object):
+
+    def test_max_workers_from_bind_pool(self):
+        bind = mock.MagicMock()
+        bind.engine.pool.size.return_value = 3
+        bind.engine.pool._max_overflow = 2
+        executor = SQLExecutor(bind)
+
+        assert executor.max_workers == 5
+        executor.shutdown()
+
+    def test_max_workers_without_pool(self):
+        executor = SQLExecutor(object())
+
+        assert executor.max_workers == 5
+        executor.shutdown()
+
+    def test_run_outside_event_loop_thread(self, loop, executor):
+        result = loop.run_until_complete(executor.run(lambda a, b: (a + b, threading.get_ident()), 1, 2))
+
+        assert result[0] == 3
+        assert result[1] != threading.get_ident()
+
+    def test_run_raises_func_error(self, loop, executor):
+        def func():
+            raise ValueError('test')
+
+        with pytest.raises(ValueError):
+            loop.run_until_complete(executor.run(func))
+
+        assert executor.stats()['executed'] == 1
+        assert executor.stats()['running'] == 0
+
+    def test_stats(self, loop, executor):
+        loop.run_until_complete(asyncio.gather(*[executor.run(time.sleep, 0.01) for _ in range(4)]))
+        stats = executor.stats()
+
+        assert stats['executed'] == 4
+        assert stats['queued'] == 0
+        assert stats['running'] == 0
+        assert stats['max_queue_time'] > 0
+        assert stats['avg_exec_time'] >= 0.01
+
+    def test_run_with_affinity_uses_one_thread(self, loop):
+        executor = SQLExecutor(max_workers=4)
+        affinities = [Affinity(), Affinity()]
+        calls = [executor.run(threading.get_ident, affinity=affinity)
+                 for affinity in affinities for _ in range(10)]
+        threads = loop.run_until_complete(asyncio.gather(*calls))
+        executor.shutdown()
+
+        assert len(set(threads[:10])) == 1
+        assert len(set(threads[10:])) == 1
+
+    def test_max_queued_limits_pending_calls(self, loop):
+        executor = SQLExecutor(max_workers=1, max_queued=1)
+        queued = []
+
+        def func():
+            queued.append(executor.queued)
+            time.sleep(0.01)
+
+        loop.run_until_complete(asyncio.gather(*[executor.run(func) for _ in range(5)]))
+        executor.shutdown()
+
+        assert len(queued) == 5
+        assert max(queued) <= 1
+
+
+class TestSessionRunSQL(object):
+
+    def test_run_sql_without_executor(self, loop):
+        session = Session()
+        result = loop.run_until_complete(session.run_sql(threading.get_ident))
+
+        assert result == threading.get_ident()
+
+    def test_run_sql_with_executor(self, loop, executor):
+        session = Session(sql_executor=executor)
+        result = loop.run_until_complete(session.run_sql(threading.get_ident))
+
+        assert result != threading.get_ident()
+        assert executor.stats()['executed'] == 1
+
+    def test_run_sql_keeps_sqlite_connections_on_one_thread(self, loop, tmpdir):
+        engine = sa.create_engine('sqlite:///{}'.format(tmpdir.join('test.db')))
+        engine.execute('create table test (id integer primary key)')
+        engine.execute('insert into test values (1)')
+        executor = SQLExecutor(max_workers=4)
+
+        async def run():
+            session = Session(bind=engine, sql_executor=executor)
+            counts = []
+            for _ in range(10):
+                counts.append(await session.run_sql(
+                    lambda: session.execute('select count(*) from test').scalar()))
+            await session.aclose()
+            return counts
+
+        results = loop.run_until_complete(asyncio.gather(*[run() for _ in range(4)]))
+        executor.shutdown()
+
+        assert results == [[1] * 10] * 4
+
+    def test_nested_update_runs_on_the_session_thread(self, loop, tmpdir):
+        engine = sa.create_engine('sqlite:///{}'.format(tmpdir.join('test.db')))
+        Base.metadata.create_all(engine)
+        engine.execute('insert into executor_parent values (1)')
+        engine.execute("insert into executor_child values (1, 'a', 1), (2, 'b', 1), (3, 'c', null)")
+        executor = SQLExecutor(max_workers=2)
+
+        async def run():
+            session = Session(bind=engine, sql_executor=executor)
+            parents = await Parent.update(session, {'id': 1, 'children': [
+                {'id': 1, '_operation': 'remove'},
+                {'id': 3, '_operation': 'update', 'name': 'x'},
+                {'id': 4, '_operation': 'insert', 'name': 'd'}]})
+            [child] = await Child.get(session, {'id': 2}, todict=False)
+            session.delete(child)
+            await session.commit()
+            parents.extend(await Parent.get(session, {'id': 1}))
+            await session.aclose()
+            return parents
+
+        parents = loop.run_until_complete(run())
+        executor.shutdown()
+
+        assert parents[1] == {'id': 1, 'children': [
+            {'id': 3, 'name': 'x', 'parent_id': 1},
+            {'id': 4, 'name': 'd', 'parent_id': 1}]}
@@ -0,0 +1,103 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models._swaggerit_meta import _build_formatted_schema
+from swaggerit.models.swaggerit import SwaggerItModel
+from copy import deepcopy
+
+
+class TestBuildFormattedSchema(object):
+
+    def build_schema(self):
+        return {
+            'paths': {
+                '/': {
+                    'post': {
+                        'operationId': 'test',
+                        'parameters': [{
+                            'name': 'body',
+                            'in': 'body',
+                            'schema': {'items': [{'$ref': '#/definitions/test'}]}
+                        }],
+                        'responses': {'200': {'description': 'test'}}
+                    }
+                }
+            },
+            'definitions': {
+                'test': {'$ref': '#/definitions/other/properties/test'},
+                'other': {'properties': {'test': {'type': 'string'}}}
+            }
+        }
+
+    def test_refs_and_definitions_are_renamed(self):
+        schema = _build_formatted_schema(self.build_schema(), 'Model')
+
+        assert schema['definitions'] == {
+            'Model.test': {'$ref': '#/definitions/Model.other/properties/test'},
+            'Model.other': {'properties': {'test': {'type': 'string'}}}
+        }
+        assert schema['paths']['/']['post']['parameters'][0]['schema'] == {
+            'items': [{'$ref': '#/definitions/Model.test'}]
+        }
+
+    def test_source_schema_is_not_changed(self):
+        schema = self.build_schema()
+        _build_formatted_schema(schema, 'Model')
+
+        assert schema == self.build_schema()
+
+    def test_subtrees_without_refs_are_shared(self):
+        schema = self.build_schema()
+        formatted = _build_formatted_schema(schema, 'Model')
+
+        assert formatted['definitions']['Model.other'] is schema['definitions']['other']
+        assert formatted['paths']['/']['post']['responses'] is \
+            schema['paths']['/']['post']['responses']
+
+
+class TestFormattedSchemaCache(object):
+
+    def build_model(self):
+        class Model(SwaggerItModel):
+            __swagger_json__ = TestBuildFormattedSchema().build_schema()
+
+            async def test(self, req, session):
+                pass
+
+        return Model
+
+    def test_instances_share_the_class_formatted_schema(self):
+        model = self.build_model()
+        model_1 = model('schema_cache_1')
+        model_2 = model('schema_cache_2')
+
+        assert model_1.__swagger_json__['definitions'] is \
+            model_2.__swagger_json__['definitions']
+        assert model.__formatted_swagger_json__[0] is model.__swagger_json__
+
+    def test_instances_with_own_schema_are_not_cached(self):
+        model = self.build_model()
+        model_1 = model('schema_cache_3', TestBuildFormattedSchema().build_schema())
+
+        assert '__formatted_swagger_json__' not in model.__dict__
+        assert 'Model.test' in model_1.__swagger_json__['definitions']
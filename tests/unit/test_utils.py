@@ -0,0 +1,74 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.utils import build_validator
+from jsonschema import ValidationError
+import pytest
+
+
+class TestBuildValidator(object):
+
+    def build_schema(self):
+        return {
+            'type': 'object',
+            'properties': {
+                'a': {'type': 'integer'},
+                'b': {'$ref': '#/properties/a'},
+                'c': {'$ref': '#/definitions/Model.test'}
+            }
+        }
+
+    def test_resolves_local_refs_with_definitions(self):
+        definitions = {'Model.test': {'type': 'string'}}
+        validator = build_validator(self.build_schema(), '.', definitions)
+
+        validator.validate({'a': 1, 'b': 2, 'c': 'test'})
+        with pytest.raises(ValidationError):
+            validator.validate({'b': 'test'})
+        with pytest.raises(ValidationError):
+            validator.validate({'c': 1})
+
+    def test_schema_is_not_changed(self):
+        schema = self.build_schema()
+        build_validator(schema, '.', {'Model.test': {'type': 'string'}})
+
+        assert schema == self.build_schema()
+
+    def test_resolves_local_refs_with_shared_resolvers(self):
+        definitions = {'Model.test': {'type': 'string'}}
+        validator = build_validator(self.build_schema(), '.', definitions, dict())
+
+        validator.validate({'a': 1, 'b': 2, 'c': 'test'})
+        with pytest.raises(ValidationError):
+            validator.validate({'b': 'test'})
+
+    def test_shares_resolver_between_schemas_without_local_refs(self):
+        definitions = {'Model.test': {'type': 'string'}}
+        resolvers = dict()
+        schema = {'properties': {'c': {'$ref': '#/definitions/Model.test'}}}
+        validator_1 = build_validator(schema, '.', definitions, resolvers)
+        validator_2 = build_validator(dict(schema), '.', definitions, resolvers)
+
+        assert validator_1.resolver is validator_2.resolver
+        with pytest.raises(ValidationError):
+            validator_2.validate({'c': 1})
@@ -0,0 +1,251 @@
+# MIT License
+
+# Copyright (c) 2016 Diogo Dutra <dutradda@gmail.com>
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from swaggerit.models.orm.write_behind import CacheWriteBehind
+from unittest import mock
+import asyncio
+import pytest
+
+
+class Session(object):
+
+    def __init__(self, commit_error=None):
+        self.commits = 0
+        self.closed = False
+        self.commit_error = commit_error
+        self.keys_to_hdel = []
+        self.insts_to_hmset = []
+        self.models_to_invalidate = []
+
+    def mark_key_for_hdel(self, model, inst_key):
+        self.keys_to_hdel.append((model, inst_key))
+
+    def mark_for_hmset_dict(self, inst):
+        self.insts_to_hmset.append(inst)
+
+    def mark_for_invalidation(self, model):
+        self.models_to_invalidate.append(model)
+
+    async def commit(self):
+        if self.commit_error is not None:
+            raise self.commit_error
+
+        self.commits += 1
+
+    async def aclose(self):
+        self.closed = True
+
+
+class Model(object):
+    gets = []
+    missing_ids = []
+
+    @classmethod
+    async def get(cls, session, ids, todict=True):
+        cls.gets.append(ids)
+        return [dict(id_) for id_ in ids if id_['id'] not in cls.missing_ids]
+
+    @classmethod
+    def get_instance_key(cls, inst):
+        return str(inst['id']).encode()
+
+
+def build_session_factory(commit_error=None, failures=None):
+    sessions = []
+
+    def session_factory():
+        failing = failures is None or len(sessions) < failures
+        session = Session(commit_error if failing else None)
+        sessions.append(session)
+        return session
+
+    session_factory.sessions = sessions
+    return session_factory
+
+
+class TestCacheWriteBehind(object):
+
+    def setup_method(self, method):
+        Model.gets = []
+        Model.missing_ids = []
+
+    def test_put_coalesces_same_key(self, loop):
+        write_behind = CacheWriteBehind()
+        loop.run_until_complete(write_behind.put(Model, b'1', {'id': 1}))
+        loop.run_until_complete(write_behind.put(Model, b'1', {'id': 1}))
+        loop.run_until_complete(write_behind.put(Model, b'2'))
+
+        assert write_behind.stats()['pending'] == 2
+        assert write_behind.stats()['coalesced'] == 1
+
+    def test_flush(self, loop):
+        session_factory = build_session_factory()
+        write_behind = CacheWriteBehind(batch_size=2)
+        write_behind._session_factory = session_factory
+
+        async def run():
+            await write_behind.put(Model, b'1', {'id': 1})
+            await write_behind.put(Model, b'2', {'id': 2})
+            await write_behind.put(Model, b'3')
+            write_behind.invalidate(Model)
+            await write_behind.flush()
+
+        loop.run_until_complete(run())
+        sessions = session_factory.sessions
+
+        assert len(sessions) == 2
+        assert Model.gets == [[{'id': 1}, {'id': 2}]]
+        assert sessions[0].insts_to_hmset == [{'id': 1}, {'id': 2}]
+        assert sessions[0].models_to_invalidate == [Model]
+        assert sessions[1].keys_to_hdel == [(Model, b'3')]
+        assert all([session.commits == 1 and session.closed for session in sessions])
+        assert write_behind.stats()['pending'] == 0
+        assert write_behind.stats()['batches'] == 2
+
+    def test_stop_flushes_pending(self, loop):
+        session_factory = build_session_factory()
+        write_behind = CacheWriteBehind(flush_interval=10)
+
+        async def run():
+            write_behind.start(session_factory)
+            await write_behind.put(Model, b'1', {'id': 1})
+            await write_behind.stop()
+
+        loop.run_until_complete(run())
+
+        assert Model.gets == [[{'id': 1}]]
+        assert write_behind.stats()['flushed'] == 1
+
+    def test_put_waits_when_queue_is_full(self, loop):
+        session_factory = build_session_factory()
+        write_behind = CacheWriteBehind(max_queue_size=1, flush_interval=0)
+
+        async def run():
+            write_behind.start(session_factory)
+            await write_behind.put(Model, b'1', {'id': 1})
+            await asyncio.wait_for(write_behind.put(Model, b'2', {'id': 2}), 1)
+            await write_behind.stop()
+
+        loop.run_until_complete(run())
+
+        assert Model.gets == [[{'id': 1}], [{'id': 2}]]
+
+    def test_put_on_full_queue_before_start(self, loop):
+        write_behind = CacheWriteBehind(max_queue_size=1, max_retries=1, retry_backoff=0)
+
+        async def run():
+            await write_behind.put(Model, b'1', {'id': 1})
+            with pytest.raises(RuntimeError):
+                await write_behind.put(Model, b'2', {'id': 2})
+
+        loop.run_until_complete(run())
+
+        assert write_behind.stats()['pending'] == 1
+        assert write_behind.stats()['errors'] == 0
+        assert write_behind.stats()['dropped'] == 0
+
+        session_factory = build_session_factory()
+        write_behind._session_factory = session_factory
+        loop.run_until_complete(write_behind.flush())
+
+        assert Model.gets == [[{'id': 1}]]
+
+    def test_flush_error(self, loop):
+        write_behind = CacheWriteBehind(max_retries=1, retry_backoff=0)
+        write_behind._session_factory = build_session_factory(Exception())
+
+        async def run():
+            await write_behind.put(Model, b'1')
+            with mock.patch.object(write_behind, '_logger') as logger:
+                await write_behind.flush()
+                assert logger.exception.call_count == 3
+
+        loop.run_until_complete(run())
+
+        assert write_behind.stats()['errors'] == 3
+        assert write_behind.stats()['retries'] == 1
+        assert write_behind.stats()['dropped'] == 0
+        assert write_behind.stats()['pending'] == 0
+
+    def test_flush_retries_failed_batch(self, loop):
+        session_factory = build_session_factory(Exception(), failures=2)
+        write_behind = CacheWriteBehind(max_retries=2, retry_backoff=0.01)
+        write_behind._session_factory = session_factory
+
+        async def run():
+            await write_behind.put(Model, b'1', {'id': 1})
+            with mock.patch.object(write_behind, '_logger'), \
+                    mock.patch('asyncio.sleep', wraps=asyncio.sleep) as sleep:
+                await write_behind.flush()
+                assert [call[0][0] for call in sleep.call_args_list] == [0.01, 0.02]
+
+        loop.run_until_complete(run())
+        sessions = session_factory.sessions
+
+        assert len(sessions) == 3
+        assert sessions[2].insts_to_hmset == [{'id': 1}]
+        assert sessions[2].commits == 1
+        assert write_behind.stats()['errors'] == 2
+        assert write_behind.stats()['retries'] == 2
+        assert write_behind.stats()['flushed'] == 1
+
+    def test_flush_hdels_batch_keys_after_last_retry(self, loop):
+        session_factory = build_session_factory(Exception(), failures=2)
+        write_behind = CacheWriteBehind(max_retries=1, retry_backoff=0)
+        write_behind._session_factory = session_factory
+
+        async def run():
+            await write_behind.put(Model, b'1', {'id': 1})
+            await write_behind.put(Model, b'2')
+            write_behind.invalidate(Model)
+            with mock.patch.object(write_behind, '_logger'):
+                await write_behind.flush()
+
+        loop.run_until_complete(run())
+        sessions = session_factory.sessions
+
+        assert len(sessions) == 3
+        assert sessions[2].insts_to_hmset == []
+        assert sessions[2].keys_to_hdel == [(Model, b'1'), (Model, b'2')]
+        assert sessions[2].models_to_invalidate == [Model]
+        assert sessions[2].commits == 1
+        assert write_behind.stats()['dropped'] == 3
+        assert write_behind.stats()['flushed'] == 0
+
+    def test_flush_hdels_keys_of_instances_not_found(self, loop):
+        session_factory = build_session_factory()
+        write_behind = CacheWriteBehind()
+        write_behind._session_factory = session_factory
+        Model.missing_ids = [2]
+
+        async def run():
+            await write_behind.put(Model, b'1', {'id': 1})
+            await write_behind.put(Model, b'2', {'id': 2})
+            await write_behind.flush()
+
+        loop.run_until_complete(run())
+        session = session_factory.sessions[0]
+
+        assert session.insts_to_hmset == [{'id': 1}]
+        assert session.keys_to_hdel == [(Model, b'2')]
+        assert session.commits == 1